@@ -2,44 +2,94 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable, Mapping
+from functools import wraps
 import logging
 import os
+import time
 from typing import Any
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.helpers.typing import ConfigType
+import voluptuous as vol
+
 from homeassistant.components import websocket_api
 from homeassistant.components.http import StaticPathConfig
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
 import homeassistant.helpers.config_validation as cv
-import voluptuous as vol
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.json import json_bytes, json_fragment
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    ATTR_ENTRY_ID,
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_ENTITY_BUDGET,
+    CONF_ENTITY_MODE,
+    CONF_FAST_START,
+    CONF_STORAGE_BACKEND,
+    DEFAULT_DIAGNOSTIC_SENSORS,
+    DEFAULT_ENTITY_BUDGET,
+    DEFAULT_ENTITY_MODE,
+    DEFAULT_FAST_START,
+    DEFAULT_STORAGE_BACKEND,
     DOMAIN,
+    ENTITY_MODE_AGGREGATE,
+    FILE_FORMAT_CSV,
+    FILE_FORMATS,
+    HISTORY_COMPACT_INTERVAL,
+    INTERVAL_MODES,
+    PANEL_API_PATH,
+    PANEL_ICON,
+    PANEL_NAME,
+    PANEL_TITLE,
+    PANEL_URL,
     PLATFORMS,
-    SERVICE_MARK_COMPLETE,
+    SCHEDULE_MODES,
     SERVICE_CREATE_TASK,
+    SERVICE_CREATE_TASKS,
     SERVICE_DELETE_TASK,
+    SERVICE_DELETE_TASKS,
+    SERVICE_EXPORT_TASKS,
+    SERVICE_IMPORT_TASKS,
+    SERVICE_MARK_COMPLETE,
+    SERVICE_MARK_TASKS_COMPLETE,
+    SERVICE_PROFILE_REFRESHES,
+    SERVICE_QUERY_TASKS,
     SERVICE_UPDATE_TASK,
-    PANEL_URL,
-    PANEL_TITLE,
-    PANEL_ICON,
-    PANEL_NAME,
-    PANEL_API_PATH,
-    SCHEDULE_MODES,
-    INTERVAL_MODES,
+    SERVICE_UPDATE_TASKS,
+    SUMMARY_SENSOR_KEY,
+    TASK_PLATFORMS,
 )
-from .coordinator import TaskButlerCoordinator
-
-from .panel import (
-    async_register_panel,
-    async_unregister_panel,
+from .coordinator import TaskButlerCoordinator, async_remove_task_list
+from .index import SORT_KEYS, SORT_NEXT_DUE, TaskQuery
+from .panel import async_register_panel, async_unregister_panel
+from .transfer import (
+    async_export_tasks,
+    async_import_tasks,
+    file_format,
+    local_datetime,
+    resolve_path,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
+# Selects the task list of a config entry; optional while there is only one
+ENTRY_ID_FIELDS = {
+    vol.Optional(ATTR_ENTRY_ID): cv.string,
+}
+
 # Service schemas
 MARK_COMPLETE_SCHEMA = vol.Schema(
     {
@@ -56,6 +106,8 @@ CREATE_TASK_SCHEMA = vol.Schema(
         vol.Optional("fixed_date"): cv.string,
         vol.Optional("fixed_occurrence"): cv.string,
         vol.Optional("enabled", default=True): cv.boolean,
+        vol.Optional("area"): cv.string,
+        vol.Optional("create_entities", default=False): cv.boolean,
     }
 )
 
@@ -65,189 +117,861 @@ DELETE_TASK_SCHEMA = vol.Schema(
     }
 )
 
+TASK_UPDATE_FIELDS = {
+    vol.Optional("name"): cv.string,
+    vol.Optional("schedule_mode"): vol.In(SCHEDULE_MODES),
+    vol.Optional("interval_days"): cv.positive_int,
+    vol.Optional("interval_mode"): vol.In(INTERVAL_MODES),
+    vol.Optional("fixed_date"): cv.string,
+    vol.Optional("fixed_occurrence"): cv.string,
+    vol.Optional("enabled"): cv.boolean,
+    vol.Optional("area"): vol.Any(cv.string, None),
+    vol.Optional("create_entities"): cv.boolean,
+}
+
+TASK_UPDATES_SCHEMA = vol.Schema(TASK_UPDATE_FIELDS)
+
 UPDATE_TASK_SCHEMA = vol.Schema(
     {
         vol.Required("task_id"): cv.string,
-        vol.Optional("name"): cv.string,
-        vol.Optional("schedule_mode"): vol.In(SCHEDULE_MODES),
-        vol.Optional("interval_days"): cv.positive_int,
-        vol.Optional("interval_mode"): vol.In(INTERVAL_MODES),
-        vol.Optional("fixed_date"): cv.string,
-        vol.Optional("fixed_occurrence"): cv.string,
-        vol.Optional("enabled"): cv.boolean,
+        **TASK_UPDATE_FIELDS,
+    }
+)
+
+# Bulk service schemas; every item is validated before anything is applied
+TASK_IDS_SCHEMA = vol.Schema(
+    {
+        vol.Required("task_ids"): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+CREATE_TASKS_SCHEMA = vol.Schema(
+    {
+        vol.Required("tasks"): vol.All(cv.ensure_list, [CREATE_TASK_SCHEMA]),
+    }
+)
+
+UPDATE_TASKS_SCHEMA = vol.Schema(
+    {
+        vol.Required("tasks"): vol.All(cv.ensure_list, [UPDATE_TASK_SCHEMA]),
+    }
+)
+
+QUERY_TASKS_FIELDS = {
+    vol.Optional("is_due"): cv.boolean,
+    vol.Optional("enabled"): cv.boolean,
+    vol.Optional("schedule_mode"): vol.In(SCHEDULE_MODES),
+    vol.Optional("due_after"): vol.All(cv.datetime, dt_util.as_local),
+    vol.Optional("due_before"): vol.All(cv.datetime, dt_util.as_local),
+    vol.Optional("sort_by", default=SORT_NEXT_DUE): vol.In(SORT_KEYS),
+    vol.Optional("descending", default=False): cv.boolean,
+    vol.Optional("limit", default=50): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=1000)
+    ),
+    vol.Optional("cursor"): cv.string,
+}
+
+QUERY_TASKS_SCHEMA = vol.Schema(QUERY_TASKS_FIELDS)
+
+# Imported rows may also carry the timestamps their schedule depends on
+IMPORT_TASK_SCHEMA = CREATE_TASK_SCHEMA.extend(
+    {
+        vol.Optional("created_at"): local_datetime,
+        vol.Optional("last_completed"): local_datetime,
+    }
+)
+
+IMPORT_TASKS_SCHEMA = vol.Schema(
+    {
+        vol.Required("path"): cv.string,
+        vol.Optional("format"): vol.In(FILE_FORMATS),
+    }
+)
+
+EXPORT_TASKS_SCHEMA = vol.Schema(
+    {
+        vol.Optional("path"): cv.string,
+        vol.Optional("format"): vol.In(FILE_FORMATS),
+    }
+)
+
+PROFILE_REFRESHES_SCHEMA = vol.Schema(
+    {
+        vol.Optional("cycles", default=5): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
     }
 )
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up Task Butler component."""
+    hass.data.setdefault(DOMAIN, {})
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Task Butler from a config entry."""
+    timings: list[tuple[str, float]] = []
+    phase_start = time.perf_counter()
+
+    def end_phase(phase: str) -> None:
+        """Record how long a setup phase took."""
+        nonlocal phase_start
+        now = time.perf_counter()
+        timings.append((phase, now - phase_start))
+        phase_start = now
+
     # Initialize coordinator
     coordinator = TaskButlerCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
-
-    # Store coordinator in hass data
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN] = coordinator
+    fast_start = entry.options.get(CONF_FAST_START, DEFAULT_FAST_START)
+    if fast_start and await coordinator.async_restore_snapshot():
+        end_phase("restore snapshot")
+    else:
+        fast_start = False
+        await coordinator.async_config_entry_first_refresh()
+        end_phase("load tasks")
+
+    # Store coordinator in hass data, one per task list
+    coordinators: dict[str, TaskButlerCoordinator] = hass.data.setdefault(DOMAIN, {})
+    coordinators[entry.entry_id] = coordinator
+    first_entry = len(coordinators) == 1
 
     # Register WebSocket commands
+    websocket_api.async_register_command(hass, ws_get_task_lists)
     websocket_api.async_register_command(hass, ws_get_tasks)
+    websocket_api.async_register_command(hass, ws_subscribe_tasks)
+    websocket_api.async_register_command(hass, ws_query_tasks)
+    websocket_api.async_register_command(hass, ws_get_history)
     websocket_api.async_register_command(hass, ws_create_task)
     websocket_api.async_register_command(hass, ws_mark_complete)
     websocket_api.async_register_command(hass, ws_delete_task)
     websocket_api.async_register_command(hass, ws_update_task)
-
-    # Setup frontend panel (following Home Maintenance pattern)
-    await async_register_panel(hass)
+    websocket_api.async_register_command(hass, ws_mark_tasks_complete)
+    websocket_api.async_register_command(hass, ws_create_tasks)
+    websocket_api.async_register_command(hass, ws_delete_tasks)
+    websocket_api.async_register_command(hass, ws_update_tasks)
 
     # Forward setup to platforms
+    _async_remove_stale_entities(hass, entry, coordinator)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    end_phase("platforms")
 
-    # Register services
-    await _async_register_services(hass, coordinator)
+    # Setup frontend panel (following Home Maintenance pattern)
+    if first_entry:
+        await async_register_panel(hass)
+    end_phase("panel")
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    # Task entities follow single tasks rather than the coordinator, so keep
+    # a listener registered for the safety refresh to stay scheduled
+    entry.async_on_unload(coordinator.async_add_listener(lambda: None))
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, coordinator.async_compact_history, HISTORY_COMPACT_INTERVAL
+        )
+    )
 
+    # Register services
+    if first_entry:
+        await _async_register_services(hass)
+    end_phase("services")
+
+    if fast_start:
+        # Entities show the restored states until the full load replaces them
+        entry.async_create_background_task(
+            hass, _async_load_in_background(coordinator), f"{DOMAIN}_initial_load"
+        )
+
+    _LOGGER.debug(
+        "Set up in %.3fs (%s)",
+        sum(duration for _, duration in timings),
+        ", ".join(f"{phase} {duration:.3f}s" for phase, duration in timings),
+    )
     return True
 
 
-async def _async_register_services(
-    hass: HomeAssistant, coordinator: TaskButlerCoordinator
+async def _async_load_in_background(coordinator: TaskButlerCoordinator) -> None:
+    """Run the full load and recompute after a fast start."""
+    start = time.perf_counter()
+    await coordinator.async_refresh()
+    _LOGGER.debug("Background load finished in %.3fs", time.perf_counter() - start)
+
+
+@callback
+def _async_remove_stale_entities(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: TaskButlerCoordinator
 ) -> None:
+    """
+    Remove registry entries of tasks deleted while Home Assistant was down.
+
+    Also removes those of sensors and tasks the entity options no longer cover.
+    """
+    registry = er.async_get(hass)
+    prefix = f"{DOMAIN}_"
+    for registry_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        unique_id = registry_entry.unique_id
+        if registry_entry.domain not in TASK_PLATFORMS:
+            continue
+        if not unique_id.startswith(prefix):
+            continue
+        task_id = unique_id.removeprefix(prefix).split("_", 1)[0]
+        if task_id == entry.entry_id:
+            # Summary and diagnostic sensors of the entry rather than of a task
+            key = unique_id.removeprefix(f"{prefix}{task_id}_")
+            if key.startswith(SUMMARY_SENSOR_KEY):
+                # Area rollups also go once their area has no tasks left
+                area = key.removeprefix(f"{SUMMARY_SENSOR_KEY}_area_")
+                keep = coordinator.entity_mode == ENTITY_MODE_AGGREGATE and (
+                    area == key or area in coordinator.index.areas
+                )
+            else:
+                keep = coordinator.diagnostic_sensors
+            if not keep:
+                registry.async_remove(registry_entry.entity_id)
+            continue
+        if task_id not in coordinator.tasks or not coordinator.has_task_entities(
+            task_id
+        ):
+            registry.async_remove(registry_entry.entity_id)
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Handle options update."""
+    coordinator: TaskButlerCoordinator = hass.data[DOMAIN][entry.entry_id]
+    if (
+        entry.options.get(CONF_STORAGE_BACKEND, DEFAULT_STORAGE_BACKEND)
+        != coordinator.storage_backend
+        or entry.options.get(CONF_DIAGNOSTIC_SENSORS, DEFAULT_DIAGNOSTIC_SENSORS)
+        != coordinator.diagnostic_sensors
+        or entry.options.get(CONF_ENTITY_MODE, DEFAULT_ENTITY_MODE)
+        != coordinator.entity_mode
+        or entry.options.get(CONF_ENTITY_BUDGET, DEFAULT_ENTITY_BUDGET)
+        != coordinator.entity_budget
+    ):
+        # Reloading migrates the tasks into a newly selected backend and
+        # adds or removes the diagnostic, summary and task entities
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    coordinator.async_update_options()
+
+
+async def _async_register_services(hass: HomeAssistant) -> None:
     """Register Task Butler services."""
 
     async def handle_mark_complete(call: ServiceCall) -> None:
         """Handle mark task complete service call."""
         task_id = call.data["task_id"]
-        await coordinator.mark_task_complete(task_id)
+        await _get_coordinator(hass, call.data).mark_task_complete(task_id)
 
     async def handle_create_task(call: ServiceCall) -> None:
         """Handle create task service call."""
-        await coordinator.create_task(call.data)
+        await _get_coordinator(hass, call.data).create_task(call.data)
 
     async def handle_delete_task(call: ServiceCall) -> None:
         """Handle delete task service call."""
         task_id = call.data["task_id"]
-        await coordinator.delete_task(task_id)
+        await _get_coordinator(hass, call.data).delete_task(task_id)
 
     async def handle_update_task(call: ServiceCall) -> None:
         """Handle update task service call."""
         task_id = call.data["task_id"]
-        updates = {k: v for k, v in call.data.items() if k != "task_id"}
-        await coordinator.update_task(task_id, updates)
+        updates = {
+            k: v for k, v in call.data.items() if k not in ("task_id", ATTR_ENTRY_ID)
+        }
+        await _get_coordinator(hass, call.data).update_task(task_id, updates)
 
     # Register all services
     hass.services.async_register(
-        DOMAIN, SERVICE_MARK_COMPLETE, handle_mark_complete, schema=MARK_COMPLETE_SCHEMA
+        DOMAIN,
+        SERVICE_MARK_COMPLETE,
+        handle_mark_complete,
+        schema=MARK_COMPLETE_SCHEMA.extend(ENTRY_ID_FIELDS),
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_CREATE_TASK, handle_create_task, schema=CREATE_TASK_SCHEMA
+        DOMAIN,
+        SERVICE_CREATE_TASK,
+        handle_create_task,
+        schema=CREATE_TASK_SCHEMA.extend(ENTRY_ID_FIELDS),
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_DELETE_TASK, handle_delete_task, schema=DELETE_TASK_SCHEMA
+        DOMAIN,
+        SERVICE_DELETE_TASK,
+        handle_delete_task,
+        schema=DELETE_TASK_SCHEMA.extend(ENTRY_ID_FIELDS),
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_UPDATE_TASK, handle_update_task, schema=UPDATE_TASK_SCHEMA
+        DOMAIN,
+        SERVICE_UPDATE_TASK,
+        handle_update_task,
+        schema=UPDATE_TASK_SCHEMA.extend(ENTRY_ID_FIELDS),
     )
 
+    _async_register_bulk_services(hass)
+    _async_register_file_services(hass)
+
+
+@callback
+def _async_register_bulk_services(hass: HomeAssistant) -> None:
+    """Register the services acting on many tasks at once."""
+
+    async def handle_mark_tasks_complete(call: ServiceCall) -> None:
+        """Handle mark tasks complete service call."""
+        coordinator = _get_coordinator(hass, call.data)
+        await coordinator.mark_tasks_complete(call.data["task_ids"])
+
+    async def handle_create_tasks(call: ServiceCall) -> None:
+        """Handle create tasks service call."""
+        await _get_coordinator(hass, call.data).create_tasks(call.data["tasks"])
+
+    async def handle_delete_tasks(call: ServiceCall) -> None:
+        """Handle delete tasks service call."""
+        await _get_coordinator(hass, call.data).delete_tasks(call.data["task_ids"])
+
+    async def handle_update_tasks(call: ServiceCall) -> None:
+        """Handle update tasks service call."""
+        coordinator = _get_coordinator(hass, call.data)
+        await coordinator.update_tasks(_group_updates(call.data["tasks"]))
+
+    async def handle_query_tasks(call: ServiceCall) -> ServiceResponse:
+        """Handle query tasks service call."""
+        query = {k: v for k, v in call.data.items() if k != ATTR_ENTRY_ID}
+        return _get_coordinator(hass, call.data).query_tasks(TaskQuery(**query))
+
+    async def handle_profile_refreshes(call: ServiceCall) -> ServiceResponse:
+        """Handle profile refreshes service call."""
+        coordinator = _get_coordinator(hass, call.data)
+        return {"path": coordinator.async_profile_cycles(call.data["cycles"])}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_MARK_TASKS_COMPLETE,
+        handle_mark_tasks_complete,
+        schema=TASK_IDS_SCHEMA.extend(ENTRY_ID_FIELDS),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CREATE_TASKS,
+        handle_create_tasks,
+        schema=CREATE_TASKS_SCHEMA.extend(ENTRY_ID_FIELDS),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DELETE_TASKS,
+        handle_delete_tasks,
+        schema=TASK_IDS_SCHEMA.extend(ENTRY_ID_FIELDS),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UPDATE_TASKS,
+        handle_update_tasks,
+        schema=UPDATE_TASKS_SCHEMA.extend(ENTRY_ID_FIELDS),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_TASKS,
+        handle_query_tasks,
+        schema=QUERY_TASKS_SCHEMA.extend(ENTRY_ID_FIELDS),
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESHES,
+        handle_profile_refreshes,
+        schema=PROFILE_REFRESHES_SCHEMA.extend(ENTRY_ID_FIELDS),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def _async_register_file_services(hass: HomeAssistant) -> None:
+    """Register the task import and export services."""
+
+    async def handle_import_tasks(call: ServiceCall) -> ServiceResponse:
+        """Handle import tasks service call."""
+        coordinator = _get_coordinator(hass, call.data)
+        path = resolve_path(hass, call.data["path"])
+        return await async_import_tasks(
+            hass,
+            coordinator,
+            path,
+            file_format(path, call.data.get("format")),
+            IMPORT_TASK_SCHEMA,
+        )
+
+    async def handle_export_tasks(call: ServiceCall) -> ServiceResponse:
+        """Handle export tasks service call."""
+        coordinator = _get_coordinator(hass, call.data)
+        if "path" in call.data:
+            path = resolve_path(hass, call.data["path"])
+            export_format = file_format(path, call.data.get("format"))
+        else:
+            export_format = call.data.get("format", FILE_FORMAT_CSV)
+            path = hass.config.path(
+                f"{DOMAIN}_export_{dt_util.now():%Y%m%d_%H%M%S}.{export_format}"
+            )
+        exported = await async_export_tasks(hass, coordinator, path, export_format)
+        return {"path": path, "exported": exported}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_TASKS,
+        handle_import_tasks,
+        schema=IMPORT_TASKS_SCHEMA.extend(ENTRY_ID_FIELDS),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_TASKS,
+        handle_export_tasks,
+        schema=EXPORT_TASKS_SCHEMA.extend(ENTRY_ID_FIELDS),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def _get_coordinator(
+    hass: HomeAssistant, data: Mapping[str, Any]
+) -> TaskButlerCoordinator:
+    """
+    Return the coordinator of the task list a call or command targets.
+
+    Without an entry ID this is the task list holding the first task the
+    call refers to, or else the first task list that was set up.
+    """
+    coordinators: dict[str, TaskButlerCoordinator] = hass.data.get(DOMAIN, {})
+    if (entry_id := data.get(ATTR_ENTRY_ID)) is not None:
+        if (coordinator := coordinators.get(entry_id)) is None:
+            msg = f"Task list {entry_id} is not loaded"
+            raise HomeAssistantError(msg)
+        return coordinator
+
+    if len(coordinators) > 1 and (task_id := _first_task_id(data)) is not None:
+        for coordinator in coordinators.values():
+            if task_id in coordinator.tasks:
+                return coordinator
+    if not coordinators:
+        msg = "No task list is loaded"
+        raise HomeAssistantError(msg)
+    return next(iter(coordinators.values()))
+
+
+def _first_task_id(data: Mapping[str, Any]) -> str | None:
+    """Return the first task ID a call or command refers to."""
+    if "task_id" in data:
+        return data["task_id"]
+    if task_ids := data.get("task_ids"):
+        return task_ids[0]
+    for item in data.get("tasks", ()):
+        if "task_id" in item:
+            return item["task_id"]
+    return None
+
+
+def _group_updates(items: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Group validated update items by task ID."""
+    updates: dict[str, dict[str, Any]] = {}
+    for item in items:
+        updates.setdefault(item["task_id"], {}).update(
+            {k: v for k, v in item.items() if k != "task_id"}
+        )
+    return updates
+
+
+def _timed_command(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Record the count and latency of a WebSocket command handler."""
+
+    def record(hass: HomeAssistant, msg: dict, start: float) -> None:
+        try:
+            coordinator = _get_coordinator(hass, msg)
+        except HomeAssistantError:
+            return
+        coordinator.stats.record_command(msg["type"], time.perf_counter() - start)
+
+    if asyncio.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(
+            hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+        ) -> None:
+            start = time.perf_counter()
+            try:
+                await func(hass, connection, msg)
+            finally:
+                record(hass, msg, start)
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+    ) -> None:
+        start = time.perf_counter()
+        try:
+            func(hass, connection, msg)
+        finally:
+            record(hass, msg, start)
+
+    return wrapper
+
 
 # WebSocket API Commands
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/get_task_lists",
+    }
+)
+@callback
+@_timed_command
+def ws_get_task_lists(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle get task lists WebSocket command."""
+    coordinators: dict[str, TaskButlerCoordinator] = hass.data[DOMAIN]
+    connection.send_result(
+        msg["id"],
+        {
+            "task_lists": [
+                {
+                    "entry_id": entry_id,
+                    "title": coordinator.entry.title,
+                    "task_count": len(coordinator.tasks),
+                }
+                for entry_id, coordinator in coordinators.items()
+            ]
+        },
+    )
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): f"{DOMAIN}/get_tasks",
+        vol.Optional(ATTR_ENTRY_ID): str,
+        vol.Optional("since_revision"): int,
     }
 )
 @websocket_api.async_response
+@_timed_command
 async def ws_get_tasks(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
-    """Handle get tasks WebSocket command."""
-    coordinator: TaskButlerCoordinator = hass.data[DOMAIN]
-    connection.send_result(
-        msg["id"],
+    """
+    Handle get tasks WebSocket command.
+
+    A client that already holds the current revision only gets told so.
+    Otherwise the task list is sent as JSON encoded once per revision.
+    """
+    coordinator = _get_coordinator(hass, msg)
+    # Checked before reading the snapshot, which may not be built yet
+    if msg.get("since_revision") == coordinator.revision:
+        connection.send_result(
+            msg["id"],
+            {
+                "revision": coordinator.revision,
+                "unchanged": True,
+                "date_format": coordinator.date_format,
+            },
+        )
+        return
+    snapshot = coordinator.task_snapshot
+    payload = json_bytes(
         {
-            "tasks": list(coordinator.tasks.values()),
+            "revision": snapshot.revision,
+            "tasks": json_fragment(coordinator.tasks_json),
             "date_format": coordinator.date_format,
-        },
+        }
+    )
+    connection.send_message(
+        websocket_api.messages.construct_result_message(msg["id"], payload)
     )
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/query_tasks",
+        vol.Optional(ATTR_ENTRY_ID): str,
+        **QUERY_TASKS_FIELDS,
+    }
+)
+@websocket_api.async_response
+@_timed_command
+async def ws_query_tasks(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle query tasks WebSocket command."""
+    coordinator = _get_coordinator(hass, msg)
+    query = {k: v for k, v in msg.items() if k not in ("id", "type", ATTR_ENTRY_ID)}
+    try:
+        result = coordinator.query_tasks(TaskQuery(**query))
+        connection.send_result(
+            msg["id"], {**result, "date_format": coordinator.date_format}
+        )
+    except Exception as err:  # noqa: BLE001
+        connection.send_error(msg["id"], "query_failed", str(err))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/get_history",
+        vol.Optional(ATTR_ENTRY_ID): str,
+        vol.Required("task_id"): str,
+        vol.Optional("limit"): vol.All(int, vol.Range(min=1)),
+    }
+)
+@websocket_api.async_response
+@_timed_command
+async def ws_get_history(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle get completion history WebSocket command."""
+    coordinator = _get_coordinator(hass, msg)
+    try:
+        completions = await coordinator.history.async_get_completions(
+            msg["task_id"], msg.get("limit")
+        )
+        connection.send_result(
+            msg["id"],
+            {"completions": [completed.isoformat() for completed in completions]},
+        )
+    except Exception as err:  # noqa: BLE001
+        connection.send_error(msg["id"], "history_failed", str(err))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_tasks",
+        vol.Optional(ATTR_ENTRY_ID): str,
+        vol.Optional("since_revision"): int,
+    }
+)
+@callback
+@_timed_command
+def ws_subscribe_tasks(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """
+    Handle subscribe tasks WebSocket command.
+
+    Sends a snapshot (or, when resuming from a known revision, a delta)
+    followed by a delta event for every later revision.
+    """
+    coordinator = _get_coordinator(hass, msg)
+
+    @callback
+    def forward_changes(
+        revision: int, changed: frozenset[str], removed: frozenset[str]
+    ) -> None:
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"], _task_delta(coordinator, revision, changed, removed)
+            )
+        )
+
+    connection.subscriptions[msg["id"]] = coordinator.async_subscribe_changes(
+        forward_changes
+    )
+    connection.send_result(msg["id"])
+
+    changes = None
+    if "since_revision" in msg:
+        changes = coordinator.changes_since(msg["since_revision"])
+
+    if changes is None:
+        event = {
+            "revision": coordinator.task_snapshot.revision,
+            "snapshot": True,
+            "tasks": json_fragment(coordinator.tasks_json),
+            "date_format": coordinator.date_format,
+        }
+    else:
+        event = _task_delta(coordinator, coordinator.revision, *changes)
+    connection.send_message(websocket_api.event_message(msg["id"], event))
+
+
+def _task_delta(
+    coordinator: TaskButlerCoordinator,
+    revision: int,
+    changed: set[str] | frozenset[str],
+    removed: set[str] | frozenset[str],
+) -> dict[str, Any]:
+    """Build a delta event for changed and removed tasks."""
+    return {
+        "revision": revision,
+        "snapshot": False,
+        "changed": [
+            coordinator.task_dict(task_id)
+            for task_id in changed
+            if task_id in coordinator.tasks
+        ],
+        "removed": list(removed),
+    }
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): f"{DOMAIN}/create_task",
-        vol.Required("task_data"): dict,
+        vol.Optional(ATTR_ENTRY_ID): str,
+        vol.Required("task_data"): CREATE_TASK_SCHEMA,
     }
 )
 @websocket_api.async_response
+@_timed_command
 async def ws_create_task(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
     """Handle create task WebSocket command."""
-    coordinator: TaskButlerCoordinator = hass.data[DOMAIN]
+    coordinator = _get_coordinator(hass, msg)
     try:
         task_id = await coordinator.create_task(msg["task_data"])
         connection.send_result(msg["id"], {"task_id": task_id, "success": True})
-    except Exception as err:
+    except Exception as err:  # noqa: BLE001
         connection.send_error(msg["id"], "create_failed", str(err))
 
 
 @websocket_api.websocket_command(
     {
         vol.Required("type"): f"{DOMAIN}/mark_complete",
+        vol.Optional(ATTR_ENTRY_ID): str,
         vol.Required("task_id"): str,
     }
 )
 @websocket_api.async_response
+@_timed_command
 async def ws_mark_complete(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
     """Handle mark task complete WebSocket command."""
-    coordinator: TaskButlerCoordinator = hass.data[DOMAIN]
+    coordinator = _get_coordinator(hass, msg)
     try:
         await coordinator.mark_task_complete(msg["task_id"])
         connection.send_result(msg["id"], {"success": True})
-    except Exception as err:
+    except Exception as err:  # noqa: BLE001
         connection.send_error(msg["id"], "mark_complete_failed", str(err))
 
 
 @websocket_api.websocket_command(
     {
         vol.Required("type"): f"{DOMAIN}/delete_task",
+        vol.Optional(ATTR_ENTRY_ID): str,
         vol.Required("task_id"): str,
     }
 )
 @websocket_api.async_response
+@_timed_command
 async def ws_delete_task(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
     """Handle delete task WebSocket command."""
-    coordinator: TaskButlerCoordinator = hass.data[DOMAIN]
+    coordinator = _get_coordinator(hass, msg)
     try:
         await coordinator.delete_task(msg["task_id"])
         connection.send_result(msg["id"], {"success": True})
-    except Exception as err:
+    except Exception as err:  # noqa: BLE001
         connection.send_error(msg["id"], "delete_failed", str(err))
 
 
 @websocket_api.websocket_command(
     {
         vol.Required("type"): f"{DOMAIN}/update_task",
+        vol.Optional(ATTR_ENTRY_ID): str,
         vol.Required("task_id"): str,
-        vol.Required("updates"): dict,
+        vol.Required("updates"): TASK_UPDATES_SCHEMA,
     }
 )
 @websocket_api.async_response
+@_timed_command
 async def ws_update_task(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
     """Handle update task WebSocket command."""
-    coordinator: TaskButlerCoordinator = hass.data[DOMAIN]
+    coordinator = _get_coordinator(hass, msg)
     try:
         await coordinator.update_task(msg["task_id"], msg["updates"])
         connection.send_result(msg["id"], {"success": True})
-    except Exception as err:
+    except Exception as err:  # noqa: BLE001
+        connection.send_error(msg["id"], "update_failed", str(err))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/mark_tasks_complete",
+        vol.Optional(ATTR_ENTRY_ID): str,
+        vol.Required("task_ids"): [str],
+    }
+)
+@websocket_api.async_response
+@_timed_command
+async def ws_mark_tasks_complete(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle mark tasks complete WebSocket command."""
+    coordinator = _get_coordinator(hass, msg)
+    try:
+        await coordinator.mark_tasks_complete(msg["task_ids"])
+        connection.send_result(msg["id"], {"success": True})
+    except Exception as err:  # noqa: BLE001
+        connection.send_error(msg["id"], "mark_complete_failed", str(err))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/create_tasks",
+        vol.Optional(ATTR_ENTRY_ID): str,
+        vol.Required("tasks"): [CREATE_TASK_SCHEMA],
+    }
+)
+@websocket_api.async_response
+@_timed_command
+async def ws_create_tasks(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle create tasks WebSocket command."""
+    coordinator = _get_coordinator(hass, msg)
+    try:
+        task_ids = await coordinator.create_tasks(msg["tasks"])
+        connection.send_result(msg["id"], {"task_ids": task_ids, "success": True})
+    except Exception as err:  # noqa: BLE001
+        connection.send_error(msg["id"], "create_failed", str(err))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/delete_tasks",
+        vol.Optional(ATTR_ENTRY_ID): str,
+        vol.Required("task_ids"): [str],
+    }
+)
+@websocket_api.async_response
+@_timed_command
+async def ws_delete_tasks(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle delete tasks WebSocket command."""
+    coordinator = _get_coordinator(hass, msg)
+    try:
+        await coordinator.delete_tasks(msg["task_ids"])
+        connection.send_result(msg["id"], {"success": True})
+    except Exception as err:  # noqa: BLE001
+        connection.send_error(msg["id"], "delete_failed", str(err))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/update_tasks",
+        vol.Optional(ATTR_ENTRY_ID): str,
+        vol.Required("tasks"): [UPDATE_TASK_SCHEMA],
+    }
+)
+@websocket_api.async_response
+@_timed_command
+async def ws_update_tasks(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle update tasks WebSocket command."""
+    coordinator = _get_coordinator(hass, msg)
+    try:
+        await coordinator.update_tasks(_group_updates(msg["tasks"]))
+        connection.send_result(msg["id"], {"success": True})
+    except Exception as err:  # noqa: BLE001
         connection.send_error(msg["id"], "update_failed", str(err))
 
 
@@ -255,15 +979,33 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
-    if unload_ok:
-        hass.data.pop(DOMAIN)
+    if not unload_ok:
+        return False
+
+    coordinators: dict[str, TaskButlerCoordinator] = hass.data[DOMAIN]
+    # The coordinator registered its own shutdown as an unload callback
+    coordinators.pop(entry.entry_id)
 
-        # Remove services
+    if not coordinators:
+        # Remove services with the last task list
         hass.services.async_remove(DOMAIN, SERVICE_MARK_COMPLETE)
         hass.services.async_remove(DOMAIN, SERVICE_CREATE_TASK)
         hass.services.async_remove(DOMAIN, SERVICE_DELETE_TASK)
         hass.services.async_remove(DOMAIN, SERVICE_UPDATE_TASK)
+        hass.services.async_remove(DOMAIN, SERVICE_MARK_TASKS_COMPLETE)
+        hass.services.async_remove(DOMAIN, SERVICE_CREATE_TASKS)
+        hass.services.async_remove(DOMAIN, SERVICE_DELETE_TASKS)
+        hass.services.async_remove(DOMAIN, SERVICE_UPDATE_TASKS)
+        hass.services.async_remove(DOMAIN, SERVICE_QUERY_TASKS)
+        hass.services.async_remove(DOMAIN, SERVICE_PROFILE_REFRESHES)
+        hass.services.async_remove(DOMAIN, SERVICE_IMPORT_TASKS)
+        hass.services.async_remove(DOMAIN, SERVICE_EXPORT_TASKS)
+
+        async_unregister_panel(hass)
+
+    return True
 
-    async_unregister_panel(hass)
 
-    return unload_ok
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored task list of a removed config entry."""
+    await async_remove_task_list(hass, entry.entry_id)
@@ -12,10 +12,10 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import TaskButlerCoordinator
+from .entity import TaskButlerTaskEntity, async_setup_task_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,34 +26,30 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Task Butler binary sensor based on a config entry."""
-    coordinator: TaskButlerCoordinator = hass.data[DOMAIN]
+    coordinator: TaskButlerCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    # Create binary sensors for all tasks
-    entities = []
-    for task_id in coordinator.tasks:
-        entities.append(TaskDueBinarySensor(coordinator, task_id))
+    async_setup_task_entities(
+        hass,
+        entry,
+        coordinator,
+        async_add_entities,
+        lambda task_id: [TaskDueBinarySensor(coordinator, task_id)],
+    )
 
-    async_add_entities(entities, True)
 
-
-class TaskDueBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class TaskDueBinarySensor(TaskButlerTaskEntity, BinarySensorEntity):
     """Binary sensor for task due status."""
 
     def __init__(self, coordinator: TaskButlerCoordinator, task_id: str) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
-        self.task_id = task_id
+        super().__init__(coordinator, task_id)
         self._attr_device_class = BinarySensorDeviceClass.PROBLEM
 
-    @property
-    def task_data(self) -> dict[str, Any]:
-        """Get task data from coordinator."""
-        return self.coordinator.tasks.get(self.task_id, {})
-
     @property
     def name(self) -> str:
         """Return the name of the sensor."""
-        task_name = self.task_data.get("name", "Unknown Task")
+        task = self.task_data
+        task_name = task.name if task else "Unknown Task"
         return f"{task_name} Due"
 
     @property
@@ -64,37 +60,28 @@ class TaskDueBinarySensor(CoordinatorEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool:
         """Return true if the binary sensor is on."""
-        return self.task_data.get("is_due", False)
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return self.task_id in self.coordinator.tasks
+        task = self.task_data
+        return task.is_due if task else False
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes."""
         task = self.task_data
+        if task is None:
+            return {"task_id": self.task_id}
+
         attributes = {
             "task_id": self.task_id,
-            "schedule_mode": task.get("schedule_mode"),
-            "enabled": task.get("enabled", True),
+            "schedule_mode": task.schedule_mode,
+            "enabled": task.enabled,
         }
 
-        if task.get("next_due"):
-            next_due = task["next_due"]
-            if isinstance(next_due, str):
-                from datetime import datetime
-
-                next_due = datetime.fromisoformat(next_due)
-            attributes["next_due"] = self.coordinator.format_date(next_due)
-
-        if task.get("last_completed"):
-            last_completed = task["last_completed"]
-            if isinstance(last_completed, str):
-                from datetime import datetime
+        if task.next_due:
+            attributes["next_due"] = self.coordinator.format_date(task.next_due)
 
-                last_completed = datetime.fromisoformat(last_completed)
-            attributes["last_completed"] = self.coordinator.format_date(last_completed)
+        if task.last_completed:
+            attributes["last_completed"] = self.coordinator.format_date(
+                task.last_completed
+            )
 
         return attributes
@@ -0,0 +1,165 @@
+"""Calendar platform for Task Butler."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, FORECAST_HORIZON_DAYS
+from .coordinator import TaskButlerCoordinator
+from .forecast import ForecastIndex, ForecastSource, expand_all, expand_occurrences
+
+_LOGGER = logging.getLogger(__name__)
+
+# Roll the forecast horizon forward once a day
+FORECAST_REBUILD_INTERVAL = timedelta(days=1)
+
+# Changed tasks above which the forecast is rebuilt in the executor rather
+# than re-expanded on the event loop
+FORECAST_REBUILD_THRESHOLD = 50
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Task Butler calendar based on a config entry."""
+    coordinator: TaskButlerCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([TaskButlerCalendar(coordinator, entry)])
+
+
+class TaskButlerCalendar(CalendarEntity):
+    """
+    Calendar of upcoming task due dates.
+
+    Events are served from a forecast index that is built in the executor
+    and then updated per task as tasks change, or rebuilt in the executor
+    again when many change at once.
+    """
+
+    _attr_should_poll = False
+
+    def __init__(self, coordinator: TaskButlerCoordinator, entry: ConfigEntry) -> None:
+        """Initialize the calendar."""
+        self.coordinator = coordinator
+        self._attr_name = entry.title
+        self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_calendar"
+        self._forecast = ForecastIndex()
+        self._horizon = dt_util.now()
+        # Tasks changed while a full rebuild runs in the executor
+        self._changed_during_rebuild: set[str] | None = None
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the next upcoming event."""
+        today = dt_util.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        if (upcoming := self._forecast.first_after(today)) is None:
+            return None
+        return self._event(*upcoming)
+
+    async def async_get_events(
+        self, _hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return the task due dates between two points in time."""
+        # Events are all-day, so include occurrences earlier on the start day
+        return [
+            self._event(task_id, when)
+            for task_id, when in self._forecast.between(
+                start_date - timedelta(days=1), end_date
+            )
+            if when.date() >= start_date.date()
+        ]
+
+    async def async_added_to_hass(self) -> None:
+        """Build the forecast and follow task changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_subscribe_changes(self._handle_task_changes)
+        )
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_rebuild, FORECAST_REBUILD_INTERVAL
+            )
+        )
+        await self._async_rebuild()
+
+    async def _async_rebuild(self, _now: datetime | None = None) -> None:
+        """Expand every task's occurrences in the executor."""
+        if self._changed_during_rebuild is not None:
+            # The running rebuild picks up every change made since it started
+            return
+
+        self._horizon = dt_util.now() + timedelta(days=FORECAST_HORIZON_DAYS)
+        sources = [
+            source
+            for task in self.coordinator.tasks.values()
+            if (source := ForecastSource.from_task(task)) is not None
+        ]
+
+        self._changed_during_rebuild = set()
+        try:
+            occurrences = await self.hass.async_add_executor_job(
+                expand_all, sources, self._horizon
+            )
+        finally:
+            changed, self._changed_during_rebuild = self._changed_during_rebuild, None
+
+        self._forecast.rebuild(occurrences)
+        # Catch up on tasks whose schedule moved while the executor was busy
+        self._async_update_tasks(changed)
+
+        _LOGGER.debug(
+            "Forecast rebuilt with %d occurrences of %d tasks",
+            len(self._forecast),
+            len(sources),
+        )
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_task_changes(
+        self, _revision: int, changed: frozenset[str], removed: frozenset[str]
+    ) -> None:
+        """Update the forecast of only the tasks that changed."""
+        if self._changed_during_rebuild is not None:
+            # The running rebuild re-expands these once it finishes
+            self._changed_during_rebuild |= changed | removed
+            return
+        self._async_update_tasks(changed | removed)
+        self.async_write_ha_state()
+
+    @callback
+    def _async_update_tasks(self, task_ids: set[str]) -> None:
+        """Re-expand changed tasks, or rebuild in the executor if there are many."""
+        if len(task_ids) > FORECAST_REBUILD_THRESHOLD:
+            self.hass.async_create_task(
+                self._async_rebuild(), f"{DOMAIN}_forecast_rebuild"
+            )
+            return
+
+        occurrences: dict[str, list[datetime]] = {}
+        for task_id in task_ids:
+            task = self.coordinator.tasks.get(task_id)
+            source = ForecastSource.from_task(task) if task else None
+            occurrences[task_id] = (
+                expand_occurrences(source, self._horizon) if source else []
+            )
+        self._forecast.update(occurrences)
+
+    def _event(self, task_id: str, when: datetime) -> CalendarEvent:
+        """Return the all-day event of a task occurrence."""
+        task = self.coordinator.tasks.get(task_id)
+        day = when.date()
+        return CalendarEvent(
+            start=day,
+            end=day + timedelta(days=1),
+            summary=task.name if task else task_id,
+            uid=f"{task_id}_{day.isoformat()}",
+        )
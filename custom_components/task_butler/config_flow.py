@@ -8,16 +8,43 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.const import CONF_NAME
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN, DATE_FORMATS, DEFAULT_DATE_FORMAT
+from .const import (
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_ENTITY_BUDGET,
+    CONF_ENTITY_MODE,
+    CONF_EVENT_RATE_LIMIT,
+    CONF_FAST_START,
+    CONF_OVERDUE_AFTER,
+    CONF_SAFETY_REFRESH_INTERVAL,
+    CONF_SAVE_DELAY,
+    CONF_STORAGE_BACKEND,
+    DATE_FORMATS,
+    DEFAULT_DATE_FORMAT,
+    DEFAULT_DIAGNOSTIC_SENSORS,
+    DEFAULT_ENTITY_BUDGET,
+    DEFAULT_ENTITY_MODE,
+    DEFAULT_EVENT_RATE_LIMIT,
+    DEFAULT_FAST_START,
+    DEFAULT_OVERDUE_AFTER,
+    DEFAULT_SAFETY_REFRESH_INTERVAL,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_STORAGE_BACKEND,
+    DOMAIN,
+    ENTITY_MODES,
+    NAME,
+    STORAGE_BACKENDS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
+        vol.Required(CONF_NAME, default=NAME): str,
         vol.Required("date_format", default=DEFAULT_DATE_FORMAT): vol.In(DATE_FORMATS),
     }
 )
@@ -25,7 +52,13 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input."""
-    return {"title": "Task Butler"}
+    title = data[CONF_NAME].strip()
+    if any(
+        entry.title.casefold() == title.casefold()
+        for entry in hass.config_entries.async_entries(DOMAIN)
+    ):
+        raise NameExistsError
+    return {"title": title}
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -37,14 +70,13 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
-        if self._async_current_entries():
-            return self.async_abort(reason="single_instance_allowed")
-
         errors: dict[str, str] = {}
 
         if user_input is not None:
             try:
                 info = await validate_input(self.hass, user_input)
+            except NameExistsError:
+                errors[CONF_NAME] = "name_exists"
             except Exception:
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
@@ -86,7 +118,65 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         "date_format", DEFAULT_DATE_FORMAT
                     ),
                 ): vol.In(DATE_FORMATS),
+                vol.Required(
+                    CONF_SAFETY_REFRESH_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_SAFETY_REFRESH_INTERVAL, DEFAULT_SAFETY_REFRESH_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_SAVE_DELAY,
+                    default=self.config_entry.options.get(
+                        CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=300)),
+                vol.Required(
+                    CONF_STORAGE_BACKEND,
+                    default=self.config_entry.options.get(
+                        CONF_STORAGE_BACKEND, DEFAULT_STORAGE_BACKEND
+                    ),
+                ): vol.In(STORAGE_BACKENDS),
+                vol.Required(
+                    CONF_FAST_START,
+                    default=self.config_entry.options.get(
+                        CONF_FAST_START, DEFAULT_FAST_START
+                    ),
+                ): bool,
+                vol.Required(
+                    CONF_DIAGNOSTIC_SENSORS,
+                    default=self.config_entry.options.get(
+                        CONF_DIAGNOSTIC_SENSORS, DEFAULT_DIAGNOSTIC_SENSORS
+                    ),
+                ): bool,
+                vol.Required(
+                    CONF_OVERDUE_AFTER,
+                    default=self.config_entry.options.get(
+                        CONF_OVERDUE_AFTER, DEFAULT_OVERDUE_AFTER
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_EVENT_RATE_LIMIT,
+                    default=self.config_entry.options.get(
+                        CONF_EVENT_RATE_LIMIT, DEFAULT_EVENT_RATE_LIMIT
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+                vol.Required(
+                    CONF_ENTITY_MODE,
+                    default=self.config_entry.options.get(
+                        CONF_ENTITY_MODE, DEFAULT_ENTITY_MODE
+                    ),
+                ): vol.In(ENTITY_MODES),
+                vol.Required(
+                    CONF_ENTITY_BUDGET,
+                    default=self.config_entry.options.get(
+                        CONF_ENTITY_BUDGET, DEFAULT_ENTITY_BUDGET
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
             }
         )
 
         return self.async_show_form(step_id="init", data_schema=options_schema)
+
+
+class NameExistsError(HomeAssistantError):
+    """Error to indicate a task list with the name already exists."""
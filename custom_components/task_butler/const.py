@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import Final
 
 VERSION = "0.1.0"
@@ -12,6 +13,40 @@ DOMAIN: Final = "task_butler"
 
 # Config keys
 CONF_DATE_FORMAT: Final = "date_format"
+CONF_SAFETY_REFRESH_INTERVAL: Final = "safety_refresh_interval"
+CONF_SAVE_DELAY: Final = "save_delay"
+CONF_STORAGE_BACKEND: Final = "storage_backend"
+CONF_FAST_START: Final = "fast_start"
+CONF_DIAGNOSTIC_SENSORS: Final = "diagnostic_sensors"
+CONF_OVERDUE_AFTER: Final = "overdue_after"
+CONF_EVENT_RATE_LIMIT: Final = "event_rate_limit"
+CONF_ENTITY_MODE: Final = "entity_mode"
+CONF_ENTITY_BUDGET: Final = "entity_budget"
+
+# Service and WebSocket field selecting the task list of a config entry
+ATTR_ENTRY_ID: Final = "entry_id"
+
+# Storage backends
+STORAGE_BACKEND_JSON: Final = "json"
+STORAGE_BACKEND_SQLITE: Final = "sqlite"
+
+STORAGE_BACKENDS: Final = [
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKEND_SQLITE,
+]
+
+# Entity modes
+ENTITY_MODE_PER_TASK: Final = "per_task"
+# Summary sensors per list and area, entities only for opted-in tasks
+ENTITY_MODE_AGGREGATE: Final = "aggregate"
+
+ENTITY_MODES: Final = [
+    ENTITY_MODE_PER_TASK,
+    ENTITY_MODE_AGGREGATE,
+]
+
+# Unique ID part shared by the summary sensors of aggregate mode
+SUMMARY_SENSOR_KEY: Final = "summary"
 
 # Date format options
 DATE_FORMAT_DD_MM_YYYY: Final = "dd.mm.yyyy"
@@ -46,20 +81,69 @@ INTERVAL_MODES: Final = [
     INTERVAL_AFTER_COMPLETION,
 ]
 
+# Days of future due dates shown on the calendar
+FORECAST_HORIZON_DAYS: Final = 366
+
+# How often closed completion history segments are compacted
+HISTORY_COMPACT_INTERVAL: Final = timedelta(days=1)
+
 # Default values
 DEFAULT_DATE_FORMAT: Final = DATE_FORMAT_DDDD_DD_MM_YYYY
 DEFAULT_SCHEDULE_MODE: Final = SCHEDULE_FIXED_INTERVAL
 DEFAULT_INTERVAL_MODE: Final = INTERVAL_HARD_FIXED
 DEFAULT_INTERVAL_DAYS: Final = 30
+# Minutes between full safety-net refreshes; 0 disables polling
+DEFAULT_SAFETY_REFRESH_INTERVAL: Final = 60
+# Seconds to coalesce task mutations into a single write
+DEFAULT_SAVE_DELAY: Final = 5
+DEFAULT_STORAGE_BACKEND: Final = STORAGE_BACKEND_JSON
+DEFAULT_FAST_START: Final = False
+DEFAULT_DIAGNOSTIC_SENSORS: Final = False
+# Hours a task can stay due before it is overdue; 0 disables overdue events
+DEFAULT_OVERDUE_AFTER: Final = 24
+# Task events fired per second; 0 disables the limit
+DEFAULT_EVENT_RATE_LIMIT: Final = 10
+DEFAULT_ENTITY_MODE: Final = ENTITY_MODE_PER_TASK
+# Tasks that may opt into their own entities in aggregate mode
+DEFAULT_ENTITY_BUDGET: Final = 25
 
 # Service names
 SERVICE_MARK_COMPLETE: Final = "mark_task_complete"
 SERVICE_CREATE_TASK: Final = "create_task"
 SERVICE_DELETE_TASK: Final = "delete_task"
 SERVICE_UPDATE_TASK: Final = "update_task"
+SERVICE_MARK_TASKS_COMPLETE: Final = "mark_tasks_complete"
+SERVICE_CREATE_TASKS: Final = "create_tasks"
+SERVICE_DELETE_TASKS: Final = "delete_tasks"
+SERVICE_UPDATE_TASKS: Final = "update_tasks"
+SERVICE_QUERY_TASKS: Final = "query_tasks"
+SERVICE_PROFILE_REFRESHES: Final = "profile_refreshes"
+SERVICE_IMPORT_TASKS: Final = "import_tasks"
+SERVICE_EXPORT_TASKS: Final = "export_tasks"
+
+# Import and export file formats
+FILE_FORMAT_CSV: Final = "csv"
+FILE_FORMAT_JSONL: Final = "jsonl"
+
+FILE_FORMATS: Final = [
+    FILE_FORMAT_CSV,
+    FILE_FORMAT_JSONL,
+]
+
+# Events fired with every task that crossed the same deadline
+EVENT_TASK_DUE: Final = f"{DOMAIN}_task_due"
+EVENT_TASK_OVERDUE: Final = f"{DOMAIN}_task_overdue"
+
+# Dispatcher signals per config entry, formatted with the entry ID and sent
+# with a list of task IDs
+SIGNAL_TASKS_ADDED: Final = f"{DOMAIN}_tasks_added_{{}}"
+SIGNAL_TASKS_REMOVED: Final = f"{DOMAIN}_tasks_removed_{{}}"
 
 # Platforms
-PLATFORMS: Final = ["binary_sensor", "sensor"]
+PLATFORMS: Final = ["binary_sensor", "calendar", "sensor", "switch"]
+
+# Platforms whose entities each belong to a single task
+TASK_PLATFORMS: Final = ["binary_sensor", "sensor", "switch"]
 
 # Panel constants
 PANEL_URL: Final = "task-butler"
@@ -2,30 +2,97 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import asyncio
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+import cProfile
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 import logging
+import time
 from typing import Any
 import uuid
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    CONF_DATE_FORMAT,
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_ENTITY_BUDGET,
+    CONF_ENTITY_MODE,
+    CONF_EVENT_RATE_LIMIT,
+    CONF_FAST_START,
+    CONF_OVERDUE_AFTER,
+    CONF_SAFETY_REFRESH_INTERVAL,
+    CONF_SAVE_DELAY,
+    CONF_STORAGE_BACKEND,
+    DATE_FORMAT_DD_MM_YYYY,
+    DATE_FORMAT_DDDD_DD_MM_YYYY,
+    DATE_FORMAT_DDDD_MM_DD_YYYY,
+    DATE_FORMAT_MM_DD_YYYY,
+    DEFAULT_DATE_FORMAT,
+    DEFAULT_DIAGNOSTIC_SENSORS,
+    DEFAULT_ENTITY_BUDGET,
+    DEFAULT_ENTITY_MODE,
+    DEFAULT_EVENT_RATE_LIMIT,
+    DEFAULT_FAST_START,
+    DEFAULT_OVERDUE_AFTER,
+    DEFAULT_SAFETY_REFRESH_INTERVAL,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_STORAGE_BACKEND,
     DOMAIN,
-    SCHEDULE_FIXED_DATE,
-    SCHEDULE_FIXED_OCCURRENCE,
-    SCHEDULE_FIXED_INTERVAL,
-    INTERVAL_HARD_FIXED,
+    ENTITY_MODE_AGGREGATE,
+    EVENT_TASK_DUE,
+    EVENT_TASK_OVERDUE,
     INTERVAL_AFTER_COMPLETION,
-    DEFAULT_DATE_FORMAT,
+    SCHEDULE_FIXED_INTERVAL,
+    SIGNAL_TASKS_ADDED,
+    SIGNAL_TASKS_REMOVED,
 )
+from .events import TaskEventDispatcher
+from .history import CompletionHistory
+from .index import TaskIndex, TaskQuery
+from .models import DERIVED_FIELDS, Task, TaskSnapshot, datetime_from_timestamp
+from .recurrence import compile_recurrence
+from .scheduler import DueScheduler
+from .stats import DurationHistogram, RuntimeStats
+from .storage import STORAGE_BACKENDS, async_migrate_storage, create_task_storage
 
 _LOGGER = logging.getLogger(__name__)
 
-STORAGE_VERSION = 1
-STORAGE_KEY = f"{DOMAIN}_tasks"
+# Number of revisions a subscriber can fall behind and still resume
+CHANGE_LOG_SIZE = 256
+
+# Seconds to collect enable switch toggles into a single update
+ENABLE_BATCH_DELAY = 0.1
+
+# Snapshot of computed task states restored on a fast start
+SNAPSHOT_VERSION = 1
+SNAPSHOT_KEY = f"{DOMAIN}_snapshot"
+SNAPSHOT_SAVE_DELAY = 60
+
+ChangeSubscriber = Callable[[int, frozenset[str], frozenset[str]], None]
+
+# strftime patterns for the configurable date formats
+DATE_FORMAT_PATTERNS = {
+    DATE_FORMAT_DD_MM_YYYY: "%d.%m.%Y",
+    DATE_FORMAT_DDDD_DD_MM_YYYY: "%A %d.%m.%Y",
+    DATE_FORMAT_MM_DD_YYYY: "%m/%d/%Y",
+    DATE_FORMAT_DDDD_MM_DD_YYYY: "%A %m/%d/%Y",
+}
+
+# Number of formatted dates to keep; entities share most of their dates
+FORMATTED_DATE_CACHE_SIZE = 4096
 
 
 class TaskButlerCoordinator(DataUpdateCoordinator):
@@ -36,64 +103,614 @@ class TaskButlerCoordinator(DataUpdateCoordinator):
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(minutes=5),
+            name=f"{DOMAIN}_{entry.entry_id}",
+            update_interval=_safety_refresh_interval(entry),
         )
         self.entry = entry
-        self.store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
-        self.tasks: dict[str, dict[str, Any]] = {}
+        self._signal_tasks_added = SIGNAL_TASKS_ADDED.format(entry.entry_id)
+        self._signal_tasks_removed = SIGNAL_TASKS_REMOVED.format(entry.entry_id)
+        self.storage_backend = entry.options.get(
+            CONF_STORAGE_BACKEND, DEFAULT_STORAGE_BACKEND
+        )
+        self.store = create_task_storage(
+            hass,
+            self.storage_backend,
+            lambda: self.tasks,
+            entry.options.get(CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY),
+            entry.entry_id,
+        )
+        self.tasks: dict[str, Task] = {}
+        # Serializes task mutations from services and WebSocket commands
+        self._mutation_lock = asyncio.Lock()
+        # Enable switch toggles waiting for the delayed batch to apply them
+        self._pending_enabled: dict[str, bool] = {}
+        self._enabled_applied: asyncio.Future[None] | None = None
+        self._unsub_enabled: CALLBACK_TYPE | None = None
+        # Published tasks of the current revision, built on first read
+        self._task_snapshot: TaskSnapshot | None = None
+        # The published tasks encoded as JSON, shared by every WebSocket client
+        self._tasks_json: tuple[TaskSnapshot, bytes] | None = None
+        # Dict format per task, valid while the task object is unchanged
+        self._task_dicts: dict[str, tuple[Task, dict[str, Any]]] = {}
+        self.history = CompletionHistory(hass, entry.entry_id)
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self.fast_start = entry.options.get(CONF_FAST_START, DEFAULT_FAST_START)
+        self._snapshot: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_VERSION, f"{SNAPSHOT_KEY}.{entry.entry_id}"
+        )
+        # IDs of tasks restored from the snapshot until the full load replaces them
+        self._restored: set[str] | None = None
+        self.scheduler = DueScheduler(hass, self._async_handle_due)
+        # Armed for due tasks at the time they become overdue
+        self.overdue_scheduler = DueScheduler(hass, self._async_handle_overdue)
+        self._overdue_after = _overdue_after(entry)
+        # IDs of due tasks whose grace period has run out
+        self.overdue: set[str] = set()
+        self.events = TaskEventDispatcher(
+            hass,
+            entry.entry_id,
+            entry.options.get(CONF_EVENT_RATE_LIMIT, DEFAULT_EVENT_RATE_LIMIT),
+        )
+        self.index = TaskIndex()
+        # Memoized next-due per task, keyed on its schedule inputs
+        self._schedule_cache: dict[str, tuple[tuple[Any, ...], datetime | None]] = {}
+        # Seeded from the clock so revisions keep increasing across restarts
+        self.revision = time.time_ns() // 1000
+        self._change_log: deque[tuple[int, frozenset[str], frozenset[str]]] = deque(
+            maxlen=CHANGE_LOG_SIZE
+        )
+        self._change_subscribers: list[ChangeSubscriber] = []
+        self._task_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._date_format = entry.options.get(CONF_DATE_FORMAT, DEFAULT_DATE_FORMAT)
+        self._format_date = compile_date_format(self._date_format)
+        self.diagnostic_sensors = entry.options.get(
+            CONF_DIAGNOSTIC_SENSORS, DEFAULT_DIAGNOSTIC_SENSORS
+        )
+        self.entity_mode = entry.options.get(CONF_ENTITY_MODE, DEFAULT_ENTITY_MODE)
+        self.entity_budget = entry.options.get(
+            CONF_ENTITY_BUDGET, DEFAULT_ENTITY_BUDGET
+        )
+        # IDs of the opted-in tasks that have entities in aggregate mode
+        self._entity_tasks: set[str] = set()
+        self.stats = RuntimeStats()
+        self._profiler: cProfile.Profile | None = None
+        self._profile_cycles = 0
+        self._profile_path = ""
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    async def _async_update_data(self) -> dict[str, Task]:
         """Update data."""
         try:
             # Load tasks from storage if not already loaded
-            if not self.tasks:
-                stored_data = await self.store.async_load()
-                if stored_data:
-                    self.tasks = stored_data.get("tasks", {})
+            loading = not self._loaded
+            if loading:
+                await self._async_load()
 
-            # Update task states
-            current_time = datetime.now()
-            for task_id, task in self.tasks.items():
-                task["is_due"] = self._is_task_due(task, current_time)
-                task["next_due"] = self._calculate_next_due(task, current_time)
+            with self._measure_cycle(self.stats.refresh, len(self.tasks)):
+                # Update task states
+                current_time = dt_util.now()
+                deadlines: dict[str, datetime] = {}
+                overdue_deadlines: dict[str, datetime] = {}
+                overdue: set[str] = set()
+                changed: set[str] = set()
+                # Deadlines this refresh crossed before their timers fired
+                due_batches: dict[datetime, list[Task]] = {}
+                overdue_batches: dict[datetime, list[Task]] = {}
+                for task_id, task in self.tasks.items():
+                    updated = self._recompute_task(task_id, task, current_time)
+                    if updated is not task:
+                        changed.add(task_id)
+                        if updated.is_due and not task.is_due:
+                            due_batches.setdefault(updated.next_due, []).append(updated)
+                    if self._is_pending(updated):
+                        deadlines[task_id] = updated.next_due
+                    elif overdue_at := self._overdue_at(updated, current_time):
+                        overdue_deadlines[task_id] = overdue_at
+                    elif self._is_overdue(updated):
+                        overdue.add(task_id)
+                        if task_id not in self.overdue:
+                            overdue_batches.setdefault(
+                                updated.next_due + self._overdue_after, []
+                            ).append(updated)
+
+                # Arm a single timer for the earliest deadline
+                self.scheduler.async_reset(deadlines)
+                self.overdue_scheduler.async_reset(overdue_deadlines)
+                self.overdue = overdue
+
+                if self._restored is None:
+                    self._async_record_changes(changed, ())
+                else:
+                    self._async_replace_restored()
 
+            # Tasks just loaded from storage were not due before, so only
+            # later refreshes announce what they find
+            if not loading:
+                self.events.async_fire_batches(EVENT_TASK_DUE, due_batches)
+                self.events.async_fire_batches(EVENT_TASK_OVERDUE, overdue_batches)
             return self.tasks
         except Exception as err:
-            raise UpdateFailed(f"Error updating Task Butler data: {err}") from err
+            msg = f"Error updating Task Butler data: {err}"
+            raise UpdateFailed(msg) from err
 
-    def _is_task_due(self, task: dict[str, Any], current_time: datetime) -> bool:
-        """Check if a task is currently due."""
-        if not task.get("enabled", True):
+    async def _async_load(self) -> None:
+        """Load tasks and the history index from storage."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            start = time.perf_counter()
+            stored_tasks = await self.store.async_load()
+            if stored_tasks is None:
+                stored_tasks = await self._async_migrate_storage()
+            if self._restored is not None:
+                self.index.clear()
+            self.tasks = stored_tasks or {}
+            self._task_snapshot = None
+            self._select_entity_tasks()
+            await self.history.async_load()
+            self._loaded = True
+            self.stats.load_duration = time.perf_counter() - start
+            _LOGGER.debug(
+                "Loaded %d task(s) in %.3fs",
+                len(self.tasks),
+                self.stats.load_duration,
+            )
+
+    async def _async_ensure_loaded(self) -> None:
+        """Wait for the full load before tasks are modified."""
+        if not self._loaded:
+            await self.async_refresh()
+        if not self._loaded:
+            msg = "Tasks could not be loaded from storage"
+            raise HomeAssistantError(msg)
+
+    async def async_restore_snapshot(self) -> bool:
+        """
+        Restore the last computed task states without the full load.
+
+        Entities can then be set up right away; the next refresh loads the
+        tasks from storage and replaces the restored ones.
+        """
+        if (snapshot := await self._snapshot.async_load()) is None:
             return False
 
+        current_time = dt_util.now()
+        for task_id, values in snapshot.get("tasks", {}).items():
+            (
+                name,
+                schedule_mode,
+                enabled,
+                is_due,
+                next_due,
+                last_completed,
+                interval_days,
+                interval_mode,
+                fixed_date,
+                fixed_occurrence,
+                created_at,
+                area,
+                create_entities,
+            ) = values
+            next_due = datetime_from_timestamp(next_due) if next_due else None
+            task = Task(
+                id=task_id,
+                name=name,
+                schedule_mode=schedule_mode,
+                interval_days=interval_days,
+                interval_mode=interval_mode,
+                fixed_date=fixed_date,
+                fixed_occurrence=fixed_occurrence,
+                enabled=enabled,
+                created_at=(
+                    datetime_from_timestamp(created_at) if created_at else None
+                ),
+                last_completed=(
+                    datetime_from_timestamp(last_completed) if last_completed else None
+                ),
+                # Deadlines may have passed while Home Assistant was down
+                is_due=enabled
+                and (is_due or (next_due is not None and next_due <= current_time)),
+                next_due=next_due,
+                area=area,
+                create_entities=create_entities,
+            )
+            self.tasks[task_id] = task
+            self.index.update(task_id, task)
+
+        self._restored = set(self.tasks)
+        self._select_entity_tasks()
+        _LOGGER.debug("Restored %d task(s) from the snapshot", len(self.tasks))
+        return True
+
+    @callback
+    def _async_replace_restored(self) -> None:
+        """Publish the loaded tasks in place of the restored snapshot."""
+        restored, self._restored = self._restored or set(), None
+        removed = restored - self.tasks.keys()
+        added = self.tasks.keys() - restored
+        # Restored tasks may be stale, so every task re-renders
+        self._async_record_changes(self.tasks, removed)
+        if removed:
+            async_dispatcher_send(self.hass, self._signal_tasks_removed, list(removed))
+        if added:
+            async_dispatcher_send(self.hass, self._signal_tasks_added, list(added))
+
+    @callback
+    def _snapshot_to_save(self) -> dict[str, Any]:
+        """Return the computed task states to restore on a fast start."""
+        return {
+            "tasks": {
+                task_id: [
+                    task.name,
+                    task.schedule_mode,
+                    task.enabled,
+                    task.is_due,
+                    task.next_due.timestamp() if task.next_due else None,
+                    (task.last_completed.timestamp() if task.last_completed else None),
+                    task.interval_days,
+                    task.interval_mode,
+                    task.fixed_date,
+                    task.fixed_occurrence,
+                    task.created_at.timestamp() if task.created_at else None,
+                    task.area,
+                    task.create_entities,
+                ]
+                for task_id, task in self.tasks.items()
+            }
+        }
+
+    @callback
+    def _async_handle_due(self, task_ids: list[str]) -> None:
+        """Flip tasks to due when their deadline passes."""
+        with self._measure_cycle(self.stats.task_update, len(task_ids)):
+            current_time = dt_util.now()
+            batches: dict[datetime, list[Task]] = {}
+            for task_id in task_ids:
+                if task := self.tasks.get(task_id):
+                    task = self.tasks[task_id] = replace(task, is_due=True)
+                    self.index.update(task_id, task)
+                    self.overdue_scheduler.async_schedule(
+                        task_id, self._overdue_at(task, current_time)
+                    )
+                    batches.setdefault(task.next_due, []).append(task)
+
+            self._async_record_changes(
+                [task_id for task_id in task_ids if task_id in self.tasks], ()
+            )
+        self.async_set_updated_data(self.tasks)
+        self.events.async_fire_batches(EVENT_TASK_DUE, batches)
+
+    @callback
+    def _async_handle_overdue(self, task_ids: list[str]) -> None:
+        """Announce tasks still due when their grace period runs out."""
+        if self._overdue_after is None:
+            return
+        batches: dict[datetime, list[Task]] = {}
+        for task_id in task_ids:
+            task = self.tasks.get(task_id)
+            if task is not None and self._is_overdue(task):
+                self.overdue.add(task_id)
+                batches.setdefault(task.next_due + self._overdue_after, []).append(task)
+        if batches:
+            # Only the summary sensors count overdue tasks
+            self.async_update_listeners()
+        self.events.async_fire_batches(EVENT_TASK_OVERDUE, batches)
+
+    @callback
+    def async_subscribe_changes(self, subscriber: ChangeSubscriber) -> CALLBACK_TYPE:
+        """Subscribe to changed and removed task IDs per revision."""
+        self._change_subscribers.append(subscriber)
+
+        @callback
+        def remove_subscriber() -> None:
+            self._change_subscribers.remove(subscriber)
+
+        return remove_subscriber
+
+    @callback
+    def async_add_task_listener(
+        self, task_id: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for changes to a single task."""
+        listeners = self._task_listeners.setdefault(task_id, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+            if not listeners and self._task_listeners.get(task_id) is listeners:
+                del self._task_listeners[task_id]
+
+        return remove_listener
+
+    @callback
+    def _async_notify_task_listeners(self, task_ids: Iterable[str]) -> None:
+        """Call the listeners of the given tasks."""
+        for task_id in task_ids:
+            for update_callback in list(self._task_listeners.get(task_id, ())):
+                update_callback()
+
+    def changes_since(self, revision: int) -> tuple[set[str], set[str]] | None:
+        """
+        Return tasks changed and removed after a revision.
+
+        Returns None when the revision is unknown or too old to resume from,
+        in which case the caller needs a full snapshot.
+        """
+        if revision == self.revision:
+            return set(), set()
+        if (
+            revision > self.revision
+            or not self._change_log
+            or revision < self._change_log[0][0] - 1
+        ):
+            return None
+
+        changed: set[str] = set()
+        removed: set[str] = set()
+        for entry_revision, entry_changed, entry_removed in self._change_log:
+            if entry_revision > revision:
+                changed |= entry_changed
+                removed |= entry_removed
+
+        return changed - removed, removed
+
+    @callback
+    def _async_record_changes(
+        self, changed: Iterable[str], removed: Iterable[str]
+    ) -> None:
+        """Bump the revision and notify change subscribers."""
+        changed = frozenset(changed)
+        removed = frozenset(removed)
+        if not changed and not removed:
+            return
+
+        self.revision += 1
+        self._change_log.append((self.revision, changed, removed))
+        self._task_snapshot = None
+        for task_id in removed:
+            self._task_dicts.pop(task_id, None)
+        if self.fast_start and self._loaded:
+            self._snapshot.async_delay_save(self._snapshot_to_save, SNAPSHOT_SAVE_DELAY)
+        for subscriber in list(self._change_subscribers):
+            subscriber(self.revision, changed, removed)
+        self._async_notify_task_listeners(changed | removed)
+
+    @callback
+    def async_update_options(self) -> None:
+        """Apply changed config entry options."""
+        self.update_interval = _safety_refresh_interval(self.entry)
+        self.store.save_delay = self.entry.options.get(
+            CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY
+        )
+        self._date_format = self.entry.options.get(
+            CONF_DATE_FORMAT, DEFAULT_DATE_FORMAT
+        )
+        self._format_date = compile_date_format(self._date_format)
+        self.events.rate_limit = self.entry.options.get(
+            CONF_EVENT_RATE_LIMIT, DEFAULT_EVENT_RATE_LIMIT
+        )
+        overdue_after = _overdue_after(self.entry)
+        if overdue_after != self._overdue_after:
+            self._overdue_after = overdue_after
+            current_time = dt_util.now()
+            overdue_deadlines: dict[str, datetime] = {}
+            self.overdue = set()
+            for task_id, task in self.tasks.items():
+                if overdue_at := self._overdue_at(task, current_time):
+                    overdue_deadlines[task_id] = overdue_at
+                elif self._is_overdue(task):
+                    self.overdue.add(task_id)
+            self.overdue_scheduler.async_reset(overdue_deadlines)
+        fast_start = self.entry.options.get(CONF_FAST_START, DEFAULT_FAST_START)
+        if fast_start != self.fast_start:
+            self.fast_start = fast_start
+            if not fast_start:
+                self.hass.async_create_task(self._snapshot.async_remove())
+            elif self._loaded:
+                self._snapshot.async_delay_save(
+                    self._snapshot_to_save, SNAPSHOT_SAVE_DELAY
+                )
+        # The date format may have changed, so every entity re-renders
+        self._async_notify_task_listeners(list(self._task_listeners))
+
+    async def async_shutdown(self) -> None:
+        """Cancel the due timers, flush pending writes and shut down."""
+        self.scheduler.async_cancel()
+        self.overdue_scheduler.async_cancel()
+        self.events.async_cancel()
+        if self._unsub_enabled is not None:
+            self._unsub_enabled()
+            await self._async_apply_enabled()
+        await self.store.async_close()
+        await self.history.async_flush()
+        if self.fast_start and self._loaded:
+            await self._snapshot.async_save(self._snapshot_to_save())
+        await super().async_shutdown()
+
+    def _recompute_task(self, task_id: str, task: Task, current_time: datetime) -> Task:
+        """
+        Recompute the derived schedule fields of a single task.
+
+        Returns the task, replaced by an updated copy if any of them changed.
+        """
+        next_due = self._next_due(task_id, task, current_time)
+        is_due = self._is_task_due(task, next_due, current_time)
+        if task.next_due != next_due or task.is_due != is_due:
+            task = self.tasks[task_id] = replace(task, next_due=next_due, is_due=is_due)
+        self.index.update(task_id, task)
+        return task
+
+    @staticmethod
+    def _is_pending(task: Task) -> bool:
+        """Return True if a task is waiting on a future deadline."""
+        return task.enabled and task.next_due is not None and not task.is_due
+
+    def _overdue_at(self, task: Task, current_time: datetime) -> datetime | None:
+        """Return when a due task becomes overdue, unless that has passed."""
+        if self._overdue_after is None or not task.is_due or task.next_due is None:
+            return None
+        overdue_at = task.next_due + self._overdue_after
+        return overdue_at if overdue_at > current_time else None
+
+    def _is_overdue(self, task: Task) -> bool:
+        """Return True if a task is due and past its grace period."""
+        return (
+            self._overdue_after is not None
+            and task.is_due
+            and task.next_due is not None
+            and task.next_due + self._overdue_after <= dt_util.now()
+        )
+
+    def _next_due(
+        self, task_id: str, task: Task, current_time: datetime
+    ) -> datetime | None:
+        """Return the memoized next-due time of a task."""
+        key = task.schedule_key
+        cached = self._schedule_cache.get(task_id)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
         next_due = self._calculate_next_due(task, current_time)
+        self._schedule_cache[task_id] = (key, next_due)
+        return next_due
+
+    def _is_task_due(
+        self, task: Task, next_due: datetime | None, current_time: datetime
+    ) -> bool:
+        """Check if a task is currently due."""
+        if not task.enabled:
+            return False
+
         if next_due is None:
             return False
 
         return current_time >= next_due
 
+    @callback
+    def _async_tasks_changed(self, task_ids: list[str]) -> None:
+        """Recompute only the touched tasks and publish the result once."""
+        with self._measure_cycle(self.stats.task_update, len(task_ids)):
+            current_time = dt_util.now()
+            removed: list[str] = []
+            for task_id in task_ids:
+                if (task := self.tasks.get(task_id)) is None:
+                    self._schedule_cache.pop(task_id, None)
+                    self.scheduler.async_unschedule(task_id)
+                    self.overdue_scheduler.async_unschedule(task_id)
+                    self.index.remove(task_id)
+                    self.overdue.discard(task_id)
+                    self._entity_tasks.discard(task_id)
+                    removed.append(task_id)
+                    continue
+
+                task = self._recompute_task(task_id, task, current_time)
+                self.scheduler.async_schedule(
+                    task_id, task.next_due if self._is_pending(task) else None
+                )
+                overdue_at = self._overdue_at(task, current_time)
+                self.overdue_scheduler.async_schedule(task_id, overdue_at)
+                if overdue_at is None and self._is_overdue(task):
+                    self.overdue.add(task_id)
+                else:
+                    self.overdue.discard(task_id)
+
+            self._async_record_changes(
+                [task_id for task_id in task_ids if task_id in self.tasks], removed
+            )
+        self.async_set_updated_data(self.tasks)
+
+    @contextmanager
+    def _measure_cycle(
+        self, histogram: DurationHistogram, tasks_recomputed: int
+    ) -> Iterator[None]:
+        """Time a recompute cycle, count its state writes and profile it."""
+        state_writes = self.stats.state_writes
+        profiler = self._profiler
+        if profiler is not None:
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+                self._async_end_profile_cycle(profiler)
+            self.stats.record_refresh(
+                histogram,
+                duration,
+                tasks_recomputed,
+                self.stats.state_writes - state_writes,
+            )
+
+    @callback
+    def async_profile_cycles(self, cycles: int) -> str:
+        """Profile the next recompute cycles and return the output file."""
+        if self._profiler is not None:
+            msg = "A profile is already being captured"
+            raise HomeAssistantError(msg)
+        self._profiler = cProfile.Profile()
+        self._profile_cycles = cycles
+        self._profile_path = self.hass.config.path(
+            f"{DOMAIN}_profile_{dt_util.now():%Y%m%d_%H%M%S}.prof"
+        )
+        _LOGGER.info(
+            "Profiling the next %d refresh cycle(s) to %s", cycles, self._profile_path
+        )
+        return self._profile_path
+
+    @callback
+    def _async_end_profile_cycle(self, profiler: cProfile.Profile) -> None:
+        """Write the profile once the requested cycles have run."""
+        self._profile_cycles -= 1
+        if self._profile_cycles > 0:
+            return
+        self._profiler = None
+        self.hass.async_create_task(
+            self._async_write_profile(profiler, self._profile_path)
+        )
+
+    async def _async_write_profile(self, profiler: cProfile.Profile, path: str) -> None:
+        """Write profile statistics in the executor."""
+        await self.hass.async_add_executor_job(profiler.dump_stats, path)
+        _LOGGER.info("Wrote refresh profile to %s", path)
+
     def _calculate_next_due(
-        self, task: dict[str, Any], current_time: datetime
+        self, task: Task, current_time: datetime
     ) -> datetime | None:
         """Calculate when a task is next due."""
-        schedule_mode = task.get("schedule_mode")
-        last_completed = task.get("last_completed")
-
-        if schedule_mode == SCHEDULE_FIXED_INTERVAL:
-            interval_days = task.get("interval_days", 30)
-            interval_mode = task.get("interval_mode", INTERVAL_HARD_FIXED)
-
-            if interval_mode == INTERVAL_AFTER_COMPLETION and last_completed:
-                if isinstance(last_completed, str):
-                    last_completed = datetime.fromisoformat(last_completed)
-                return last_completed + timedelta(days=interval_days)
-            else:
-                # Hard fixed interval - placeholder implementation
-                return current_time + timedelta(days=interval_days)
-
-        # TODO: Implement fixed date and fixed occurrence logic
-        return None
+        last_completed = task.last_completed
+
+        if task.schedule_mode == SCHEDULE_FIXED_INTERVAL:
+            interval = timedelta(days=task.interval_days)
+
+            if task.interval_mode == INTERVAL_AFTER_COMPLETION and last_completed:
+                return last_completed + interval
+
+            # Hard fixed interval: anchored on creation, so the deadline is
+            # stable between refreshes and can be scheduled exactly
+            created_at = task.created_at or current_time
+
+            if last_completed is None or last_completed < created_at:
+                return created_at + interval
+
+            periods = (last_completed - created_at) // interval + 1
+            return created_at + periods * interval
+
+        # Fixed date and fixed occurrence rules are compiled once per rule
+        try:
+            rule = compile_recurrence(
+                task.schedule_mode, task.fixed_date, task.fixed_occurrence
+            )
+        except ValueError as err:
+            _LOGGER.warning("Task %s has an invalid schedule: %s", task.id, err)
+            return None
+
+        if rule is None:
+            return None
+
+        return rule.next_after(last_completed or task.created_at or current_time)
 
     async def mark_task_complete(self, task_id: str) -> None:
         """Mark a task as completed."""
@@ -101,42 +718,168 @@ class TaskButlerCoordinator(DataUpdateCoordinator):
             _LOGGER.error("Task %s not found", task_id)
             return
 
-        self.tasks[task_id]["last_completed"] = datetime.now().isoformat()
-        self.tasks[task_id]["is_due"] = False
+        await self.mark_tasks_complete([task_id])
+
+    async def mark_tasks_complete(self, task_ids: list[str]) -> None:
+        """Mark several tasks as completed with a single save and refresh."""
+        async with self._mutation_lock:
+            await self._async_ensure_loaded()
+            self._check_tasks_exist(task_ids)
+
+            completed_at = dt_util.now()
+            for task_id in task_ids:
+                self.tasks[task_id] = replace(
+                    self.tasks[task_id], last_completed=completed_at, is_due=False
+                )
 
-        await self._save_tasks()
-        await self.async_request_refresh()
+            self._async_save_tasks(task_ids)
+            self._async_tasks_changed(task_ids)
+            await self.history.async_append(task_ids, completed_at)
 
     async def create_task(self, task_data: dict[str, Any]) -> str:
         """Create a new task."""
-        task_id = str(uuid.uuid4())
+        task_ids = await self.create_tasks([task_data])
+        return task_ids[0]
 
-        self.tasks[task_id] = {
-            "id": task_id,
-            "name": task_data["name"],
-            "schedule_mode": task_data["schedule_mode"],
-            "interval_days": task_data.get("interval_days", 30),
-            "interval_mode": task_data.get("interval_mode", INTERVAL_HARD_FIXED),
-            "fixed_date": task_data.get("fixed_date"),
-            "fixed_occurrence": task_data.get("fixed_occurrence"),
-            "enabled": task_data.get("enabled", True),
-            "created_at": datetime.now().isoformat(),
-            "last_completed": None,
-            "is_due": False,
-            "next_due": None,
-        }
+    async def create_tasks(self, tasks_data: list[dict[str, Any]]) -> list[str]:
+        """Create several tasks with a single save and refresh."""
+        async with self._mutation_lock:
+            await self._async_ensure_loaded()
+            return self._async_create_tasks(tasks_data)
+
+    async def create_valid_tasks(
+        self, tasks_data: list[dict[str, Any]]
+    ) -> tuple[list[str], dict[int, str]]:
+        """
+        Create the valid tasks of a list with a single save and refresh.
+
+        Returns the IDs of the created tasks and the error of each rejected
+        item by its position in the list.
+        """
+        errors: dict[int, str] = {}
+        async with self._mutation_lock:
+            await self._async_ensure_loaded()
+            return self._async_create_tasks(tasks_data, errors), errors
 
-        await self._save_tasks()
-        await self.async_request_refresh()
+    @callback
+    def _async_create_tasks(
+        self,
+        tasks_data: list[dict[str, Any]],
+        errors: dict[int, str] | None = None,
+    ) -> list[str]:
+        """
+        Build, validate and add new tasks.
 
-        return task_id
+        Raises on the first invalid item, unless ``errors`` is given to
+        collect the errors of the skipped items instead.
+        """
+        created_at = dt_util.now()
+        new_tasks: dict[str, Task] = {}
+        gained: set[str] = set()
+        for position, task_data in enumerate(tasks_data):
+            task_id = str(uuid.uuid4())
+            try:
+                task = self._build_task(task_id, task_data, created_at)
+                if task.create_entities and self.entity_mode == ENTITY_MODE_AGGREGATE:
+                    self._check_entity_budget(len(self._entity_tasks) + len(gained) + 1)
+                    gained.add(task_id)
+            except HomeAssistantError as err:
+                if errors is None:
+                    raise
+                errors[position] = str(err)
+                continue
+            new_tasks[task_id] = task
+        if not new_tasks:
+            return []
+
+        # Only touch the task dict once every item has been built
+        self.tasks.update(new_tasks)
+        self._entity_tasks |= gained
+
+        self._async_save_tasks(new_tasks)
+        self._async_tasks_changed(list(new_tasks))
+        async_dispatcher_send(self.hass, self._signal_tasks_added, list(new_tasks))
+
+        return list(new_tasks)
+
+    def _build_task(
+        self, task_id: str, task_data: dict[str, Any], created_at: datetime
+    ) -> Task:
+        """Build and validate a new task."""
+        # Imported tasks keep the timestamps their schedule depends on
+        values = {
+            "created_at": created_at,
+            **{
+                key: value
+                for key, value in task_data.items()
+                if key not in DERIVED_FIELDS
+            },
+            "id": task_id,
+        }
+        try:
+            task = Task.from_dict(values)
+        except (TypeError, ValueError) as err:
+            msg = f"Task {task_data.get('name')!r}: {err}"
+            raise HomeAssistantError(msg) from err
+        self._validate_schedule(task)
+        return task
 
     async def delete_task(self, task_id: str) -> None:
         """Delete a task."""
         if task_id in self.tasks:
-            del self.tasks[task_id]
-            await self._save_tasks()
-            await self.async_request_refresh()
+            await self.delete_tasks([task_id])
+
+    async def delete_tasks(self, task_ids: list[str]) -> None:
+        """Delete several tasks with a single save and refresh."""
+        async with self._mutation_lock:
+            await self._async_ensure_loaded()
+            self._check_tasks_exist(task_ids)
+
+            for task_id in task_ids:
+                self.tasks.pop(task_id, None)
+
+            self._async_save_tasks(task_ids)
+            self._async_tasks_changed(task_ids)
+            async_dispatcher_send(self.hass, self._signal_tasks_removed, task_ids)
+
+    async def async_set_task_enabled(self, task_id: str, *, enabled: bool) -> None:
+        """
+        Enable or disable a task.
+
+        Toggles arriving within ENABLE_BATCH_DELAY of the first one, such as
+        those of a scene, are applied as one update with a single save and
+        refresh.
+        """
+        self._pending_enabled[task_id] = enabled
+        if self._enabled_applied is None:
+            self._enabled_applied = self.hass.loop.create_future()
+            self._unsub_enabled = async_call_later(
+                self.hass, ENABLE_BATCH_DELAY, self._async_apply_enabled
+            )
+        await asyncio.shield(self._enabled_applied)
+
+    async def _async_apply_enabled(self, _now: datetime | None = None) -> None:
+        """Apply the collected enable switch toggles."""
+        self._unsub_enabled = None
+        pending, self._pending_enabled = self._pending_enabled, {}
+        applied, self._enabled_applied = self._enabled_applied, None
+        # Tasks deleted meanwhile have no switch to toggle anymore
+        updates = {
+            task_id: {"enabled": enabled}
+            for task_id, enabled in pending.items()
+            if task_id in self.tasks
+        }
+        try:
+            if updates:
+                _LOGGER.debug("Applying %d enable toggle(s)", len(updates))
+                await self.update_tasks(updates)
+        except Exception as err:
+            # Fail every toggle of the batch, not only the timer job
+            if applied is not None:
+                applied.set_exception(err)
+            raise
+        if applied is not None:
+            applied.set_result(None)
 
     async def update_task(self, task_id: str, updates: dict[str, Any]) -> None:
         """Update a task."""
@@ -144,28 +887,235 @@ class TaskButlerCoordinator(DataUpdateCoordinator):
             _LOGGER.error("Task %s not found", task_id)
             return
 
-        self.tasks[task_id].update(updates)
-        await self._save_tasks()
-        await self.async_request_refresh()
+        await self.update_tasks({task_id: updates})
+
+    async def update_tasks(self, updates: dict[str, dict[str, Any]]) -> None:
+        """Update several tasks with a single save and refresh."""
+        async with self._mutation_lock:
+            await self._async_ensure_loaded()
+            self._async_update_tasks(updates)
+
+    @callback
+    def _async_update_tasks(self, updates: dict[str, dict[str, Any]]) -> None:
+        """Validate updates against copies of the tasks, then apply them."""
+        self._check_tasks_exist(updates)
+
+        # Apply to copies first so an invalid field leaves every task untouched
+        updated: dict[str, Task] = {}
+        for task_id, task_updates in updates.items():
+            task = replace(self.tasks[task_id])
+            try:
+                task.apply_updates(task_updates)
+            except ValueError as err:
+                msg = f"Task {task_id}: {err}"
+                raise HomeAssistantError(msg) from err
+            self._validate_schedule(task)
+            updated[task_id] = task
+        gained, lost = self._entity_changes(updated)
+
+        self.tasks.update(updated)
+        for task_id in updated:
+            self._schedule_cache.pop(task_id, None)
+        self._entity_tasks |= gained
+        self._entity_tasks -= lost
+
+        self._async_save_tasks(updated)
+        self._async_tasks_changed(list(updates))
+        if lost:
+            async_dispatcher_send(self.hass, self._signal_tasks_removed, list(lost))
+        if gained:
+            async_dispatcher_send(self.hass, self._signal_tasks_added, list(gained))
+
+    def has_task_entities(self, task_id: str) -> bool:
+        """Return True if a task gets its own entities."""
+        return (
+            self.entity_mode != ENTITY_MODE_AGGREGATE or task_id in self._entity_tasks
+        )
+
+    def _select_entity_tasks(self) -> None:
+        """Pick the opted-in tasks that get entities, up to the budget."""
+        opted_in = [
+            task_id for task_id, task in self.tasks.items() if task.create_entities
+        ]
+        if self.entity_mode == ENTITY_MODE_AGGREGATE and (
+            len(opted_in) > self.entity_budget
+        ):
+            _LOGGER.warning(
+                "%d tasks opted into their own entities, only the first %d get them",
+                len(opted_in),
+                self.entity_budget,
+            )
+        self._entity_tasks = set(opted_in[: self.entity_budget])
+
+    def _entity_changes(self, tasks: dict[str, Task]) -> tuple[set[str], set[str]]:
+        """
+        Return the tasks gaining and losing entities by new or updated tasks.
+
+        Raises if the opt-ins would exceed the entity budget.
+        """
+        if self.entity_mode != ENTITY_MODE_AGGREGATE:
+            return set(), set()
+
+        gained: set[str] = set()
+        lost: set[str] = set()
+        for task_id, task in tasks.items():
+            previous = self.tasks.get(task_id)
+            if task.create_entities and not (previous and previous.create_entities):
+                gained.add(task_id)
+            elif not task.create_entities and task_id in self._entity_tasks:
+                lost.add(task_id)
+
+        self._check_entity_budget(len(self._entity_tasks) + len(gained) - len(lost))
+        return gained, lost
+
+    def _check_entity_budget(self, count: int) -> None:
+        """Raise if more tasks than the entity budget would have entities."""
+        if count > self.entity_budget:
+            msg = f"Only {self.entity_budget} tasks can have their own entities"
+            raise HomeAssistantError(msg)
+
+    async def async_compact_history(self, _now: datetime | None = None) -> None:
+        """Compact the completion history against the current tasks."""
+        if not self._loaded:
+            return
+        await self.history.async_compact(set(self.tasks))
+
+    def query_tasks(self, query: TaskQuery) -> dict[str, Any]:
+        """Return one page of tasks matching a query."""
+        task_ids, next_cursor = self.index.query(self.tasks, query)
+        return {
+            "tasks": [self.task_dict(task_id) for task_id in task_ids],
+            "next_cursor": next_cursor,
+        }
+
+    @property
+    def task_snapshot(self) -> TaskSnapshot:
+        """
+        Return every task in dict format as of the current revision.
+
+        Built at most once per revision and shared by every reader.
+        """
+        if self._task_snapshot is None:
+            self._task_snapshot = TaskSnapshot(
+                self.revision, tuple(map(self.task_dict, self.tasks))
+            )
+        return self._task_snapshot
+
+    @property
+    def tasks_json(self) -> bytes:
+        """Return the tasks of the current snapshot encoded as a JSON array."""
+        snapshot = self.task_snapshot
+        if self._tasks_json is None or self._tasks_json[0] is not snapshot:
+            self._tasks_json = (snapshot, json_bytes(snapshot.tasks))
+        return self._tasks_json[1]
+
+    def task_dict(self, task_id: str) -> dict[str, Any]:
+        """Return a task in dict format, reused until the task is replaced."""
+        task = self.tasks[task_id]
+        cached = self._task_dicts.get(task_id)
+        if cached is not None and cached[0] is task:
+            return cached[1]
+        data = task.as_dict()
+        self._task_dicts[task_id] = (task, data)
+        return data
+
+    @staticmethod
+    def _validate_schedule(task: Task) -> None:
+        """Raise if the schedule rule of a task cannot be compiled."""
+        try:
+            compile_recurrence(
+                task.schedule_mode, task.fixed_date, task.fixed_occurrence
+            )
+        except ValueError as err:
+            msg = f"Task {task.name!r}: {err}"
+            raise HomeAssistantError(msg) from err
+
+    def _check_tasks_exist(self, task_ids: Iterable[str]) -> None:
+        """Raise if any of the given tasks does not exist."""
+        if missing := [task_id for task_id in task_ids if task_id not in self.tasks]:
+            msg = f"Tasks not found: {', '.join(missing)}"
+            raise HomeAssistantError(msg)
+
+    @callback
+    def _async_save_tasks(self, task_ids: Iterable[str]) -> None:
+        """Schedule a coalesced save of the given tasks."""
+        self.store.async_schedule_save(task_ids)
 
-    async def _save_tasks(self) -> None:
-        """Save tasks to storage."""
-        await self.store.async_save({"tasks": self.tasks})
+    async def _async_migrate_storage(self) -> dict[str, Task] | None:
+        """
+        Move tasks from another backend into the configured one, if any.
+
+        Falls back to the task list stored before each config entry had its
+        own, which the first entry set up afterwards takes over together with
+        its completion history.
+        """
+        entry_id = self.entry.entry_id
+        for list_id in (entry_id, None):
+            for backend in STORAGE_BACKENDS:
+                if list_id == entry_id and backend == self.storage_backend:
+                    continue
+                source = create_task_storage(
+                    self.hass,
+                    backend,
+                    lambda: self.tasks,
+                    self.store.save_delay,
+                    list_id,
+                )
+                tasks = await async_migrate_storage(source, self.store)
+                if tasks is None:
+                    continue
+                if list_id is None:
+                    await self.history.async_adopt(CompletionHistory(self.hass))
+                    legacy_snapshot = Store(self.hass, SNAPSHOT_VERSION, SNAPSHOT_KEY)
+                    await legacy_snapshot.async_remove()
+                return tasks
+        return None
 
     @property
     def date_format(self) -> str:
         """Get the configured date format."""
-        return self.entry.options.get("date_format", DEFAULT_DATE_FORMAT)
+        return self._date_format
 
     def format_date(self, date: datetime) -> str:
         """Format a date according to user preference."""
-        if self.date_format == "dd.mm.yyyy":
-            return date.strftime("%d.%m.%Y")
-        elif self.date_format == "dddd dd.mm.yyyy":
-            return date.strftime("%A %d.%m.%Y")
-        elif self.date_format == "mm/dd/yyyy":
-            return date.strftime("%m/%d/%Y")
-        elif self.date_format == "dddd mm/dd/yyyy":
-            return date.strftime("%A %m/%d/%Y")
-        else:
-            return date.strftime("%d.%m.%Y")
+        return self._format_date(date)
+
+
+async def async_remove_task_list(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete everything stored for the task list of a config entry."""
+    for backend in STORAGE_BACKENDS:
+        await create_task_storage(
+            hass, backend, dict, DEFAULT_SAVE_DELAY, entry_id
+        ).async_remove()
+    await CompletionHistory(hass, entry_id).async_remove()
+    await Store(hass, SNAPSHOT_VERSION, f"{SNAPSHOT_KEY}.{entry_id}").async_remove()
+
+
+def compile_date_format(date_format: str) -> Callable[[datetime], str]:
+    """Return a formatter for a configured date format."""
+    pattern = DATE_FORMAT_PATTERNS.get(date_format, "%d.%m.%Y")
+
+    def format_date(value: datetime) -> str:
+        return _format_day(value.date(), pattern)
+
+    return format_date
+
+
+@lru_cache(maxsize=FORMATTED_DATE_CACHE_SIZE)
+def _format_day(day: date, pattern: str) -> str:
+    """Format a calendar day; the formats never include the time of day."""
+    return day.strftime(pattern)
+
+
+def _safety_refresh_interval(entry: ConfigEntry) -> timedelta | None:
+    """Return the safety-net polling interval, or None when disabled."""
+    minutes = entry.options.get(
+        CONF_SAFETY_REFRESH_INTERVAL, DEFAULT_SAFETY_REFRESH_INTERVAL
+    )
+    return timedelta(minutes=minutes) if minutes else None
+
+
+def _overdue_after(entry: ConfigEntry) -> timedelta | None:
+    """Return how long a task can stay due, or None when never overdue."""
+    hours = entry.options.get(CONF_OVERDUE_AFTER, DEFAULT_OVERDUE_AFTER)
+    return timedelta(hours=hours) if hours else None
@@ -0,0 +1,46 @@
+"""Diagnostics support for Task Butler."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import TaskButlerCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: TaskButlerCoordinator = hass.data[DOMAIN][entry.entry_id]
+    tasks = coordinator.tasks.values()
+    next_deadline = coordinator.scheduler.next_deadline
+
+    return {
+        "options": dict(entry.options),
+        "tasks": {
+            "total": len(coordinator.tasks),
+            "enabled": sum(task.enabled for task in tasks),
+            "due": sum(task.is_due for task in tasks),
+            "schedule_modes": dict(Counter(task.schedule_mode for task in tasks)),
+            "overdue": len(coordinator.overdue),
+            "areas": len(coordinator.index.areas),
+            "with_entities": sum(
+                coordinator.has_task_entities(task_id) for task_id in coordinator.tasks
+            ),
+        },
+        "revision": coordinator.revision,
+        "last_update_success": coordinator.last_update_success,
+        "scheduler": {
+            "pending": len(coordinator.scheduler),
+            "next_deadline": next_deadline.isoformat() if next_deadline else None,
+            "overdue_pending": len(coordinator.overdue_scheduler),
+        },
+        "events": coordinator.events.as_dict(),
+        "storage": coordinator.store.as_dict(),
+        "runtime": coordinator.stats.as_dict(),
+    }
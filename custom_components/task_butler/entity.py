@@ -0,0 +1,119 @@
+"""Base entity for Task Butler."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import SIGNAL_TASKS_ADDED, SIGNAL_TASKS_REMOVED
+from .coordinator import TaskButlerCoordinator
+from .models import Task
+
+
+@callback
+def async_setup_task_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: TaskButlerCoordinator,
+    async_add_entities: AddEntitiesCallback,
+    entity_factory: Callable[[str], list[TaskButlerTaskEntity]],
+) -> None:
+    """Add entities for existing tasks and follow tasks added or removed later."""
+    entities_by_task: dict[str, list[TaskButlerTaskEntity]] = {}
+
+    @callback
+    def add_tasks(task_ids: list[str]) -> None:
+        """Add entities for new tasks."""
+        entities: list[TaskButlerTaskEntity] = []
+        for task_id in task_ids:
+            if task_id not in entities_by_task and coordinator.has_task_entities(
+                task_id
+            ):
+                entities_by_task[task_id] = entity_factory(task_id)
+                entities.extend(entities_by_task[task_id])
+        if entities:
+            async_add_entities(entities)
+
+    @callback
+    def remove_tasks(task_ids: list[str]) -> None:
+        """Remove the entities of deleted tasks, including registry entries."""
+        for task_id in task_ids:
+            for entity in entities_by_task.pop(task_id, ()):
+                async_remove_entity(hass, entity)
+
+    add_tasks(list(coordinator.tasks))
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_TASKS_ADDED.format(entry.entry_id), add_tasks
+        )
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_TASKS_REMOVED.format(entry.entry_id), remove_tasks
+        )
+    )
+
+
+@callback
+def async_remove_entity(hass: HomeAssistant, entity: Entity) -> None:
+    """Remove an entity that is gone for good, including its registry entry."""
+    if entity.registry_entry is not None:
+        # Removing the registry entry also removes the entity
+        er.async_get(hass).async_remove(entity.entity_id)
+    else:
+        hass.async_create_task(entity.async_remove())
+
+
+class TaskButlerTaskEntity(Entity):
+    """Entity for a single task, updated only when that task changes."""
+
+    _attr_should_poll = False
+
+    def __init__(self, coordinator: TaskButlerCoordinator, task_id: str) -> None:
+        """Initialize the entity."""
+        self.coordinator = coordinator
+        self.task_id = task_id
+        self._last_written: tuple[Any, ...] | None = None
+
+    @property
+    def task_data(self) -> Task | None:
+        """Get task data from coordinator."""
+        return self.coordinator.tasks.get(self.task_id)
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return self.task_id in self.coordinator.tasks
+
+    async def async_added_to_hass(self) -> None:
+        """Register for updates of this entity's task."""
+        await super().async_added_to_hass()
+        # The platform writes the initial state right after this returns
+        self._last_written = self._state_fingerprint()
+        self.async_on_remove(
+            self.coordinator.async_add_task_listener(
+                self.task_id, self._handle_task_update
+            )
+        )
+
+    @callback
+    def _handle_task_update(self) -> None:
+        """Write state only if what this entity exposes has changed."""
+        fingerprint = self._state_fingerprint()
+        if fingerprint == self._last_written:
+            return
+        self._last_written = fingerprint
+        self.async_write_ha_state()
+        self.coordinator.stats.state_writes += 1
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Return everything this entity writes to the state machine."""
+        attributes = self.extra_state_attributes or {}
+        return (self.available, self.name, self.state, tuple(attributes.items()))
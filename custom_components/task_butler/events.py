@@ -0,0 +1,100 @@
+"""Task due and overdue events for Task Butler."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .models import Task
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TaskEventDispatcher:
+    """
+    Fire one event per deadline crossed, at most ``rate_limit`` per second.
+
+    Every task that crossed the same deadline goes out in a single event.
+    Events beyond the rate limit are queued and fired in order.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, rate_limit: float) -> None:
+        """Initialize the dispatcher."""
+        self._hass = hass
+        self._entry_id = entry_id
+        # Events per second; 0 fires every event right away
+        self.rate_limit = rate_limit
+        self.fired = 0
+        self.delayed = 0
+        self._queue: deque[tuple[str, dict[str, Any]]] = deque()
+        self._next_fire = 0.0
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_fire_batches(
+        self, event_type: str, batches: dict[datetime, list[Task]]
+    ) -> None:
+        """Queue one event per deadline with the tasks that crossed it."""
+        for deadline, tasks in sorted(batches.items()):
+            self._queue.append(
+                (
+                    event_type,
+                    {
+                        "entry_id": self._entry_id,
+                        "deadline": deadline.isoformat(),
+                        "tasks": _task_summaries(tasks),
+                    },
+                )
+            )
+        if self._unsub is None:
+            self._async_drain()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop queued events and cancel the pending dispatch."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        if self._queue:
+            _LOGGER.debug("Dropping %d queued task event(s)", len(self._queue))
+            self._queue.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the dispatch statistics."""
+        return {
+            "rate_limit": self.rate_limit,
+            "fired": self.fired,
+            "delayed": self.delayed,
+            "queued": len(self._queue),
+        }
+
+    @callback
+    def _async_drain(self, _now: datetime | None = None) -> None:
+        """Fire queued events until the rate limit is reached."""
+        self._unsub = None
+        while self._queue:
+            now = time.monotonic()
+            if self.rate_limit and now < self._next_fire:
+                self.delayed += 1
+                self._unsub = async_call_later(
+                    self._hass, self._next_fire - now, self._async_drain
+                )
+                return
+
+            event_type, data = self._queue.popleft()
+            self._hass.bus.async_fire(event_type, data)
+            self.fired += 1
+            if self.rate_limit:
+                self._next_fire = now + 1 / self.rate_limit
+
+
+def _task_summaries(tasks: Iterable[Task]) -> list[dict[str, Any]]:
+    """Return the part of each task an event carries."""
+    return [{"task_id": task.id, "name": task.name} for task in tasks]
@@ -0,0 +1,162 @@
+"""Forecast of upcoming task due dates."""
+
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from .const import SCHEDULE_FIXED_INTERVAL
+from .models import Task
+from .recurrence import compile_recurrence
+
+# Upper bound on occurrences expanded per task, e.g. a daily task for a year
+MAX_OCCURRENCES_PER_TASK = 400
+
+
+class ForecastSource(NamedTuple):
+    """The schedule inputs needed to expand a task's future occurrences."""
+
+    task_id: str
+    next_due: datetime
+    schedule_mode: str
+    interval_days: int
+    fixed_date: str | None
+    fixed_occurrence: str | None
+
+    @classmethod
+    def from_task(cls, task: Task) -> ForecastSource | None:
+        """Return the forecast source of a task, or None if it has no future."""
+        if not task.enabled or task.next_due is None:
+            return None
+        return cls(
+            task.id,
+            task.next_due,
+            task.schedule_mode,
+            task.interval_days,
+            task.fixed_date,
+            task.fixed_occurrence,
+        )
+
+
+def expand_occurrences(source: ForecastSource, until: datetime) -> list[datetime]:
+    """
+    Return the due times of a task from its next due time until a limit.
+
+    Occurrences after the next one assume every occurrence is completed on
+    time, which is exact for hard fixed intervals and fixed rules.
+    """
+    occurrences: list[datetime] = []
+    if source.schedule_mode == SCHEDULE_FIXED_INTERVAL:
+        interval = timedelta(days=source.interval_days)
+        when = source.next_due
+        while when <= until and len(occurrences) < MAX_OCCURRENCES_PER_TASK:
+            occurrences.append(when)
+            when += interval
+        return occurrences
+
+    try:
+        rule = compile_recurrence(
+            source.schedule_mode, source.fixed_date, source.fixed_occurrence
+        )
+    except ValueError:
+        return occurrences
+
+    occurrence: datetime | None = source.next_due
+    while (
+        occurrence is not None
+        and occurrence <= until
+        and len(occurrences) < MAX_OCCURRENCES_PER_TASK
+    ):
+        occurrences.append(occurrence)
+        occurrence = rule.next_after(occurrence) if rule else None
+    return occurrences
+
+
+def expand_all(
+    sources: Iterable[ForecastSource], until: datetime
+) -> dict[str, list[datetime]]:
+    """Expand many tasks; meant to run in the executor."""
+    return {source.task_id: expand_occurrences(source, until) for source in sources}
+
+
+class ForecastIndex:
+    """Task occurrences kept sorted by time for range queries."""
+
+    def __init__(self) -> None:
+        """Initialize an empty forecast."""
+        self._order: list[tuple[float, str, datetime]] = []
+        self._by_task: dict[str, list[tuple[float, str, datetime]]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed occurrences."""
+        return len(self._order)
+
+    def rebuild(self, occurrences: dict[str, list[datetime]]) -> None:
+        """Replace the whole forecast."""
+        self._by_task = {
+            task_id: [(when.timestamp(), task_id, when) for when in whens]
+            for task_id, whens in occurrences.items()
+            if whens
+        }
+        self._order = sorted(
+            entry for entries in self._by_task.values() for entry in entries
+        )
+
+    def update(self, occurrences: Mapping[str, list[datetime]]) -> None:
+        """
+        Replace the occurrences of some tasks; an empty list removes a task.
+
+        Stale and new entries are located by bisection and the order is
+        rebuilt from slices in one pass, instead of inserting or deleting
+        one entry at a time.
+        """
+        stale = sorted(
+            entry for task_id in occurrences for entry in self._by_task.pop(task_id, ())
+        )
+        added: list[tuple[float, str, datetime]] = []
+        for task_id, whens in occurrences.items():
+            if whens:
+                entries = [(when.timestamp(), task_id, when) for when in whens]
+                self._by_task[task_id] = entries
+                added.extend(entries)
+        added.sort()
+
+        order = self._order
+        merged: list[tuple[float, str, datetime]] = []
+        start = 0
+        for entry in stale:
+            position = bisect.bisect_left(order, entry, start)
+            merged.extend(order[start:position])
+            # Skip the stale entry itself
+            start = position + 1
+        merged.extend(order[start:])
+
+        if added:
+            order, merged, start = merged, [], 0
+            for entry in added:
+                position = bisect.bisect_left(order, entry, start)
+                merged.extend(order[start:position])
+                merged.append(entry)
+                start = position
+            merged.extend(order[start:])
+        self._order = merged
+
+    def between(self, start: datetime, end: datetime) -> Iterator[tuple[str, datetime]]:
+        """Yield (task ID, due time) for occurrences in [start, end)."""
+        end_ts = end.timestamp()
+        position = bisect.bisect_left(self._order, (start.timestamp(),))
+        for index in range(position, len(self._order)):
+            timestamp, task_id, when = self._order[index]
+            if timestamp >= end_ts:
+                return
+            yield task_id, when
+
+    def first_after(self, start: datetime) -> tuple[str, datetime] | None:
+        """Return the first occurrence at or after a point in time."""
+        position = bisect.bisect_left(self._order, (start.timestamp(),))
+        if position == len(self._order):
+            return None
+        _, task_id, when = self._order[position]
+        return task_id, when
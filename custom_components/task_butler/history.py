@@ -0,0 +1,235 @@
+"""Completion history for Task Butler."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from datetime import datetime
+from functools import partial
+import json
+import logging
+from pathlib import Path
+import shutil
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .models import as_local_datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+HISTORY_INDEX_VERSION = 1
+HISTORY_INDEX_KEY = f"{DOMAIN}_history_index"
+HISTORY_DIR = f"{DOMAIN}_history"
+
+# Closed monthly segments older than this are dropped during compaction
+HISTORY_RETENTION_MONTHS = 24
+
+
+class CompletionHistory:
+    """
+    Append-only log of task completions, segmented by month.
+
+    Completions are appended as JSON lines to one file per month, so the
+    main task store only holds current state. A small index records which
+    tasks appear in which segment, so reading a task's history loads only
+    the segments that contain it.
+
+    Each task list keeps its history under its own ``list_id``; None is the
+    location used before a config entry could have a task list of its own.
+    """
+
+    def __init__(self, hass: HomeAssistant, list_id: str | None = None) -> None:
+        """Initialize the history."""
+        self._hass = hass
+        suffix = "" if list_id is None else f".{list_id}"
+        self._dir = Path(hass.config.path(STORAGE_DIR, HISTORY_DIR + suffix))
+        self._index_store: Store[dict[str, Any]] = Store(
+            hass, HISTORY_INDEX_VERSION, HISTORY_INDEX_KEY + suffix
+        )
+        # Segment name ("YYYY-MM") -> task IDs with completions in it
+        self._segments: dict[str, set[str]] = {}
+        self._lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Load the segment index."""
+        if stored := await self._index_store.async_load():
+            self._segments = {
+                segment: set(task_ids)
+                for segment, task_ids in stored.get("segments", {}).items()
+            }
+
+    async def async_append(
+        self, task_ids: Iterable[str], completed_at: datetime
+    ) -> None:
+        """Record completions of tasks."""
+        segment = _segment_of(completed_at)
+        records = [
+            {"task_id": task_id, "completed_at": completed_at.isoformat()}
+            for task_id in task_ids
+        ]
+        if not records:
+            return
+
+        async with self._lock:
+            await self._hass.async_add_executor_job(
+                self._append_lines, segment, records
+            )
+        self._segments.setdefault(segment, set()).update(
+            record["task_id"] for record in records
+        )
+        self._index_store.async_delay_save(self._index_to_save, 1)
+
+    async def async_get_completions(
+        self, task_id: str, limit: int | None = None
+    ) -> list[datetime]:
+        """Return the completions of a task, newest first."""
+        completions: list[datetime] = []
+        for segment in sorted(self._segments, reverse=True):
+            async with self._lock:
+                # Compaction may have dropped the segment while we waited
+                if task_id not in self._segments.get(segment, ()):
+                    continue
+                records = await self._hass.async_add_executor_job(
+                    self._read_lines, segment
+                )
+            completions.extend(
+                sorted(
+                    (
+                        as_local_datetime(
+                            datetime.fromisoformat(record["completed_at"])
+                        )
+                        for record in records
+                        if record["task_id"] == task_id
+                    ),
+                    reverse=True,
+                )
+            )
+            if limit is not None and len(completions) >= limit:
+                return completions[:limit]
+        return completions
+
+    async def async_compact(self, live_task_ids: set[str]) -> None:
+        """
+        Drop expired segments and completions of deleted tasks.
+
+        Only closed segments are rewritten; the current month is left alone
+        so appends never race with a rewrite.
+        """
+        current = _segment_of(dt_util.now())
+        oldest = _months_back(current, HISTORY_RETENTION_MONTHS)
+        changed = False
+
+        async with self._lock:
+            for segment in sorted(self._segments):
+                if segment >= current:
+                    continue
+                task_ids = self._segments[segment]
+                if segment < oldest or not task_ids & live_task_ids:
+                    await self._hass.async_add_executor_job(
+                        self._remove_segment, segment
+                    )
+                    del self._segments[segment]
+                    changed = True
+                elif task_ids - live_task_ids:
+                    await self._hass.async_add_executor_job(
+                        self._rewrite_segment, segment, live_task_ids
+                    )
+                    self._segments[segment] = task_ids & live_task_ids
+                    changed = True
+
+        if changed:
+            _LOGGER.debug("Compacted completion history")
+            await self._index_store.async_save(self._index_to_save())
+
+    async def async_flush(self) -> None:
+        """Write the segment index."""
+        await self._index_store.async_save(self._index_to_save())
+
+    async def async_adopt(self, other: CompletionHistory) -> None:
+        """Take over the segments of another history, which is removed."""
+        if not (stored := await other._index_store.async_load()):
+            return
+        async with self._lock:
+            await self._hass.async_add_executor_job(self._move_segments, other._dir)
+            self._segments = {
+                segment: set(task_ids)
+                for segment, task_ids in stored.get("segments", {}).items()
+            }
+            await self._index_store.async_save(self._index_to_save())
+        await other._index_store.async_remove()
+
+    async def async_remove(self) -> None:
+        """Delete the index and every segment."""
+        async with self._lock:
+            self._segments = {}
+            await self._hass.async_add_executor_job(
+                partial(shutil.rmtree, self._dir, ignore_errors=True)
+            )
+        await self._index_store.async_remove()
+
+    def _index_to_save(self) -> dict[str, Any]:
+        """Return the segment index to persist."""
+        return {
+            "segments": {
+                segment: sorted(task_ids)
+                for segment, task_ids in self._segments.items()
+            }
+        }
+
+    def _path(self, segment: str) -> Path:
+        """Return the file of a segment."""
+        return self._dir / f"{segment}.jsonl"
+
+    def _append_lines(self, segment: str, records: list[dict[str, Any]]) -> None:
+        """Append records to a segment."""
+        self._dir.mkdir(parents=True, exist_ok=True)
+        with self._path(segment).open("a", encoding="utf-8") as file:
+            file.writelines(json.dumps(record) + "\n" for record in records)
+
+    def _read_lines(self, segment: str) -> list[dict[str, Any]]:
+        """Read every record of a segment."""
+        try:
+            with self._path(segment).open(encoding="utf-8") as file:
+                return [json.loads(line) for line in file if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _rewrite_segment(self, segment: str, live_task_ids: set[str]) -> None:
+        """Rewrite a segment keeping only completions of live tasks."""
+        records = [
+            record
+            for record in self._read_lines(segment)
+            if record["task_id"] in live_task_ids
+        ]
+        path = self._path(segment)
+        temp_path = path.with_suffix(".tmp")
+        with temp_path.open("w", encoding="utf-8") as file:
+            file.writelines(json.dumps(record) + "\n" for record in records)
+        temp_path.replace(path)
+
+    def _remove_segment(self, segment: str) -> None:
+        """Delete a segment file."""
+        self._path(segment).unlink(missing_ok=True)
+
+    def _move_segments(self, source: Path) -> None:
+        """Move the segment files of another history here."""
+        if not source.is_dir():
+            return
+        shutil.rmtree(self._dir, ignore_errors=True)
+        source.rename(self._dir)
+
+
+def _segment_of(when: datetime) -> str:
+    """Return the segment a point in time belongs to."""
+    return f"{when.year:04d}-{when.month:02d}"
+
+
+def _months_back(segment: str, months: int) -> str:
+    """Return the segment a number of months before another."""
+    year, month = (int(part) for part in segment.split("-"))
+    index = year * 12 + month - 1 - months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
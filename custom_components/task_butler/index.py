@@ -0,0 +1,242 @@
+"""Task indexes for Task Butler queries."""
+
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterable, KeysView, Mapping, Set as AbstractSet
+from dataclasses import dataclass
+from datetime import datetime
+import math
+
+from .models import Task
+
+SORT_NEXT_DUE = "next_due"
+SORT_NAME = "name"
+SORT_CREATED_AT = "created_at"
+
+SORT_KEYS = [SORT_NEXT_DUE, SORT_NAME, SORT_CREATED_AT]
+
+# Tasks without a next due date sort after every dated task
+_NO_DUE = math.inf
+
+
+@dataclass(slots=True)
+class TaskQuery:
+    """Filters, sort order and page of a task query."""
+
+    is_due: bool | None = None
+    enabled: bool | None = None
+    schedule_mode: str | None = None
+    due_after: datetime | None = None
+    due_before: datetime | None = None
+    sort_by: str = SORT_NEXT_DUE
+    descending: bool = False
+    limit: int = 50
+    cursor: str | None = None
+
+
+class TaskIndex:
+    """
+    Secondary indexes over the coordinator's tasks.
+
+    Keeps every task in a list sorted by next due time plus membership sets
+    for the filterable flags and areas, so "next N due" style queries walk
+    only the part of the order they return instead of scanning all tasks.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._order: list[tuple[float, str]] = []
+        self._keys: dict[str, tuple[float, str]] = {}
+        self._due: set[str] = set()
+        self._enabled: set[str] = set()
+        self._by_mode: dict[str, set[str]] = {}
+        self._modes: dict[str, str | None] = {}
+        self._by_area: dict[str, set[str]] = {}
+        self._areas: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed tasks."""
+        return len(self._keys)
+
+    def clear(self) -> None:
+        """Remove every task from the index."""
+        self._order.clear()
+        self._keys.clear()
+        self._due.clear()
+        self._enabled.clear()
+        self._by_mode.clear()
+        self._modes.clear()
+        self._by_area.clear()
+        self._areas.clear()
+
+    @property
+    def due(self) -> AbstractSet[str]:
+        """Return the IDs of all due tasks; callers must not modify it."""
+        return self._due
+
+    @property
+    def areas(self) -> KeysView[str]:
+        """Return the areas at least one task is assigned to."""
+        return self._by_area.keys()
+
+    def area_tasks(self, area: str) -> AbstractSet[str]:
+        """Return the IDs of the tasks in an area; callers must not modify it."""
+        return self._by_area.get(area, set())
+
+    def update(self, task_id: str, task: Task) -> None:
+        """Add or refresh a single task."""
+        key = (_due_key(task.next_due), task_id)
+        old_key = self._keys.get(task_id)
+        if old_key != key:
+            if old_key is not None:
+                self._remove_key(old_key)
+            bisect.insort(self._order, key)
+            self._keys[task_id] = key
+
+        self._unindex_flags(task_id)
+        self._index_flags(task_id, task)
+
+    def remove(self, task_id: str) -> None:
+        """Remove a task from the index."""
+        if (key := self._keys.pop(task_id, None)) is None:
+            return
+        self._remove_key(key)
+        self._unindex_flags(task_id)
+
+    def query(
+        self, tasks: Mapping[str, Task], query: TaskQuery
+    ) -> tuple[list[str], str | None]:
+        """Return one page of matching task IDs and the cursor for the next."""
+        if query.sort_by == SORT_NEXT_DUE:
+            return self._query_by_due(query)
+
+        # Other sort keys sort the filtered candidates; the cursor is an offset
+        candidates = sorted(
+            self._candidates(query),
+            key=lambda task_id: (_sort_value(tasks[task_id], query.sort_by), task_id),
+            reverse=query.descending,
+        )
+        offset = int(query.cursor) if query.cursor else 0
+        page = candidates[offset : offset + query.limit]
+        end = offset + len(page)
+        return page, str(end) if end < len(candidates) else None
+
+    def _query_by_due(self, query: TaskQuery) -> tuple[list[str], str | None]:
+        """Walk the next-due order from the cursor or window edge."""
+        low = _due_key(query.due_after) if query.due_after else -_NO_DUE
+        high = _due_key(query.due_before) if query.due_before else _NO_DUE
+
+        if query.descending:
+            start = (
+                bisect.bisect_left(self._order, _parse_cursor(query.cursor))
+                if query.cursor
+                else bisect.bisect_right(self._order, (high, "\uffff"))
+            )
+            positions: Iterable[int] = range(start - 1, -1, -1)
+        else:
+            start = (
+                bisect.bisect_right(self._order, _parse_cursor(query.cursor))
+                if query.cursor
+                else bisect.bisect_left(self._order, (low, ""))
+            )
+            positions = range(start, len(self._order))
+
+        page: list[str] = []
+        last: tuple[float, str] | None = None
+        for position in positions:
+            key = self._order[position]
+            if not low <= key[0] <= high:
+                break
+            if not self._matches(key[1], query):
+                continue
+            if len(page) == query.limit:
+                return page, _format_cursor(last)
+            page.append(key[1])
+            last = key
+
+        return page, None
+
+    def _candidates(self, query: TaskQuery) -> set[str]:
+        """Return the task IDs matching all filters."""
+        candidates = set(self._keys)
+        if query.schedule_mode is not None:
+            candidates &= self._by_mode.get(query.schedule_mode, set())
+        return {task_id for task_id in candidates if self._matches(task_id, query)}
+
+    def _matches(self, task_id: str, query: TaskQuery) -> bool:
+        """Return True if a task matches the query filters."""
+        if query.is_due is not None and (task_id in self._due) != query.is_due:
+            return False
+        if query.enabled is not None and (task_id in self._enabled) != query.enabled:
+            return False
+        if (
+            query.schedule_mode is not None
+            and self._modes.get(task_id) != query.schedule_mode
+        ):
+            return False
+        if query.due_after or query.due_before:
+            due_key = self._keys[task_id][0]
+            if query.due_after and due_key < _due_key(query.due_after):
+                return False
+            if query.due_before and due_key > _due_key(query.due_before):
+                return False
+        return True
+
+    def _remove_key(self, key: tuple[float, str]) -> None:
+        """Remove a key from the sorted order."""
+        position = bisect.bisect_left(self._order, key)
+        if position < len(self._order) and self._order[position] == key:
+            del self._order[position]
+
+    def _index_flags(self, task_id: str, task: Task) -> None:
+        """Add a task to the flag and schedule mode sets."""
+        if task.is_due:
+            self._due.add(task_id)
+        if task.enabled:
+            self._enabled.add(task_id)
+        mode = task.schedule_mode
+        self._modes[task_id] = mode
+        self._by_mode.setdefault(mode, set()).add(task_id)
+        if task.area:
+            self._areas[task_id] = task.area
+            self._by_area.setdefault(task.area, set()).add(task_id)
+
+    def _unindex_flags(self, task_id: str) -> None:
+        """Remove a task from the flag and schedule mode sets."""
+        self._due.discard(task_id)
+        self._enabled.discard(task_id)
+        if task_id in self._modes:
+            self._by_mode[self._modes.pop(task_id)].discard(task_id)
+        if (area := self._areas.pop(task_id, None)) is not None:
+            area_tasks = self._by_area[area]
+            area_tasks.discard(task_id)
+            if not area_tasks:
+                del self._by_area[area]
+
+
+def _due_key(value: datetime | None) -> float:
+    """Return the sort key for a next due value."""
+    if value is None:
+        return _NO_DUE
+    return value.timestamp()
+
+
+def _sort_value(task: Task, sort_by: str) -> str:
+    """Return the value of a task to sort by when not sorting by due time."""
+    if sort_by == SORT_CREATED_AT:
+        return task.created_at.isoformat() if task.created_at else ""
+    return task.name or ""
+
+
+def _format_cursor(key: tuple[float, str] | None) -> str | None:
+    """Encode a position in the next-due order."""
+    if key is None:
+        return None
+    return f"{key[0]!r}|{key[1]}"
+
+
+def _parse_cursor(cursor: str) -> tuple[float, str]:
+    """Decode a position in the next-due order."""
+    due, _, task_id = cursor.partition("|")
+    return float(due), task_id
@@ -0,0 +1,131 @@
+"""Task model for Task Butler."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_INTERVAL_DAYS, DEFAULT_INTERVAL_MODE
+
+# Fields holding timestamps, stored as ISO strings
+DATETIME_FIELDS = frozenset({"created_at", "last_completed", "next_due"})
+
+
+@dataclass(slots=True)
+class Task:
+    """
+    A task with its timestamps parsed.
+
+    Converted to and from the dict format only when persisting and when
+    sending tasks over the WebSocket API. The coordinator replaces a task
+    with a changed copy instead of modifying it, so a task that was read
+    never changes underneath its reader.
+    """
+
+    id: str
+    name: str
+    schedule_mode: str
+    interval_days: int = DEFAULT_INTERVAL_DAYS
+    interval_mode: str = DEFAULT_INTERVAL_MODE
+    fixed_date: str | None = None
+    fixed_occurrence: str | None = None
+    enabled: bool = True
+    created_at: datetime | None = None
+    last_completed: datetime | None = None
+    # Area ID the task is rolled up under
+    area: str | None = None
+    # Keep per-task entities in aggregate entity mode
+    create_entities: bool = False
+    # Derived by the coordinator
+    is_due: bool = False
+    next_due: datetime | None = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Task:
+        """Create a task from its dict format."""
+        values = {key: data[key] for key in TASK_FIELDS if key in data}
+        for key in DATETIME_FIELDS:
+            values[key] = _parse_datetime(values.get(key))
+        return cls(**values)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the dict format of the task."""
+        data = {key: getattr(self, key) for key in TASK_FIELDS}
+        for key in DATETIME_FIELDS:
+            if data[key] is not None:
+                data[key] = data[key].isoformat()
+        return data
+
+    def apply_updates(self, updates: Mapping[str, Any]) -> None:
+        """Apply updates in dict format."""
+        if unknown := set(updates) - UPDATABLE_FIELDS:
+            msg = f"Unknown task fields: {', '.join(sorted(unknown))}"
+            raise ValueError(msg)
+        for key, value in updates.items():
+            setattr(
+                self,
+                key,
+                _parse_datetime(value) if key in DATETIME_FIELDS else value,
+            )
+
+    @property
+    def schedule_key(self) -> tuple[Any, ...]:
+        """Return the inputs that determine the computed schedule."""
+        return (
+            self.schedule_mode,
+            self.interval_days,
+            self.interval_mode,
+            self.last_completed,
+            self.created_at,
+            self.fixed_date,
+            self.fixed_occurrence,
+        )
+
+
+TASK_FIELDS = tuple(field.name for field in fields(Task))
+# Fields recomputed by the coordinator and therefore never persisted
+DERIVED_FIELDS = frozenset({"is_due", "next_due"})
+STORED_FIELDS = tuple(key for key in TASK_FIELDS if key not in DERIVED_FIELDS)
+UPDATABLE_FIELDS = frozenset(STORED_FIELDS) - {"id"}
+
+
+@dataclass(frozen=True, slots=True)
+class TaskSnapshot:
+    """
+    Every task in dict format as of a revision, shared by all readers.
+
+    The dicts must not be modified; those of unchanged tasks are shared with
+    the previous snapshot.
+    """
+
+    revision: int
+    tasks: tuple[dict[str, Any], ...]
+
+
+def as_local_datetime(value: datetime) -> datetime:
+    """
+    Return a timestamp as an aware datetime in Home Assistant's time zone.
+
+    Naive values were written by earlier versions in the system's local time.
+    """
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return dt_util.as_local(value)
+
+
+def datetime_from_timestamp(timestamp: float) -> datetime:
+    """Return an epoch timestamp in Home Assistant's time zone."""
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp))
+
+
+def _parse_datetime(value: datetime | str | None) -> datetime | None:
+    """Parse an ISO timestamp."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value is None:
+        return None
+    return as_local_datetime(value)
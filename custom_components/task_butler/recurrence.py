@@ -0,0 +1,183 @@
+"""Recurrence rules for fixed date and fixed occurrence schedules."""
+
+from __future__ import annotations
+
+import calendar
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from functools import lru_cache
+import re
+from typing import Protocol
+
+from .const import SCHEDULE_FIXED_DATE, SCHEDULE_FIXED_OCCURRENCE
+
+WEEKDAYS = {name.lower(): index for index, name in enumerate(calendar.day_name)}
+MONTHS = {name.lower(): index for index, name in enumerate(calendar.month_name) if name}
+ORDINALS = {"1st": 1, "2nd": 2, "3rd": 3, "4th": 4, "5th": 5, "last": -1}
+
+# Weekday occurrences in a fixed month repeat within the 28-year calendar cycle
+_MAX_YEARS = 28
+
+_FIXED_DATE_RE = re.compile(
+    r"^(?:(?P<year>\d{4})-)?(?P<month>\d{1,2})-(?P<day>\d{1,2})$"
+)
+_OCCURRENCE_RE = re.compile(
+    r"^(?:every\s+)?(?P<ordinal>\w+)\s+(?P<weekday>[a-z]+)"
+    r"(?:\s+(?:of|in)\s+(?P<month>[a-z]+))?$"
+)
+
+
+class Recurrence(Protocol):
+    """A compiled recurrence rule."""
+
+    def next_after(self, after: datetime) -> datetime | None:
+        """Return the first occurrence strictly after a point in time."""
+
+
+@dataclass(frozen=True, slots=True)
+class OneOffDate:
+    """A single date, e.g. "2026-03-01"."""
+
+    day: date
+
+    def next_after(self, after: datetime) -> datetime | None:
+        """Return the date if it is still ahead."""
+        occurrence = _at_midnight(self.day, after)
+        return occurrence if occurrence > after else None
+
+
+@dataclass(frozen=True, slots=True)
+class YearlyDate:
+    """
+    The same day every year, e.g. "03-01" for March 1.
+
+    February 29 falls on February 28 in non-leap years.
+    """
+
+    month: int
+    day: int
+
+    def next_after(self, after: datetime) -> datetime | None:
+        """Return this year's occurrence, or next year's if it has passed."""
+        for year in (after.year, after.year + 1):
+            occurrence = _at_midnight(self._in_year(year), after)
+            if occurrence > after:
+                return occurrence
+        return None
+
+    def _in_year(self, year: int) -> date:
+        """Return the occurrence in a given year."""
+        return date(year, self.month, min(self.day, _days_in_month(year, self.month)))
+
+
+@dataclass(frozen=True, slots=True)
+class NthWeekday:
+    """
+    The nth weekday of every month or of one month a year.
+
+    For example "2nd tuesday" or "last friday of march". A 5th weekday is
+    skipped in months that do not have one.
+    """
+
+    nth: int
+    weekday: int
+    month: int | None = None
+
+    def next_after(self, after: datetime) -> datetime | None:
+        """Step month by month (or year by year) to the next occurrence."""
+        year, month = after.year, self.month or after.month
+        if self.month is not None and self.month < after.month:
+            year += 1
+
+        # A 5th weekday occurs at least every 3 months, or within 28 years
+        for _ in range(_MAX_YEARS + 1 if self.month else 4):
+            if (day := self._in_month(year, month)) is not None:
+                occurrence = _at_midnight(day, after)
+                if occurrence > after:
+                    return occurrence
+            if self.month is not None:
+                year += 1
+            elif month == MONTHS["december"]:
+                year, month = year + 1, 1
+            else:
+                month += 1
+        return None
+
+    def _in_month(self, year: int, month: int) -> date | None:
+        """Return the occurrence in a given month, if there is one."""
+        days = _days_in_month(year, month)
+        if self.nth == -1:
+            last = date(year, month, days)
+            return date(year, month, days - (last.weekday() - self.weekday) % 7)
+
+        first = date(year, month, 1)
+        day = 1 + (self.weekday - first.weekday()) % 7 + 7 * (self.nth - 1)
+        return date(year, month, day) if day <= days else None
+
+
+@lru_cache(maxsize=1024)
+def compile_recurrence(
+    schedule_mode: str, fixed_date: str | None, fixed_occurrence: str | None
+) -> Recurrence | None:
+    """
+    Compile the rule of a fixed date or fixed occurrence schedule.
+
+    Compiled rules are shared by every task using the same rule. Returns
+    None for other schedule modes; raises ValueError for invalid rules.
+    """
+    if schedule_mode == SCHEDULE_FIXED_DATE:
+        return _parse_fixed_date(fixed_date)
+    if schedule_mode == SCHEDULE_FIXED_OCCURRENCE:
+        return _parse_occurrence(fixed_occurrence)
+    return None
+
+
+def _parse_fixed_date(value: str | None) -> OneOffDate | YearlyDate:
+    """Parse "MM-DD" (yearly) or "YYYY-MM-DD" (once)."""
+    if not value or not (match := _FIXED_DATE_RE.match(value.strip())):
+        msg = f"Invalid fixed date: {value!r}, expected MM-DD or YYYY-MM-DD"
+        raise ValueError(msg)
+
+    month, day = int(match["month"]), int(match["day"])
+    try:
+        if match["year"]:
+            return OneOffDate(date(int(match["year"]), month, day))
+
+        # Validate against a leap year so that 02-29 is accepted
+        date(2024, month, day)
+    except ValueError as err:
+        msg = f"Invalid fixed date: {value!r}, {err}"
+        raise ValueError(msg) from err
+    return YearlyDate(month, day)
+
+
+def _parse_occurrence(value: str | None) -> NthWeekday:
+    """Parse "<ordinal> <weekday> [of <month>]", e.g. "2nd tuesday"."""
+    match = _OCCURRENCE_RE.match(value.strip().lower()) if value else None
+    if (
+        match is None
+        or match["ordinal"] not in ORDINALS
+        or match["weekday"] not in WEEKDAYS
+        or (match["month"] and match["month"] not in MONTHS)
+    ):
+        msg = (
+            f"Invalid fixed occurrence: {value!r}, expected e.g. "
+            "'2nd tuesday' or 'last friday of march'"
+        )
+        raise ValueError(msg)
+
+    return NthWeekday(
+        ORDINALS[match["ordinal"]],
+        WEEKDAYS[match["weekday"]],
+        MONTHS[match["month"]] if match["month"] else None,
+    )
+
+
+def _days_in_month(year: int, month: int) -> int:
+    """Return the number of days in a month."""
+    return calendar.monthrange(year, month)[1]
+
+
+def _at_midnight(day: date, like: datetime) -> datetime:
+    """Return the start of a day in the same timezone as a reference time."""
+    return datetime.combine(day, time.min, tzinfo=like.tzinfo)
@@ -0,0 +1,135 @@
+"""Due-time scheduler for Task Butler."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+import heapq
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rebuild the heap once stale entries outnumber live ones by this much
+_COMPACT_SLACK = 64
+
+
+class DueScheduler:
+    """
+    Keep task deadlines in a min-heap and arm a timer for the earliest one.
+
+    Deadlines must be timezone-aware, as the timer compares them to the time
+    in Home Assistant's time zone rather than the system's.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, action: Callable[[list[str]], None]
+    ) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._action = action
+        self._heap: list[tuple[datetime, str]] = []
+        self._deadlines: dict[str, datetime] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+        self._armed_at: datetime | None = None
+
+    def __len__(self) -> int:
+        """Return the number of scheduled tasks."""
+        return len(self._deadlines)
+
+    @property
+    def next_deadline(self) -> datetime | None:
+        """Return the deadline the timer is currently armed for."""
+        return self._armed_at
+
+    @callback
+    def async_reset(self, deadlines: dict[str, datetime]) -> None:
+        """Replace all scheduled deadlines."""
+        self._deadlines = dict(deadlines)
+        self._rebuild()
+        self._async_arm()
+
+    @callback
+    def async_schedule(self, task_id: str, when: datetime | None) -> None:
+        """Schedule a task to become due at the given time."""
+        if when is None:
+            self.async_unschedule(task_id)
+            return
+
+        if self._deadlines.get(task_id) == when:
+            return
+
+        self._deadlines[task_id] = when
+        heapq.heappush(self._heap, (when, task_id))
+        if len(self._heap) > 2 * len(self._deadlines) + _COMPACT_SLACK:
+            self._rebuild()
+        self._async_arm()
+
+    @callback
+    def async_unschedule(self, task_id: str) -> None:
+        """Remove a task from the schedule."""
+        # Heap entries are dropped lazily when they reach the top
+        if self._deadlines.pop(task_id, None) is not None:
+            self._async_arm()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel the pending timer and forget all deadlines."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._armed_at = None
+        self._heap.clear()
+        self._deadlines.clear()
+
+    def _rebuild(self) -> None:
+        """Rebuild the heap from the live deadlines."""
+        self._heap = [(when, task_id) for task_id, when in self._deadlines.items()]
+        heapq.heapify(self._heap)
+
+    def _is_live(self, entry: tuple[datetime, str]) -> bool:
+        """Return True if a heap entry still matches its task's deadline."""
+        return self._deadlines.get(entry[1]) == entry[0]
+
+    @callback
+    def _async_arm(self) -> None:
+        """Arm the timer for the earliest live deadline."""
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+
+        next_when = self._heap[0][0] if self._heap else None
+        if next_when == self._armed_at and self._unsub is not None:
+            return
+
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._armed_at = next_when
+
+        if next_when is not None:
+            self._unsub = async_track_point_in_time(
+                self._hass, self._async_fire, next_when
+            )
+
+    @callback
+    def _async_fire(self, _now: datetime) -> None:
+        """Pop every task whose deadline has passed and notify the owner."""
+        self._unsub = None
+        self._armed_at = None
+
+        current_time = dt_util.now()
+        due: list[str] = []
+        while self._heap and self._heap[0][0] <= current_time:
+            entry = heapq.heappop(self._heap)
+            if self._is_live(entry):
+                del self._deadlines[entry[1]]
+                due.append(entry[1])
+
+        self._async_arm()
+
+        if due:
+            _LOGGER.debug("%d task(s) became due", len(due))
+            self._action(due)
@@ -2,18 +2,31 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
-from datetime import datetime
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import area_registry as ar
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, ENTITY_MODE_AGGREGATE, SUMMARY_SENSOR_KEY
 from .coordinator import TaskButlerCoordinator
+from .entity import TaskButlerTaskEntity, async_remove_entity, async_setup_task_entities
+from .index import TaskQuery
+from .models import Task
+from .stats import to_milliseconds
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,38 +37,62 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Task Butler sensors based on a config entry."""
-    coordinator: TaskButlerCoordinator = hass.data[DOMAIN]
-
-    # Create sensors for all tasks
-    entities = []
-    for task_id in coordinator.tasks:
-        entities.extend(
-            [
-                TaskNextDueSensor(coordinator, task_id),
-                TaskLastCompletedSensor(coordinator, task_id),
-            ]
+    coordinator: TaskButlerCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    async_setup_task_entities(
+        hass,
+        entry,
+        coordinator,
+        async_add_entities,
+        lambda task_id: [
+            TaskNextDueSensor(coordinator, task_id),
+            TaskLastCompletedSensor(coordinator, task_id),
+        ],
+    )
+
+    if coordinator.diagnostic_sensors:
+        async_add_entities(
+            TaskButlerSensor(coordinator, entry, description)
+            for description in DIAGNOSTIC_SENSORS
+        )
+
+    if coordinator.entity_mode == ENTITY_MODE_AGGREGATE:
+        async_add_entities(
+            TaskButlerSensor(coordinator, entry, description)
+            for description in SUMMARY_SENSORS
         )
+        area_sensors: dict[str, TaskButlerAreaSensor] = {}
+
+        @callback
+        def update_area_sensors() -> None:
+            """Add a rollup sensor per area with tasks, remove those left empty."""
+            areas = coordinator.index.areas
+            if new_areas := areas - area_sensors.keys():
+                new_sensors = {
+                    area: TaskButlerAreaSensor(coordinator, entry, area)
+                    for area in new_areas
+                }
+                area_sensors.update(new_sensors)
+                async_add_entities(new_sensors.values())
+            for area in area_sensors.keys() - areas:
+                async_remove_entity(hass, area_sensors.pop(area))
 
-    async_add_entities(entities, True)
+        update_area_sensors()
+        entry.async_on_unload(coordinator.async_add_listener(update_area_sensors))
 
 
-class TaskNextDueSensor(CoordinatorEntity, SensorEntity):
+class TaskNextDueSensor(TaskButlerTaskEntity, SensorEntity):
     """Sensor for task next due date."""
 
     def __init__(self, coordinator: TaskButlerCoordinator, task_id: str) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self.task_id = task_id
-
-    @property
-    def task_data(self) -> dict[str, Any]:
-        """Get task data from coordinator."""
-        return self.coordinator.tasks.get(self.task_id, {})
+        super().__init__(coordinator, task_id)
 
     @property
     def name(self) -> str:
         """Return the name of the sensor."""
-        task_name = self.task_data.get("name", "Unknown Task")
+        task = self.task_data
+        task_name = task.name if task else "Unknown Task"
         return f"{task_name} Next Due"
 
     @property
@@ -66,36 +103,24 @@ class TaskNextDueSensor(CoordinatorEntity, SensorEntity):
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        next_due = self.task_data.get("next_due")
-        if next_due:
-            if isinstance(next_due, str):
-                next_due = datetime.fromisoformat(next_due)
-            return self.coordinator.format_date(next_due)
+        task = self.task_data
+        if task and task.next_due:
+            return self.coordinator.format_date(task.next_due)
         return None
 
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return self.task_id in self.coordinator.tasks
-
 
-class TaskLastCompletedSensor(CoordinatorEntity, SensorEntity):
+class TaskLastCompletedSensor(TaskButlerTaskEntity, SensorEntity):
     """Sensor for task last completed date."""
 
     def __init__(self, coordinator: TaskButlerCoordinator, task_id: str) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self.task_id = task_id
-
-    @property
-    def task_data(self) -> dict[str, Any]:
-        """Get task data from coordinator."""
-        return self.coordinator.tasks.get(self.task_id, {})
+        super().__init__(coordinator, task_id)
 
     @property
     def name(self) -> str:
         """Return the name of the sensor."""
-        task_name = self.task_data.get("name", "Unknown Task")
+        task = self.task_data
+        task_name = task.name if task else "Unknown Task"
         return f"{task_name} Last Completed"
 
     @property
@@ -106,14 +131,207 @@ class TaskLastCompletedSensor(CoordinatorEntity, SensorEntity):
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        last_completed = self.task_data.get("last_completed")
-        if last_completed:
-            if isinstance(last_completed, str):
-                last_completed = datetime.fromisoformat(last_completed)
-            return self.coordinator.format_date(last_completed)
+        task = self.task_data
+        if task and task.last_completed:
+            return self.coordinator.format_date(task.last_completed)
         return None
 
+
+@dataclass(frozen=True, kw_only=True)
+class TaskButlerSensorEntityDescription(SensorEntityDescription):
+    """Describes a Task Butler sensor computed from the whole task list."""
+
+    value_fn: Callable[[TaskButlerCoordinator], StateType]
+    attributes_fn: Callable[[TaskButlerCoordinator], dict[str, Any]] | None = None
+
+
+DIAGNOSTIC_SENSORS: tuple[TaskButlerSensorEntityDescription, ...] = (
+    TaskButlerSensorEntityDescription(
+        key="refresh_duration",
+        name="Refresh Duration",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: to_milliseconds(coordinator.stats.refresh.last),
+        attributes_fn=lambda coordinator: {
+            "refresh": coordinator.stats.refresh.as_dict(),
+            "task_update": coordinator.stats.task_update.as_dict(),
+        },
+    ),
+    TaskButlerSensorEntityDescription(
+        key="tasks_recomputed",
+        name="Tasks Recomputed",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.stats.last_tasks_recomputed,
+        attributes_fn=lambda coordinator: {
+            "total": coordinator.stats.tasks_recomputed,
+        },
+    ),
+    TaskButlerSensorEntityDescription(
+        key="state_writes",
+        name="State Writes",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.stats.state_writes,
+        attributes_fn=lambda coordinator: {
+            "last_refresh": coordinator.stats.last_refresh_state_writes,
+        },
+    ),
+    TaskButlerSensorEntityDescription(
+        key="save_latency",
+        name="Save Latency",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: to_milliseconds(
+            coordinator.store.save_latency.last
+        ),
+        attributes_fn=lambda coordinator: {
+            "save_latency": coordinator.store.save_latency.as_dict(),
+            "write_duration": coordinator.store.write_duration.as_dict(),
+        },
+    ),
+    TaskButlerSensorEntityDescription(
+        key="bytes_written",
+        name="Bytes Written",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.store.bytes_written,
+        attributes_fn=lambda coordinator: {
+            "last_write": coordinator.store.last_bytes_written,
+        },
+    ),
+    TaskButlerSensorEntityDescription(
+        key="websocket_commands",
+        name="WebSocket Commands",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: sum(
+            histogram.count for histogram in coordinator.stats.commands.values()
+        ),
+        attributes_fn=lambda coordinator: {
+            command: {
+                "count": histogram.count,
+                "mean_ms": to_milliseconds(histogram.mean),
+            }
+            for command, histogram in sorted(coordinator.stats.commands.items())
+        },
+    ),
+)
+
+
+class TaskButlerSensor(CoordinatorEntity[TaskButlerCoordinator], SensorEntity):
+    """Sensor computed from the whole task list."""
+
+    entity_description: TaskButlerSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: TaskButlerCoordinator,
+        entry: ConfigEntry,
+        description: TaskButlerSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_name = f"{entry.title} {description.name}"
+        self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_{description.key}"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the state attributes."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator)
+
+
+def _next_task(coordinator: TaskButlerCoordinator) -> Task | None:
+    """Return the enabled task with the earliest next due date."""
+    task_ids, _ = coordinator.index.query(
+        coordinator.tasks, TaskQuery(enabled=True, limit=1)
+    )
+    if not task_ids or (task := coordinator.tasks[task_ids[0]]).next_due is None:
+        return None
+    return task
+
+
+def _next_task_attributes(coordinator: TaskButlerCoordinator) -> dict[str, Any]:
+    """Return the ID and next due date of the next task."""
+    if (task := _next_task(coordinator)) is None:
+        return {}
+    return {
+        "task_id": task.id,
+        "next_due": coordinator.format_date(task.next_due),
+    }
+
+
+SUMMARY_SENSORS: tuple[TaskButlerSensorEntityDescription, ...] = (
+    TaskButlerSensorEntityDescription(
+        key=f"{SUMMARY_SENSOR_KEY}_due",
+        name="Due Tasks",
+        icon="mdi:clipboard-alert",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: len(coordinator.index.due),
+        attributes_fn=lambda coordinator: {"total": len(coordinator.tasks)},
+    ),
+    TaskButlerSensorEntityDescription(
+        key=f"{SUMMARY_SENSOR_KEY}_overdue",
+        name="Overdue Tasks",
+        icon="mdi:clipboard-alert-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: len(coordinator.overdue),
+    ),
+    TaskButlerSensorEntityDescription(
+        key=f"{SUMMARY_SENSOR_KEY}_next_task",
+        name="Next Task",
+        icon="mdi:clipboard-clock",
+        value_fn=lambda coordinator: (
+            task.name if (task := _next_task(coordinator)) else None
+        ),
+        attributes_fn=_next_task_attributes,
+    ),
+)
+
+
+class TaskButlerAreaSensor(CoordinatorEntity[TaskButlerCoordinator], SensorEntity):
+    """Sensor counting the due tasks of one area in aggregate entity mode."""
+
+    _attr_icon = "mdi:home-alert"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self, coordinator: TaskButlerCoordinator, entry: ConfigEntry, area_id: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.area_id = area_id
+        area = ar.async_get(coordinator.hass).async_get_area(area_id)
+        area_name = area.name if area else area_id
+        self._attr_name = f"{entry.title} {area_name} Due Tasks"
+        self._attr_unique_id = (
+            f"{DOMAIN}_{entry.entry_id}_{SUMMARY_SENSOR_KEY}_area_{area_id}"
+        )
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of due tasks in the area."""
+        index = self.coordinator.index
+        return len(index.area_tasks(self.area_id) & index.due)
+
     @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return self.task_id in self.coordinator.tasks
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        area_tasks = self.coordinator.index.area_tasks(self.area_id)
+        return {
+            "area_id": self.area_id,
+            "total": len(area_tasks),
+            "overdue": len(area_tasks & self.coordinator.overdue),
+        }
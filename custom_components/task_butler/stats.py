@@ -0,0 +1,105 @@
+"""Runtime statistics for Task Butler."""
+
+from __future__ import annotations
+
+import bisect
+from typing import Any
+
+# Upper bounds of the duration histogram buckets, in seconds
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class DurationHistogram:
+    """Count of durations per bucket, with their total and maximum."""
+
+    __slots__ = ("buckets", "count", "last", "maximum", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(DURATION_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.last: float | None = None
+
+    def observe(self, seconds: float) -> None:
+        """Record a duration."""
+        self.buckets[bisect.bisect_left(DURATION_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+        self.last = seconds
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean duration."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram with durations in milliseconds."""
+        labels = [f"<={bound * 1000:g}ms" for bound in DURATION_BUCKETS]
+        labels.append(f">{DURATION_BUCKETS[-1] * 1000:g}ms")
+        return {
+            "count": self.count,
+            "last_ms": to_milliseconds(self.last),
+            "mean_ms": to_milliseconds(self.mean),
+            "max_ms": to_milliseconds(self.maximum if self.count else None),
+            "buckets": dict(zip(labels, self.buckets, strict=True)),
+        }
+
+
+class RuntimeStats:
+    """What refreshes, entity updates and WebSocket commands cost."""
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        # Full recompute of every task
+        self.refresh = DurationHistogram()
+        # Recompute of the tasks touched by a mutation or a due timer
+        self.task_update = DurationHistogram()
+        self.load_duration: float | None = None
+        self.last_tasks_recomputed = 0
+        self.tasks_recomputed = 0
+        self.state_writes = 0
+        self.last_refresh_state_writes = 0
+        self.commands: dict[str, DurationHistogram] = {}
+
+    def record_refresh(
+        self,
+        histogram: DurationHistogram,
+        seconds: float,
+        tasks_recomputed: int,
+        state_writes: int,
+    ) -> None:
+        """Record a full refresh or a task update."""
+        histogram.observe(seconds)
+        self.last_tasks_recomputed = tasks_recomputed
+        self.tasks_recomputed += tasks_recomputed
+        self.last_refresh_state_writes = state_writes
+
+    def record_command(self, command: str, seconds: float) -> None:
+        """Record the handling of a WebSocket command."""
+        if (histogram := self.commands.get(command)) is None:
+            histogram = self.commands[command] = DurationHistogram()
+        histogram.observe(seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics."""
+        return {
+            "load_ms": to_milliseconds(self.load_duration),
+            "refresh": self.refresh.as_dict(),
+            "task_update": self.task_update.as_dict(),
+            "last_tasks_recomputed": self.last_tasks_recomputed,
+            "tasks_recomputed": self.tasks_recomputed,
+            "state_writes": self.state_writes,
+            "last_refresh_state_writes": self.last_refresh_state_writes,
+            "websocket_commands": {
+                command: histogram.as_dict()
+                for command, histogram in sorted(self.commands.items())
+            },
+        }
+
+
+def to_milliseconds(seconds: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 3)
@@ -0,0 +1,536 @@
+"""Task persistence for Task Butler."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+from collections.abc import Callable, Iterable, Mapping
+import logging
+import os
+from pathlib import Path
+import sqlite3
+import sys
+import time
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+
+from .const import DOMAIN, STORAGE_BACKEND_JSON, STORAGE_BACKEND_SQLITE
+from .models import DATETIME_FIELDS, STORED_FIELDS, Task, datetime_from_timestamp
+from .stats import DurationHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 2
+STORAGE_KEY = f"{DOMAIN}_tasks"
+SQLITE_FILENAME = f"{DOMAIN}_tasks{{}}.db"
+
+# Seconds before retrying a failed write, doubled after each further failure
+RETRY_DELAY_MIN = 5
+RETRY_DELAY_MAX = 300
+
+TasksFunc = Callable[[], Mapping[str, Task]]
+
+
+class TaskStorage(ABC):
+    """
+    Write-behind persistence for tasks.
+
+    Mutations only mark tasks dirty; pending mutations are coalesced into a
+    single write after ``save_delay`` seconds. Pending data is flushed on
+    unload and on Home Assistant shutdown.
+
+    Each task list is stored under its own ``list_id``; None is the location
+    used before a config entry could have a task list of its own.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        tasks_func: TasksFunc,
+        save_delay: float,
+        list_id: str | None = None,
+    ) -> None:
+        """Initialize the storage."""
+        self._hass = hass
+        self.list_id = list_id
+        self._tasks_func = tasks_func
+        self.save_delay = save_delay
+        self.pending_writes = 0
+        self.flush_count = 0
+        # Time from the first pending mutation until it is written
+        self.save_latency = DurationHistogram()
+        self.write_duration = DurationHistogram()
+        self.bytes_written = 0
+        self.last_bytes_written: int | None = None
+        # Consecutive failed writes, reset by the next successful one
+        self.failed_writes = 0
+        self._dirty_ids: set[str] = set()
+        self._dirty_since: float | None = None
+        self._unsub_delay: CALLBACK_TYPE | None = None
+        self._unsub_final_write: CALLBACK_TYPE | None = None
+
+    @property
+    def dirty(self) -> bool:
+        """Return True if there are mutations that have not been written."""
+        return self._dirty_since is not None
+
+    @property
+    def retry_delay(self) -> float:
+        """Return the delay before the next write, backed off after failures."""
+        if not self.failed_writes:
+            return self.save_delay
+        delay = max(self.save_delay, RETRY_DELAY_MIN) * 2 ** (self.failed_writes - 1)
+        return min(delay, RETRY_DELAY_MAX)
+
+    @abstractmethod
+    async def async_load(self) -> dict[str, Task] | None:
+        """Load all tasks, or None if nothing is stored."""
+
+    @callback
+    def async_schedule_save(self, task_ids: Iterable[str]) -> None:
+        """Mark tasks dirty and schedule a coalesced write."""
+        if self._dirty_since is None:
+            self._dirty_since = time.monotonic()
+        self.pending_writes += 1
+        self._dirty_ids.update(task_ids)
+        self._async_schedule_delay()
+
+    @callback
+    def _async_schedule_delay(self) -> None:
+        """(Re)start the save delay and make sure shutdown writes."""
+        if self._unsub_delay is not None:
+            self._unsub_delay()
+        self._unsub_delay = async_call_later(
+            self._hass, self.retry_delay, self._async_handle_delay
+        )
+        if self._unsub_final_write is None:
+            self._unsub_final_write = self._hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_handle_final_write
+            )
+
+    async def async_flush(self) -> None:
+        """Write pending mutations immediately."""
+        if self._unsub_delay is not None:
+            self._unsub_delay()
+            self._unsub_delay = None
+        if self._dirty_since is None:
+            return
+
+        latency = time.monotonic() - self._dirty_since
+        _LOGGER.debug(
+            "Flushing %d coalesced task mutation(s) after %.3fs",
+            self.pending_writes,
+            latency,
+        )
+        task_ids, self._dirty_ids = self._dirty_ids, set()
+        dirty_since, self._dirty_since = self._dirty_since, None
+        pending_writes, self.pending_writes = self.pending_writes, 0
+        self.flush_count += 1
+
+        start = time.perf_counter()
+        try:
+            written = await self._async_write(task_ids)
+        except (OSError, sqlite3.Error, HomeAssistantError) as err:
+            # Keep the tasks dirty, along with any mutated during the write,
+            # and try again after a growing delay
+            self.failed_writes += 1
+            self._dirty_ids |= task_ids
+            self._dirty_since = dirty_since
+            self.pending_writes += pending_writes
+            self._async_schedule_delay()
+            if self.failed_writes == 1:
+                _LOGGER.exception(
+                    "Failed to write %d task(s), retrying in %ss",
+                    len(task_ids),
+                    self.retry_delay,
+                )
+            else:
+                _LOGGER.warning(
+                    "Failed to write %d task(s) again (%s), retrying in %ss",
+                    len(task_ids),
+                    err,
+                    self.retry_delay,
+                )
+            return
+        if self.failed_writes:
+            _LOGGER.info(
+                "Wrote %d task(s) after %d failed attempt(s)",
+                len(task_ids),
+                self.failed_writes,
+            )
+            self.failed_writes = 0
+        self.save_latency.observe(latency)
+        self.write_duration.observe(time.perf_counter() - start)
+        self.last_bytes_written = written
+        self.bytes_written += written
+
+    @abstractmethod
+    async def _async_write(self, task_ids: set[str]) -> int:
+        """Write the dirty tasks and return the number of bytes written."""
+
+    @abstractmethod
+    async def async_replace_all(self, tasks: Mapping[str, Task]) -> None:
+        """Replace everything stored with the given tasks."""
+
+    @abstractmethod
+    async def async_remove(self) -> None:
+        """Delete all stored data."""
+
+    async def async_close(self) -> None:
+        """Flush and release resources."""
+        await self.async_flush()
+        if self._unsub_final_write is not None:
+            self._unsub_final_write()
+            self._unsub_final_write = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the write statistics."""
+        return {
+            "backend": type(self).__name__,
+            "save_delay": self.save_delay,
+            "pending_writes": self.pending_writes,
+            "flush_count": self.flush_count,
+            "failed_writes": self.failed_writes,
+            "save_latency": self.save_latency.as_dict(),
+            "write_duration": self.write_duration.as_dict(),
+            "bytes_written": self.bytes_written,
+            "last_bytes_written": self.last_bytes_written,
+        }
+
+    async def _async_handle_delay(self, _now: Any) -> None:
+        """Write after the save delay."""
+        self._unsub_delay = None
+        await self.async_flush()
+
+    async def _async_handle_final_write(self, _event: Event) -> None:
+        """Write pending mutations when Home Assistant shuts down."""
+        self._unsub_final_write = None
+        await self.async_flush()
+
+
+class _TaskDocumentStore(Store[dict[str, Any]]):
+    """Store that migrates older task documents on load."""
+
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,
+        _old_minor_version: int,
+        old_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Migrate a task document to the current version."""
+        if old_major_version == 1:
+            # Version 1 kept every task as a dict with ISO timestamps
+            start = time.perf_counter()
+            tasks = [
+                Task.from_dict(task) for task in old_data.get("tasks", {}).values()
+            ]
+            old_data = _encode_tasks(tasks)
+            _LOGGER.info(
+                "Migrated %d task(s) to storage version %d in %.3fs",
+                len(tasks),
+                STORAGE_VERSION,
+                time.perf_counter() - start,
+            )
+        return old_data
+
+
+class JsonTaskStore(TaskStorage):
+    """Tasks in a single JSON Store document, rewritten on every save."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        tasks_func: TasksFunc,
+        save_delay: float,
+        list_id: str | None = None,
+    ) -> None:
+        """Initialize the JSON store."""
+        super().__init__(hass, tasks_func, save_delay, list_id)
+        key = STORAGE_KEY if list_id is None else f"{STORAGE_KEY}.{list_id}"
+        self._store = _TaskDocumentStore(hass, STORAGE_VERSION, key)
+
+    async def async_load(self) -> dict[str, Task] | None:
+        """Load all tasks."""
+        if (stored := await self._store.async_load()) is None:
+            return None
+        return _decode_tasks(stored)
+
+    async def _async_write(self, _task_ids: set[str]) -> int:
+        """Rewrite the document."""
+        await self._store.async_save(_encode_tasks(self._tasks_func().values()))
+        return await self._hass.async_add_executor_job(
+            os.path.getsize, self._store.path
+        )
+
+    async def async_replace_all(self, tasks: Mapping[str, Task]) -> None:
+        """Replace the document."""
+        await self._store.async_save(_encode_tasks(tasks.values()))
+
+    async def async_remove(self) -> None:
+        """Delete the document."""
+        await self._store.async_remove()
+
+
+class SqliteTaskStore(TaskStorage):
+    """
+    Tasks as rows in a local SQLite database.
+
+    Only the rows of dirty tasks are upserted or deleted on save, and all
+    database work runs in the executor.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        tasks_func: TasksFunc,
+        save_delay: float,
+        list_id: str | None = None,
+    ) -> None:
+        """Initialize the SQLite store."""
+        super().__init__(hass, tasks_func, save_delay, list_id)
+        filename = SQLITE_FILENAME.format("" if list_id is None else f".{list_id}")
+        self._path = Path(hass.config.path(STORAGE_DIR, filename))
+        self._connection: sqlite3.Connection | None = None
+        # Serializes executor jobs on the shared connection
+        self._lock = asyncio.Lock()
+
+    async def async_load(self) -> dict[str, Task] | None:
+        """Load all tasks."""
+        async with self._lock:
+            if not await self._hass.async_add_executor_job(self._path.exists):
+                return None
+            return await self._hass.async_add_executor_job(self._load)
+
+    async def _async_write(self, task_ids: set[str]) -> int:
+        """Upsert or delete the dirty rows."""
+        tasks = self._tasks_func()
+        upserts = [
+            _to_row(tasks[task_id].as_dict()) for task_id in task_ids & tasks.keys()
+        ]
+        deletes = [task_id for task_id in task_ids if task_id not in tasks]
+        async with self._lock:
+            await self._hass.async_add_executor_job(self._write, upserts, deletes)
+        # Approximate size of the written row data
+        return sum(
+            len(str(value)) for row in upserts for value in row if value is not None
+        ) + sum(len(task_id) for task_id in deletes)
+
+    async def async_replace_all(self, tasks: Mapping[str, Task]) -> None:
+        """Replace every row."""
+        rows = [_to_row(task.as_dict()) for task in tasks.values()]
+        async with self._lock:
+            await self._hass.async_add_executor_job(self._replace_all, rows)
+
+    async def async_remove(self) -> None:
+        """Delete the database file."""
+        async with self._lock:
+            await self._hass.async_add_executor_job(self._remove)
+
+    async def async_close(self) -> None:
+        """Flush and close the database."""
+        await super().async_close()
+        async with self._lock:
+            if self._connection is not None:
+                await self._hass.async_add_executor_job(self._connection.close)
+                self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema."""
+        if self._connection is None:
+            self._connection = sqlite3.connect(self._path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute(_SQL_CREATE)
+        return self._connection
+
+    def _load(self) -> dict[str, Task]:
+        """Read every row."""
+        connection = self._connect()
+        cursor = connection.execute(_SQL_SELECT)
+        return {row[0]: Task.from_dict(_from_row(row)) for row in cursor}
+
+    def _write(self, upserts: list[tuple[Any, ...]], deletes: list[str]) -> None:
+        """Upsert and delete rows in a single transaction."""
+        connection = self._connect()
+        with connection:
+            if upserts:
+                connection.executemany(_SQL_UPSERT, upserts)
+            if deletes:
+                connection.executemany(
+                    "DELETE FROM tasks WHERE id = ?",
+                    [(task_id,) for task_id in deletes],
+                )
+
+    def _replace_all(self, rows: list[tuple[Any, ...]]) -> None:
+        """Replace every row in a single transaction."""
+        connection = self._connect()
+        with connection:
+            connection.execute("DELETE FROM tasks")
+            connection.executemany(_SQL_UPSERT, rows)
+
+    def _remove(self) -> None:
+        """Close and delete the database file."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        self._path.unlink(missing_ok=True)
+
+
+# Only stored fields get a column. Every task is loaded into memory and
+# queried through TaskIndex, so the table is only ever read in full and
+# secondary indexes would just slow down the upserts.
+_SQL_FIELDS = (
+    "id",
+    "name",
+    "schedule_mode",
+    "interval_days",
+    "interval_mode",
+    "fixed_date",
+    "fixed_occurrence",
+    "enabled",
+    "created_at",
+    "last_completed",
+    "area",
+    "create_entities",
+)
+_SQL_CREATE = (
+    "CREATE TABLE IF NOT EXISTS tasks ("
+    "id TEXT PRIMARY KEY, name TEXT, schedule_mode TEXT, interval_days INTEGER, "
+    "interval_mode TEXT, fixed_date TEXT, fixed_occurrence TEXT, enabled INTEGER, "
+    "created_at TEXT, last_completed TEXT, area TEXT, create_entities INTEGER)"
+)
+_SQL_SELECT = (
+    "SELECT id, name, schedule_mode, interval_days, interval_mode, fixed_date, "
+    "fixed_occurrence, enabled, created_at, last_completed, area, create_entities "
+    "FROM tasks"
+)
+_SQL_UPSERT = (
+    "INSERT INTO tasks (id, name, schedule_mode, interval_days, interval_mode, "
+    "fixed_date, fixed_occurrence, enabled, created_at, last_completed, area, "
+    "create_entities) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET name = excluded.name, "
+    "schedule_mode = excluded.schedule_mode, "
+    "interval_days = excluded.interval_days, "
+    "interval_mode = excluded.interval_mode, fixed_date = excluded.fixed_date, "
+    "fixed_occurrence = excluded.fixed_occurrence, enabled = excluded.enabled, "
+    "created_at = excluded.created_at, last_completed = excluded.last_completed, "
+    "area = excluded.area, create_entities = excluded.create_entities"
+)
+_BOOL_FIELDS = ("enabled", "create_entities")
+
+
+def _to_row(task: dict[str, Any]) -> tuple[Any, ...]:
+    """Convert a task in dict format to a row."""
+    return tuple(
+        int(task[field]) if field in _BOOL_FIELDS else task.get(field)
+        for field in _SQL_FIELDS
+    )
+
+
+def _from_row(row: tuple[Any, ...]) -> dict[str, Any]:
+    """Convert a row to a task in dict format."""
+    task = dict(zip(_SQL_FIELDS, row, strict=True))
+    for field in _BOOL_FIELDS:
+        task[field] = bool(task[field])
+    return task
+
+
+# Compact document encoding (version 2): tasks are rows of values in the
+# order given by "fields", timestamps are epoch seconds, and enum values
+# are indexes into the "enums" string table.
+_ENUM_FIELDS = frozenset({"schedule_mode", "interval_mode", "area"})
+_FLAG_FIELDS = frozenset({"enabled", "create_entities"})
+_TIMESTAMP_FIELDS = DATETIME_FIELDS.intersection(STORED_FIELDS)
+
+
+def _encode_tasks(tasks: Iterable[Task]) -> dict[str, Any]:
+    """Encode tasks as a compact document."""
+    enums: dict[str, int] = {}
+
+    def encode(key: str, value: Any) -> Any:
+        if value is None:
+            return None
+        if key in _ENUM_FIELDS:
+            return enums.setdefault(value, len(enums))
+        if key in _TIMESTAMP_FIELDS:
+            return value.timestamp()
+        if key in _FLAG_FIELDS:
+            return int(value)
+        return value
+
+    rows = [
+        [encode(key, getattr(task, key)) for key in STORED_FIELDS] for task in tasks
+    ]
+    return {"fields": list(STORED_FIELDS), "enums": list(enums), "tasks": rows}
+
+
+def _decode_tasks(data: dict[str, Any]) -> dict[str, Task]:
+    """Decode a compact document."""
+    enums = [sys.intern(value) for value in data["enums"]]
+    decoders: list[tuple[int, str, Callable[[Any], Any] | None]] = []
+    for position, key in enumerate(data["fields"]):
+        # Ignore fields written by a newer version
+        if key not in STORED_FIELDS:
+            continue
+        if key in _ENUM_FIELDS:
+            decoders.append((position, key, enums.__getitem__))
+        elif key in _TIMESTAMP_FIELDS:
+            decoders.append((position, key, datetime_from_timestamp))
+        elif key in _FLAG_FIELDS:
+            decoders.append((position, key, bool))
+        else:
+            decoders.append((position, key, None))
+
+    tasks: dict[str, Task] = {}
+    for row in data["tasks"]:
+        values = {}
+        for position, key, decode in decoders:
+            value = row[position]
+            values[key] = decode(value) if decode and value is not None else value
+        task = Task(**values)
+        tasks[task.id] = task
+    return tasks
+
+
+STORAGE_BACKENDS: dict[str, type[TaskStorage]] = {
+    STORAGE_BACKEND_JSON: JsonTaskStore,
+    STORAGE_BACKEND_SQLITE: SqliteTaskStore,
+}
+
+
+def create_task_storage(
+    hass: HomeAssistant,
+    backend: str,
+    tasks_func: TasksFunc,
+    save_delay: float,
+    list_id: str | None = None,
+) -> TaskStorage:
+    """Create the storage of a task list for a backend."""
+    return STORAGE_BACKENDS[backend](hass, tasks_func, save_delay, list_id)
+
+
+async def async_migrate_storage(
+    source: TaskStorage, target: TaskStorage
+) -> dict[str, Task] | None:
+    """
+    Move all tasks from one backend to another.
+
+    The source is deleted afterwards so that switching back later migrates
+    again instead of loading stale data.
+    """
+    if (tasks := await source.async_load()) is None:
+        return None
+
+    _LOGGER.info(
+        "Migrating %d task(s) from %s to %s",
+        len(tasks),
+        type(source).__name__,
+        type(target).__name__,
+    )
+    await target.async_replace_all(tasks)
+    await source.async_remove()
+    return tasks
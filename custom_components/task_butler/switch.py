@@ -1,60 +1,72 @@
 """Switch platform for Task Butler."""
 
-# from __future__ import annotations
+from __future__ import annotations
 
+import logging
 from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
+from .coordinator import TaskButlerCoordinator
+from .entity import TaskButlerTaskEntity, async_setup_task_entities
+
+_LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(
     hass: HomeAssistant,
-    config_entry: ConfigEntry,
+    entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up Task Butler switches."""
-    # TODO: Create switch entities based on config entry
-    entities = []
-
-    # Example: Task enable/disable switch
-    entities.append(TaskEnabledSwitch(config_entry))
+    """Set up Task Butler switches based on a config entry."""
+    coordinator: TaskButlerCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(entities)
+    async_setup_task_entities(
+        hass,
+        entry,
+        coordinator,
+        async_add_entities,
+        lambda task_id: [TaskEnabledSwitch(coordinator, task_id)],
+    )
 
 
-class TaskEnabledSwitch(SwitchEntity):
+class TaskEnabledSwitch(TaskButlerTaskEntity, SwitchEntity):
     """Switch to enable/disable a task."""
 
-    def __init__(self, config_entry: ConfigEntry) -> None:
-        """Initialize the switch."""
-        self._config_entry = config_entry
-        task_name = config_entry.data.get("task_name", "Task")
-        self._attr_name = f"{task_name} Enabled"
-        self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_enabled"
-        self._is_on = config_entry.data.get("enabled", True)
+    _attr_entity_category = EntityCategory.CONFIG
+
+    @property
+    def name(self) -> str:
+        """Return the name of the switch."""
+        task = self.task_data
+        task_name = task.name if task else "Unknown Task"
+        return f"{task_name} Enabled"
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique ID."""
+        return f"{DOMAIN}_{self.task_id}_enabled"
 
     @property
     def is_on(self) -> bool:
         """Return true if the task is enabled."""
-        return self._is_on
-
-    async def async_turn_on(self, **kwargs: Any) -> None:
-        """Turn the switch on."""
-        # TODO: Implement enable logic
-        self._is_on = True
-        self.async_write_ha_state()
-
-    async def async_turn_off(self, **kwargs: Any) -> None:
-        """Turn the switch off."""
-        # TODO: Implement disable logic
-        self._is_on = False
-        self.async_write_ha_state()
-
-    async def async_update(self) -> None:
-        """Update the switch."""
-        # TODO: Implement update logic
+        task = self.task_data
+        return task.enabled if task else False
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        return {"task_id": self.task_id}
+
+    async def async_turn_on(self, **_kwargs: Any) -> None:
+        """Enable the task."""
+        await self.coordinator.async_set_task_enabled(self.task_id, enabled=True)
+
+    async def async_turn_off(self, **_kwargs: Any) -> None:
+        """Disable the task."""
+        await self.coordinator.async_set_task_enabled(self.task_id, enabled=False)
@@ -0,0 +1,267 @@
+"""Streaming task import and export for Task Butler."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine, Iterable, Iterator
+import csv
+from datetime import datetime
+import itertools
+import logging
+import os
+from pathlib import Path
+from typing import IO, Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util.json import json_loads
+
+from .const import FILE_FORMAT_CSV, FILE_FORMAT_JSONL
+from .coordinator import TaskButlerCoordinator
+from .models import DERIVED_FIELDS, STORED_FIELDS, as_local_datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rows parsed and validated in the executor, then created with one save
+IMPORT_BATCH_SIZE = 500
+
+# Row errors returned by an import; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Exported fields a new task does not take over
+_IGNORED_FIELDS = DERIVED_FIELDS | {"id"}
+
+_FILE_SUFFIXES = {
+    ".csv": FILE_FORMAT_CSV,
+    ".jsonl": FILE_FORMAT_JSONL,
+    ".ndjson": FILE_FORMAT_JSONL,
+}
+
+
+def local_datetime(value: Any) -> datetime:
+    """Validate an ISO timestamp the way stored timestamps are read."""
+    try:
+        parsed = datetime.fromisoformat(cv.string(value))
+    except ValueError as err:
+        msg = f"Invalid timestamp: {value}"
+        raise vol.Invalid(msg) from err
+    return as_local_datetime(parsed)
+
+
+def resolve_path(hass: HomeAssistant, path: str) -> str:
+    """Return the absolute path of a file in the configuration directory."""
+    config_dir = os.path.realpath(hass.config.config_dir)
+    full_path = os.path.realpath(hass.config.path(path))
+    if os.path.commonpath((config_dir, full_path)) != config_dir:
+        msg = f"{path} is not in the configuration directory"
+        raise HomeAssistantError(msg)
+    return full_path
+
+
+def file_format(path: str, requested: str | None) -> str:
+    """Return the requested file format, or the one the file suffix implies."""
+    if requested is not None:
+        return requested
+    suffix = Path(path).suffix.lower()
+    if (detected := _FILE_SUFFIXES.get(suffix)) is None:
+        msg = f"Cannot tell the format of {path}; set it to csv or jsonl"
+        raise HomeAssistantError(msg)
+    return detected
+
+
+async def async_import_tasks(
+    hass: HomeAssistant,
+    coordinator: TaskButlerCoordinator,
+    path: str,
+    import_format: str,
+    schema: vol.Schema,
+) -> dict[str, Any]:
+    """
+    Create the tasks of a file batch by batch and report rejected rows.
+
+    Each batch is parsed and validated in the executor, created in one
+    mutation and saved before the next batch is read.
+    """
+    imported = 0
+    errors: list[dict[str, Any]] = []
+    error_count = 0
+
+    async def async_import_batch(
+        rows: list[tuple[int, dict[str, Any]]], row_errors: list[dict[str, Any]]
+    ) -> None:
+        """Create a batch of valid rows and collect the rejected ones."""
+        nonlocal imported, error_count
+        created, create_errors = await _async_create_batch(coordinator, rows)
+        await coordinator.store.async_flush()
+
+        imported += created
+        for error in itertools.chain(row_errors, create_errors):
+            error_count += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(error)
+
+    try:
+        await hass.async_add_executor_job(
+            _read_file, hass, path, import_format, schema, async_import_batch
+        )
+    except OSError as err:
+        msg = f"Cannot read {path}: {err}"
+        raise HomeAssistantError(msg) from err
+
+    _LOGGER.info(
+        "Imported %d task(s) from %s, %d row(s) rejected", imported, path, error_count
+    )
+    return {"imported": imported, "failed": error_count, "errors": errors}
+
+
+async def _async_create_batch(
+    coordinator: TaskButlerCoordinator, rows: list[tuple[int, dict[str, Any]]]
+) -> tuple[int, list[dict[str, Any]]]:
+    """Create a batch of tasks; return the number created and the row errors."""
+    if not rows:
+        return 0, []
+    created, rejected = await coordinator.create_valid_tasks(
+        [task_data for _, task_data in rows]
+    )
+    errors = [
+        {"row": rows[position][0], "error": error}
+        for position, error in rejected.items()
+    ]
+    return len(created), errors
+
+
+async def async_export_tasks(
+    hass: HomeAssistant,
+    coordinator: TaskButlerCoordinator,
+    path: str,
+    export_format: str,
+) -> int:
+    """Write every task to a file and return the number written."""
+    # The snapshot never changes, so the executor can read it meanwhile
+    tasks = coordinator.task_snapshot.tasks
+    try:
+        await hass.async_add_executor_job(_write_tasks, path, export_format, tasks)
+    except OSError as err:
+        msg = f"Cannot write {path}: {err}"
+        raise HomeAssistantError(msg) from err
+    _LOGGER.info("Exported %d task(s) to %s", len(tasks), path)
+    return len(tasks)
+
+
+def _read_file(
+    hass: HomeAssistant,
+    path: str,
+    import_format: str,
+    schema: vol.Schema,
+    import_batch: Callable[
+        [list[tuple[int, dict[str, Any]]], list[dict[str, Any]]],
+        Coroutine[Any, Any, None],
+    ],
+) -> None:
+    """
+    Read an import file and hand over its rows batch by batch.
+
+    Runs in the executor; each batch is imported on the event loop before
+    the next one is read.
+    """
+    # Bytes that are not UTF-8 are read as lone surrogates, so a bad row is
+    # rejected on its own instead of failing the whole chunk being decoded
+    with Path(path).open(
+        encoding="utf-8", errors="surrogateescape", newline=""
+    ) as file:
+        reader = _TaskFileReader(file, import_format, schema)
+        while True:
+            rows, row_errors = reader.read_batch(IMPORT_BATCH_SIZE)
+            if not rows and not row_errors:
+                return
+            asyncio.run_coroutine_threadsafe(
+                import_batch(rows, row_errors), hass.loop
+            ).result()
+
+
+class _TaskFileReader:
+    """
+    Parses and validates the rows of an import file in batches.
+
+    Every method blocks and must run in the executor.
+    """
+
+    def __init__(self, file: IO[str], import_format: str, schema: vol.Schema) -> None:
+        """Initialize the reader of an open file."""
+        self._schema = schema
+        records: Iterable[Any]
+        if import_format == FILE_FORMAT_CSV:
+            records = csv.DictReader(file)
+        else:
+            records = (line for line in file if line.strip())
+        self._import_format = import_format
+        self._records: Iterator[Any] = iter(records)
+        # Rows are numbered from 1, not counting the CSV header or blank lines
+        self._row = 0
+
+    def read_batch(
+        self, size: int
+    ) -> tuple[list[tuple[int, dict[str, Any]]], list[dict[str, Any]]]:
+        """Return up to ``size`` valid rows and the errors of the invalid ones."""
+        rows: list[tuple[int, dict[str, Any]]] = []
+        errors: list[dict[str, Any]] = []
+        while len(rows) + len(errors) < size:
+            # Reading a CSV row can fail too, e.g. on an oversized field
+            try:
+                record = next(self._records)
+            except StopIteration:
+                break
+            except csv.Error as err:
+                self._row += 1
+                errors.append({"row": self._row, "error": str(err)})
+                continue
+            self._row += 1
+            try:
+                rows.append((self._row, self._schema(self._parse(record))))
+            except (ValueError, vol.Invalid) as err:
+                errors.append({"row": self._row, "error": str(err)})
+        return rows, errors
+
+    def _parse(self, record: Any) -> dict[str, Any]:
+        """Return the task fields of a CSV row or JSON line."""
+        if self._import_format == FILE_FORMAT_CSV:
+            if None in record:
+                msg = "Row has more values than the header has columns"
+                raise ValueError(msg)
+            try:
+                "".join(filter(None, record.values())).encode()
+            except UnicodeEncodeError as err:
+                msg = "Row is not valid UTF-8"
+                raise ValueError(msg) from err
+            # Empty cells leave the field at its default
+            data = {key: value for key, value in record.items() if value}
+        else:
+            data = json_loads(record)
+            if not isinstance(data, dict):
+                msg = "Line is not a JSON object"
+                raise ValueError(msg)
+            data = {key: value for key, value in data.items() if value is not None}
+        return {key: value for key, value in data.items() if key not in _IGNORED_FIELDS}
+
+
+def _write_tasks(
+    path: str, export_format: str, tasks: Iterable[dict[str, Any]]
+) -> None:
+    """Write tasks one row at a time, replacing the file once complete."""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = target.with_name(f"{target.name}.tmp")
+    with temp_path.open("w", encoding="utf-8", newline="") as file:
+        if export_format == FILE_FORMAT_CSV:
+            writer = csv.DictWriter(file, STORED_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(tasks)
+        else:
+            for task in tasks:
+                file.write(json_dumps({key: task[key] for key in STORED_FIELDS}))
+                file.write("\n")
+    temp_path.replace(target)
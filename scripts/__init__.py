@@ -0,0 +1 @@
+"""Development scripts for Task Butler."""
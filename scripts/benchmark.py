@@ -0,0 +1,350 @@
+"""
+Benchmark the Task Butler coordinator, storage and WebSocket hot paths.
+
+Runs against a real Home Assistant instance in a temporary config
+directory, so it needs the Home Assistant development environment. Run it
+from the repository root:
+
+    python scripts/benchmark.py
+    python scripts/benchmark.py --sizes 100 10000 --save-baseline
+
+Every benchmark reports its best time over a number of runs and its peak
+memory. Results are compared with the baseline JSON, which is written on
+the first run or with --save-baseline.
+"""
+
+# ruff: noqa: T201, SLF001
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+import json
+from pathlib import Path
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.task_butler import binary_sensor, sensor, switch, ws_get_tasks
+from custom_components.task_butler.const import (
+    CONF_STORAGE_BACKEND,
+    DOMAIN,
+    INTERVAL_MODES,
+    SCHEDULE_FIXED_DATE,
+    SCHEDULE_FIXED_OCCURRENCE,
+    SCHEDULE_MODES,
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKENDS,
+)
+from custom_components.task_butler.coordinator import TaskButlerCoordinator
+from custom_components.task_butler.models import Task
+from custom_components.task_butler.storage import TaskStorage, create_task_storage
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+
+DEFAULT_SIZES = [100, 10_000, 100_000]
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "benchmark_baseline.json"
+
+FIXED_DATES = ["03-01", "12-24", "02-29", "2030-06-15"]
+FIXED_OCCURRENCES = ["2nd tuesday", "last friday", "1st monday of march"]
+# Share of synthetic tasks that were ever completed, and that are enabled
+COMPLETED_SHARE = 0.7
+ENABLED_SHARE = 0.9
+
+Benchmark = Callable[[], Awaitable[Any]]
+Runner = Callable[[str, Benchmark], Awaitable[dict[str, float]]]
+
+
+@dataclass
+class BenchmarkEntry:
+    """The parts of a config entry the coordinator and platforms use."""
+
+    options: dict[str, Any]
+    entry_id: str = "benchmark"
+    title: str = "Benchmark"
+    unload_callbacks: list[CALLBACK_TYPE] = field(default_factory=list)
+
+    def async_on_unload(self, func: CALLBACK_TYPE) -> None:
+        """Collect unload callbacks."""
+        self.unload_callbacks.append(func)
+
+
+class BenchmarkConnection:
+    """WebSocket connection that encodes results like the real one."""
+
+    def __init__(self) -> None:
+        """Initialize the connection."""
+        self.payload_size = 0
+
+    def send_result(self, msg_id: int, result: Any) -> None:
+        """Encode a result message."""
+        message = {"id": msg_id, "type": "result", "success": True, "result": result}
+        self.payload_size = len(json_bytes(message))
+
+    def send_message(self, message: bytes) -> None:
+        """Take a message that is already encoded."""
+        self.payload_size = len(message)
+
+
+def generate_tasks(count: int, seed: int = 0) -> dict[str, Task]:
+    """Return synthetic tasks spread across every schedule and interval mode."""
+    rng = random.Random(seed)  # noqa: S311
+    now = dt_util.now().replace(microsecond=0)
+    tasks: dict[str, Task] = {}
+    for index in range(count):
+        schedule_mode = SCHEDULE_MODES[index % len(SCHEDULE_MODES)]
+        created_at = now - timedelta(days=rng.randint(0, 730))
+        last_completed = (
+            created_at + timedelta(days=rng.randint(0, 365), hours=rng.randint(0, 23))
+            if rng.random() < COMPLETED_SHARE
+            else None
+        )
+        task_id = f"task{index:06d}"
+        tasks[task_id] = Task(
+            id=task_id,
+            name=f"Task {index}",
+            schedule_mode=schedule_mode,
+            interval_days=rng.randint(1, 180),
+            interval_mode=INTERVAL_MODES[index // len(SCHEDULE_MODES) % 2],
+            fixed_date=(
+                rng.choice(FIXED_DATES)
+                if schedule_mode == SCHEDULE_FIXED_DATE
+                else None
+            ),
+            fixed_occurrence=(
+                rng.choice(FIXED_OCCURRENCES)
+                if schedule_mode == SCHEDULE_FIXED_OCCURRENCE
+                else None
+            ),
+            enabled=rng.random() < ENABLED_SHARE,
+            created_at=created_at,
+            last_completed=min(last_completed, now) if last_completed else None,
+        )
+    return tasks
+
+
+def cancel_timers(coordinator: TaskButlerCoordinator) -> None:
+    """Cancel the timers a refresh started, so none outlive the benchmark."""
+    coordinator.scheduler.async_cancel()
+    coordinator.overdue_scheduler.async_cancel()
+    coordinator.events.async_cancel()
+
+
+async def measure(benchmark: Benchmark, repeat: int) -> dict[str, float]:
+    """Time a benchmark, then run it once more to record peak memory."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await benchmark()
+        durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        await benchmark()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "best_s": min(durations),
+        "median_s": statistics.median(durations),
+        "peak_kib": peak / 1024,
+    }
+
+
+async def run_ws_get_tasks(
+    hass: HomeAssistant, coordinator: TaskButlerCoordinator, run: Runner
+) -> None:
+    """Time get_tasks on the first request and on repeated requests."""
+    connection = BenchmarkConnection()
+    handler = ws_get_tasks.__wrapped__
+
+    async def get_tasks() -> None:
+        await handler(hass, connection, {"id": 1, "type": f"{DOMAIN}/get_tasks"})
+
+    async def get_tasks_cold() -> None:
+        # As on the first request after startup, nothing is cached yet
+        coordinator._task_snapshot = None
+        coordinator._tasks_json = None
+        coordinator._task_dicts.clear()
+        await get_tasks()
+
+    await run("ws_get_tasks_cold", get_tasks_cold)
+    result = await run("ws_get_tasks", get_tasks)
+    result["payload_kib"] = connection.payload_size / 1024
+
+
+async def run_size(count: int, repeat: int) -> dict[str, dict[str, float]]:
+    """Run every benchmark against a fresh instance with a number of tasks."""
+    results: dict[str, dict[str, float]] = {}
+    tasks = generate_tasks(count)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.config.config_dir = config_dir
+        await asyncio.to_thread(Path(config_dir, ".storage").mkdir)
+
+        async def run(name: str, benchmark: Benchmark) -> dict[str, float]:
+            results[name] = await measure(benchmark, repeat)
+            print(
+                f"  {name:<24} {results[name]['best_s'] * 1000:>10.2f} ms"
+                f" {results[name]['peak_kib']:>12.0f} KiB"
+            )
+            return results[name]
+
+        entry = BenchmarkEntry({CONF_STORAGE_BACKEND: STORAGE_BACKEND_JSON})
+
+        for backend in STORAGE_BACKENDS:
+            # Stored under the entry so the refresh below loads it directly
+            store = create_task_storage(hass, backend, lambda: tasks, 0, entry.entry_id)
+            await store.async_replace_all(tasks)
+
+            async def save(store: TaskStorage = store) -> None:
+                store.async_schedule_save(tasks)
+                await store.async_flush()
+
+            await run(f"save_all_{backend}", save)
+            await run(f"load_{backend}", store.async_load)
+            await store.async_close()
+
+        async def first_refresh() -> None:
+            coordinator = TaskButlerCoordinator(hass, entry)
+            await coordinator._async_update_data()
+            cancel_timers(coordinator)
+
+        await run("first_refresh", first_refresh)
+
+        coordinator = TaskButlerCoordinator(hass, entry)
+        await coordinator._async_update_data()
+        hass.data[DOMAIN] = {entry.entry_id: coordinator}
+        current_time = dt_util.now()
+
+        async def calculate_next_due() -> None:
+            for task in coordinator.tasks.values():
+                coordinator._calculate_next_due(task, current_time)
+
+        await run("refresh", coordinator._async_update_data)
+        await run("calculate_next_due", calculate_next_due)
+
+        await run_ws_get_tasks(hass, coordinator, run)
+
+        async def platform_setup() -> None:
+            entities: list[Any] = []
+            for platform_module in (sensor, binary_sensor, switch):
+                await platform_module.async_setup_entry(hass, entry, entities.extend)
+            for unload in entry.unload_callbacks:
+                unload()
+            entry.unload_callbacks.clear()
+
+        await run("platform_setup", platform_setup)
+
+        cancel_timers(coordinator)
+        await coordinator.store.async_close()
+        await hass.async_stop(force=True)
+
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, dict[str, float]]],
+    baseline: dict[str, Any],
+    threshold: float,
+    min_delta: float,
+) -> list[str]:
+    """
+    Return the benchmarks that got slower than the baseline allows.
+
+    Slowdowns smaller than min_delta seconds are timer noise and ignored.
+    """
+    regressions = []
+    for size, benchmarks in results.items():
+        for name, result in benchmarks.items():
+            previous = baseline.get("results", {}).get(size, {}).get(name)
+            if not previous:
+                continue
+            ratio = result["best_s"] / previous["best_s"]
+            if ratio > threshold and result["best_s"] - previous["best_s"] > min_delta:
+                regressions.append(
+                    f"{name} with {size} tasks: {previous['best_s'] * 1000:.2f} ms"
+                    f" -> {result['best_s'] * 1000:.2f} ms ({ratio:.2f}x)"
+                )
+    return regressions
+
+
+async def main() -> int:
+    """Run the benchmarks and compare them with the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="overwrite the baseline with the results of this run",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="slowdown ratio against the baseline reported as a regression",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=1.0,
+        help="ignore slowdowns smaller than this many milliseconds",
+    )
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for count in args.sizes:
+        print(f"{count} tasks")
+        results[str(count)] = await run_size(count, args.repeat)
+
+    baseline = (
+        json.loads(args.baseline.read_text(encoding="utf-8"))
+        if args.baseline.exists()
+        else None
+    )
+    if baseline is not None:
+        regressions = compare(
+            results, baseline, args.threshold, args.min_delta_ms / 1000
+        )
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if not regressions:
+            print(f"No regressions against {args.baseline}")
+
+    if baseline is None or args.save_baseline:
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "created": dt_util.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
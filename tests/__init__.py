@@ -0,0 +1 @@
+"""Tests for the Task Butler integration."""
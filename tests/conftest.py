@@ -0,0 +1,22 @@
+"""Shared setup for the Task Butler tests."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from homeassistant.components import http
+
+if not hasattr(http, "StaticPathConfig"):
+    # Home Assistant releases before 2024.6 lack StaticPathConfig. The
+    # integration only uses it to register the panel, which no test does,
+    # so the tests also run on the older release CI is pinned to.
+
+    @dataclass(frozen=True, slots=True)
+    class StaticPathConfig:
+        """Stand-in for the static path configuration of newer releases."""
+
+        url_path: str
+        path: str
+        cache_headers: bool = True
+
+    http.StaticPathConfig = StaticPathConfig
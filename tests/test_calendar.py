@@ -0,0 +1,91 @@
+"""Tests for the Task Butler calendar."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from pathlib import Path
+
+from custom_components.task_butler.calendar import (
+    FORECAST_REBUILD_THRESHOLD,
+    TaskButlerCalendar,
+)
+from custom_components.task_butler.const import DOMAIN, SCHEDULE_FIXED_INTERVAL
+from custom_components.task_butler.coordinator import TaskButlerCoordinator
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+
+def test_many_changes_rebuild_in_the_executor(tmp_path: Path) -> None:
+    """Few changed tasks are updated in place, many trigger a rebuild."""
+    asyncio.run(_check_rebuild_threshold(tmp_path))
+
+
+async def _check_rebuild_threshold(config_dir: Path) -> None:
+    """Change tasks just up to and just over the threshold."""
+    hass = HomeAssistant(str(config_dir))
+    try:
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Tasks",
+            data={},
+            source="user",
+            options={},
+            entry_id="entry",
+        )
+        coordinator = TaskButlerCoordinator(hass, entry)
+        await coordinator.async_refresh()
+        calendar = TaskButlerCalendar(coordinator, entry)
+        calendar.hass = hass
+        calendar.async_write_ha_state = lambda: None
+
+        rebuilds: list[datetime | None] = []
+        rebuild = calendar._async_rebuild  # noqa: SLF001
+
+        async def record_rebuild(now: datetime | None = None) -> None:
+            rebuilds.append(now)
+            await rebuild(now)
+
+        calendar._async_rebuild = record_rebuild  # noqa: SLF001
+        await calendar.async_added_to_hass()
+        assert len(rebuilds) == 1
+
+        task_ids = await coordinator.create_tasks(
+            [
+                {"name": f"Task {number}", "schedule_mode": SCHEDULE_FIXED_INTERVAL}
+                for number in range(FORECAST_REBUILD_THRESHOLD)
+            ]
+        )
+        await hass.async_block_till_done()
+
+        assert len(rebuilds) == 1
+        assert _forecast_task_ids(calendar) == set(task_ids)
+
+        task_ids += await coordinator.create_tasks(
+            [
+                {"name": f"Task {number}", "schedule_mode": SCHEDULE_FIXED_INTERVAL}
+                for number in range(FORECAST_REBUILD_THRESHOLD + 1)
+            ]
+        )
+        await hass.async_block_till_done()
+
+        assert len(rebuilds) == 2
+        assert _forecast_task_ids(calendar) == set(task_ids)
+        await coordinator.async_shutdown()
+    finally:
+        await hass.async_stop(force=True)
+
+
+def _forecast_task_ids(calendar: TaskButlerCalendar) -> set[str]:
+    """Return the IDs of the tasks with occurrences in the forecast."""
+    forecast = calendar._forecast  # noqa: SLF001
+    return {
+        task_id
+        for task_id, _ in forecast.between(
+            datetime.min.replace(tzinfo=dt_util.UTC),
+            datetime.max.replace(tzinfo=dt_util.UTC),
+        )
+    }
@@ -0,0 +1,79 @@
+"""Tests for the Task Butler coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from datetime import timedelta
+from pathlib import Path
+
+from custom_components.task_butler.const import (
+    CONF_EVENT_RATE_LIMIT,
+    CONF_OVERDUE_AFTER,
+    DOMAIN,
+    EVENT_TASK_DUE,
+    EVENT_TASK_OVERDUE,
+    SCHEDULE_FIXED_INTERVAL,
+)
+from custom_components.task_butler.coordinator import TaskButlerCoordinator
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.util import dt as dt_util
+
+
+def test_refresh_announces_deadlines_it_crosses(tmp_path: Path) -> None:
+    """A refresh that beats the due and overdue timers fires their events."""
+    asyncio.run(_check_refresh_announces_deadlines(tmp_path))
+
+
+async def _check_refresh_announces_deadlines(config_dir: Path) -> None:
+    """Refresh while a task is past due but its timers have not fired."""
+    hass = HomeAssistant(str(config_dir))
+    try:
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Tasks",
+            data={},
+            source="user",
+            options={CONF_OVERDUE_AFTER: 1, CONF_EVENT_RATE_LIMIT: 0},
+            entry_id="entry",
+        )
+        coordinator = TaskButlerCoordinator(hass, entry)
+        await coordinator.async_refresh()
+        events: list[Event] = []
+        hass.bus.async_listen(EVENT_TASK_DUE, events.append)
+        hass.bus.async_listen(EVENT_TASK_OVERDUE, events.append)
+
+        task_id = await coordinator.create_task(
+            {
+                "name": "Water plants",
+                "schedule_mode": SCHEDULE_FIXED_INTERVAL,
+                "interval_days": 1,
+                "created_at": (dt_util.now() - timedelta(days=2)).isoformat(),
+            }
+        )
+        # As if the refresh ran just before the timers would have fired
+        task = coordinator.tasks[task_id]
+        coordinator.tasks[task_id] = replace(task, is_due=False)
+        coordinator.overdue.discard(task_id)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert [event.event_type for event in events] == [
+            EVENT_TASK_DUE,
+            EVENT_TASK_OVERDUE,
+        ]
+        assert all(
+            [summary["task_id"] for summary in event.data["tasks"]] == [task_id]
+            for event in events
+        )
+
+        # Tasks that stay due and overdue are not announced again
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert len(events) == 2
+        await coordinator.async_shutdown()
+    finally:
+        await hass.async_stop(force=True)
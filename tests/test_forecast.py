@@ -0,0 +1,62 @@
+"""Tests for the Task Butler forecast index."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import random
+
+import pytest
+
+from custom_components.task_butler.forecast import ForecastIndex
+from homeassistant.util import dt as dt_util
+
+START = datetime(2026, 1, 1, tzinfo=dt_util.UTC)
+
+
+def _contents(index: ForecastIndex) -> list[tuple[str, datetime]]:
+    """Return every occurrence of an index in order."""
+    return list(index.between(START - timedelta(days=1), START + timedelta(days=400)))
+
+
+def _random_occurrences(rng: random.Random) -> list[datetime]:
+    """Return a random, possibly empty list of due times."""
+    # Whole days make equal due times of different tasks common
+    return [
+        START + timedelta(days=rng.randrange(365))
+        for _ in range(rng.choice((0, 1, 1, 3, 10)))
+    ]
+
+
+@pytest.mark.parametrize("batch_size", [1, 5, 60])
+def test_update_matches_rebuild(batch_size: int) -> None:
+    """Updating some tasks gives the same order as a full rebuild."""
+    rng = random.Random(batch_size)  # noqa: S311
+    task_ids = [f"task_{number}" for number in range(200)]
+    occurrences = {task_id: _random_occurrences(rng) for task_id in task_ids}
+    index = ForecastIndex()
+    index.rebuild(occurrences)
+
+    for _ in range(50):
+        changes = {
+            task_id: _random_occurrences(rng)
+            for task_id in rng.sample(task_ids, batch_size)
+        }
+        index.update(changes)
+        occurrences.update(changes)
+
+        expected = ForecastIndex()
+        expected.rebuild(occurrences)
+        assert len(index) == len(expected)
+        assert _contents(index) == _contents(expected)
+
+
+def test_update_adds_and_removes_tasks() -> None:
+    """Unknown tasks are added and an empty list removes a task."""
+    index = ForecastIndex()
+    index.rebuild({"a": [START, START + timedelta(days=2)]})
+
+    index.update({"b": [START + timedelta(days=1)], "a": []})
+
+    assert _contents(index) == [("b", START + timedelta(days=1))]
+    assert index.first_after(START) == ("b", START + timedelta(days=1))
+    assert index.first_after(START + timedelta(days=2)) is None
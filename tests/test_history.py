@@ -0,0 +1,42 @@
+"""Tests for the Task Butler completion history."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from pathlib import Path
+
+from custom_components.task_butler.history import CompletionHistory
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+
+def test_read_during_compaction(tmp_path: Path) -> None:
+    """Segments dropped by a concurrent compaction are skipped."""
+    asyncio.run(_check_read_during_compaction(tmp_path))
+
+
+async def _check_read_during_compaction(config_dir: Path) -> None:
+    """Read a task's history while compaction drops its expired segments."""
+    hass = HomeAssistant(str(config_dir))
+    try:
+        history = CompletionHistory(hass, "entry")
+        now = dt_util.now()
+        for completed_at in (
+            now,
+            datetime(2020, 2, 1, tzinfo=dt_util.UTC),
+            datetime(2020, 1, 1, tzinfo=dt_util.UTC),
+        ):
+            await history.async_append(["task"], completed_at)
+
+        # The read holds the lock for the current segment, then compaction
+        # drops both expired segments before the read gets to them
+        completions, _ = await asyncio.gather(
+            history.async_get_completions("task"), history.async_compact({"task"})
+        )
+
+        assert completions == [now]
+        assert await history.async_get_completions("task") == [now]
+        await history.async_flush()
+    finally:
+        await hass.async_stop(force=True)
@@ -0,0 +1,164 @@
+"""Tests for the Task Butler task index."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timedelta
+import math
+import random
+
+import pytest
+
+from custom_components.task_butler.const import (
+    SCHEDULE_FIXED_DATE,
+    SCHEDULE_FIXED_INTERVAL,
+)
+from custom_components.task_butler.index import (
+    SORT_CREATED_AT,
+    SORT_NAME,
+    SORT_NEXT_DUE,
+    TaskIndex,
+    TaskQuery,
+)
+from custom_components.task_butler.models import Task
+from homeassistant.util import dt as dt_util
+
+START = datetime(2026, 1, 1, tzinfo=dt_util.UTC)
+
+
+def _random_tasks(count: int) -> dict[str, Task]:
+    """Return tasks with random flags, modes and due times."""
+    rng = random.Random(count)  # noqa: S311
+    tasks = {}
+    for number in range(count):
+        task_id = f"task_{number:03}"
+        tasks[task_id] = Task(
+            task_id,
+            f"Task {rng.randrange(20)}",
+            rng.choice((SCHEDULE_FIXED_INTERVAL, SCHEDULE_FIXED_DATE)),
+            enabled=rng.random() < 0.8,
+            created_at=START - timedelta(days=rng.randrange(100)),
+            is_due=rng.random() < 0.3,
+            # Equal due times are common and some tasks have none
+            next_due=rng.choice((None, START + timedelta(days=rng.randrange(30)))),
+        )
+    return tasks
+
+
+def _build_index(tasks: dict[str, Task]) -> TaskIndex:
+    """Index tasks one at a time, as the coordinator does."""
+    index = TaskIndex()
+    for task_id, task in tasks.items():
+        index.update(task_id, task)
+    return index
+
+
+def _due_key(task: Task) -> float:
+    """Return the next due time of a task as a number, undated tasks last."""
+    return task.next_due.timestamp() if task.next_due else math.inf
+
+
+def _expected(tasks: dict[str, Task], query: TaskQuery) -> list[str]:
+    """Filter and sort tasks without the index."""
+    low = query.due_after.timestamp() if query.due_after else -math.inf
+    high = query.due_before.timestamp() if query.due_before else math.inf
+    matching = [
+        task
+        for task in tasks.values()
+        if query.is_due in (None, task.is_due)
+        and query.enabled in (None, task.enabled)
+        and query.schedule_mode in (None, task.schedule_mode)
+        and low <= _due_key(task) <= high
+    ]
+    if query.sort_by == SORT_NEXT_DUE:
+        matching.sort(key=lambda task: (_due_key(task), task.id))
+    elif query.sort_by == SORT_NAME:
+        matching.sort(key=lambda task: (task.name, task.id))
+    else:
+        matching.sort(key=lambda task: (task.created_at.isoformat(), task.id))
+    if query.descending:
+        matching.reverse()
+    return [task.id for task in matching]
+
+
+def _all_pages(index: TaskIndex, tasks: dict[str, Task], query: TaskQuery) -> list[str]:
+    """Follow the cursor through every page of a query."""
+    task_ids: list[str] = []
+    while True:
+        page, cursor = index.query(tasks, query)
+        assert len(page) <= query.limit
+        task_ids.extend(page)
+        if cursor is None:
+            return task_ids
+        assert len(page) == query.limit
+        query = replace(query, cursor=cursor)
+
+
+@pytest.mark.parametrize("sort_by", [SORT_NEXT_DUE, SORT_NAME, SORT_CREATED_AT])
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"is_due": True},
+        {"is_due": False, "enabled": True},
+        {"enabled": False},
+        {"schedule_mode": SCHEDULE_FIXED_DATE},
+        {"due_after": START + timedelta(days=10)},
+        {"due_before": START + timedelta(days=10)},
+        {
+            "due_after": START + timedelta(days=5),
+            "due_before": START + timedelta(days=20),
+            "is_due": False,
+        },
+    ],
+)
+def test_pages_cover_every_match_once(
+    sort_by: str,
+    descending: bool,  # noqa: FBT001
+    filters: dict[str, object],
+) -> None:
+    """Following the cursors returns every matching task once and in order."""
+    tasks = _random_tasks(200)
+    index = _build_index(tasks)
+    query = TaskQuery(sort_by=sort_by, descending=descending, limit=7, **filters)
+
+    assert _all_pages(index, tasks, query) == _expected(tasks, query)
+
+
+def test_updates_move_tasks_between_flag_sets() -> None:
+    """Updating or removing a task keeps the flag, mode and area sets exact."""
+    tasks = _random_tasks(50)
+    index = _build_index(tasks)
+
+    task = replace(
+        tasks["task_000"],
+        is_due=True,
+        enabled=False,
+        schedule_mode=SCHEDULE_FIXED_DATE,
+        area="kitchen",
+        next_due=START + timedelta(days=40),
+    )
+    tasks["task_000"] = task
+    index.update("task_000", task)
+
+    assert "task_000" in index.due
+    assert index.area_tasks("kitchen") == {"task_000"}
+    assert list(index.areas) == ["kitchen"]
+    for query in (
+        TaskQuery(is_due=True, limit=100),
+        TaskQuery(enabled=False, limit=100),
+        TaskQuery(schedule_mode=SCHEDULE_FIXED_DATE, limit=100),
+        TaskQuery(due_after=START + timedelta(days=35), limit=100),
+    ):
+        assert _all_pages(index, tasks, query) == _expected(tasks, query)
+
+    del tasks["task_000"]
+    index.remove("task_000")
+
+    assert len(index) == len(tasks)
+    assert "task_000" not in index.due
+    assert index.area_tasks("kitchen") == set()
+    assert list(index.areas) == []
+    query = TaskQuery(is_due=True, limit=100)
+    assert _all_pages(index, tasks, query) == _expected(tasks, query)
@@ -0,0 +1,170 @@
+"""Tests for the Task Butler recurrence rules."""
+
+from __future__ import annotations
+
+import calendar
+from datetime import date, datetime, time, timedelta
+import random
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.task_butler.const import (
+    SCHEDULE_FIXED_DATE,
+    SCHEDULE_FIXED_INTERVAL,
+    SCHEDULE_FIXED_OCCURRENCE,
+)
+from custom_components.task_butler.recurrence import (
+    NthWeekday,
+    OneOffDate,
+    YearlyDate,
+    compile_recurrence,
+)
+from homeassistant.util import dt as dt_util
+
+UTC = dt_util.UTC
+
+
+def _utc(year: int, month: int, day: int, hour: int = 0) -> datetime:
+    """Return a point in time in UTC."""
+    return datetime(year, month, day, hour, tzinfo=UTC)
+
+
+@pytest.mark.parametrize(
+    ("fixed_date", "after", "expected"),
+    [
+        # February 29 falls on February 28 in non-leap years
+        ("02-29", _utc(2025, 1, 1), _utc(2025, 2, 28)),
+        ("02-29", _utc(2027, 3, 1), _utc(2028, 2, 29)),
+        ("02-29", _utc(2028, 2, 28, 12), _utc(2028, 2, 29)),
+        # The occurrence must be strictly after the given time
+        ("12-31", _utc(2026, 12, 31), _utc(2027, 12, 31)),
+        ("01-31", _utc(2026, 1, 30, 23), _utc(2026, 1, 31)),
+        ("2026-03-01", _utc(2026, 2, 1), _utc(2026, 3, 1)),
+        ("2026-03-01", _utc(2026, 3, 1), None),
+    ],
+)
+def test_fixed_date(
+    fixed_date: str, after: datetime, expected: datetime | None
+) -> None:
+    """Fixed dates recur yearly or occur once."""
+    rule = compile_recurrence(SCHEDULE_FIXED_DATE, fixed_date, None)
+    assert rule is not None
+    assert rule.next_after(after) == expected
+
+
+@pytest.mark.parametrize(
+    ("fixed_occurrence", "after", "expected"),
+    [
+        ("last friday", _utc(2026, 1, 30), _utc(2026, 2, 27)),
+        # A 5th weekday is skipped in months without one
+        ("5th monday", _utc(2026, 1, 1), _utc(2026, 3, 30)),
+        ("5th monday", _utc(2026, 4, 1), _utc(2026, 6, 29)),
+        ("1st sunday", _utc(2026, 12, 7), _utc(2027, 1, 3)),
+        ("last friday of march", _utc(2026, 3, 28), _utc(2027, 3, 26)),
+        ("every 2nd tuesday in november", _utc(2026, 11, 10, 8), _utc(2027, 11, 9)),
+        # Only leap years whose February starts on a Sunday have one
+        ("5th sunday of february", _utc(2026, 1, 1), _utc(2032, 2, 29)),
+    ],
+)
+def test_fixed_occurrence(
+    fixed_occurrence: str, after: datetime, expected: datetime
+) -> None:
+    """Fixed occurrences step to the next matching weekday."""
+    rule = compile_recurrence(SCHEDULE_FIXED_OCCURRENCE, None, fixed_occurrence)
+    assert rule is not None
+    assert rule.next_after(after) == expected
+
+
+@pytest.mark.parametrize(
+    ("schedule_mode", "fixed_date", "fixed_occurrence"),
+    [
+        (SCHEDULE_FIXED_DATE, None, None),
+        (SCHEDULE_FIXED_DATE, "02-30", None),
+        (SCHEDULE_FIXED_DATE, "2025-02-29", None),
+        (SCHEDULE_FIXED_DATE, "13-01", None),
+        (SCHEDULE_FIXED_OCCURRENCE, None, None),
+        (SCHEDULE_FIXED_OCCURRENCE, None, "6th monday"),
+        (SCHEDULE_FIXED_OCCURRENCE, None, "2nd funday"),
+        (SCHEDULE_FIXED_OCCURRENCE, None, "last friday of smarch"),
+    ],
+)
+def test_invalid_rules(
+    schedule_mode: str, fixed_date: str | None, fixed_occurrence: str | None
+) -> None:
+    """Invalid rules raise ValueError."""
+    with pytest.raises(ValueError, match="Invalid fixed"):
+        compile_recurrence(schedule_mode, fixed_date, fixed_occurrence)
+
+
+def test_interval_schedules_have_no_rule() -> None:
+    """Fixed interval schedules are not recurrence rules."""
+    assert compile_recurrence(SCHEDULE_FIXED_INTERVAL, None, None) is None
+
+
+def test_occurrence_keeps_the_time_zone() -> None:
+    """Occurrences are at midnight in the time zone of the given time."""
+    time_zone = ZoneInfo("America/New_York")
+    rule = compile_recurrence(SCHEDULE_FIXED_DATE, "07-04", None)
+    assert rule is not None
+    assert rule.next_after(datetime(2026, 7, 3, 23, tzinfo=time_zone)) == datetime(
+        2026, 7, 4, tzinfo=time_zone
+    )
+
+
+def _matches(rule: OneOffDate | YearlyDate | NthWeekday, day: date) -> bool:
+    """Return True if a rule occurs on a day, checked without stepping."""
+    if isinstance(rule, OneOffDate):
+        return day == rule.day
+    if isinstance(rule, YearlyDate):
+        if day.month != rule.month:
+            return False
+        days = calendar.monthrange(day.year, day.month)[1]
+        return day.day == min(rule.day, days)
+    if day.weekday() != rule.weekday or rule.month not in (None, day.month):
+        return False
+    if rule.nth == -1:
+        return (day + timedelta(days=7)).month != day.month
+    return (day.day - 1) // 7 + 1 == rule.nth
+
+
+def _brute_force_next(
+    rule: OneOffDate | YearlyDate | NthWeekday, after: datetime
+) -> datetime | None:
+    """Return the next occurrence by checking one day after the other."""
+    day = after.date()
+    for _ in range(29 * 366):
+        if isinstance(rule, OneOffDate) and day > rule.day:
+            break
+        if _matches(rule, day):
+            occurrence = datetime.combine(day, time.min, tzinfo=after.tzinfo)
+            if occurrence > after:
+                return occurrence
+        day += timedelta(days=1)
+    return None
+
+
+def _random_rule(rng: random.Random) -> OneOffDate | YearlyDate | NthWeekday:
+    """Return a random rule of any kind."""
+    kind = rng.randrange(3)
+    if kind == 0:
+        return OneOffDate(date(2024, 1, 1) + timedelta(days=rng.randrange(1500)))
+    if kind == 1:
+        month = rng.randint(1, 12)
+        return YearlyDate(month, rng.randint(1, calendar.monthrange(2024, month)[1]))
+    return NthWeekday(
+        rng.choice((1, 2, 3, 4, 5, -1)),
+        rng.randrange(7),
+        rng.choice((None, rng.randint(1, 12))),
+    )
+
+
+def test_rules_match_brute_force() -> None:
+    """Random rules agree with a day by day search for the next occurrence."""
+    rng = random.Random(2026)  # noqa: S311
+    for _ in range(3000):
+        rule = _random_rule(rng)
+        after = _utc(2024, 1, 1) + timedelta(
+            days=rng.randrange(1500), hours=rng.choice((0, 0, 12))
+        )
+        assert rule.next_after(after) == _brute_force_next(rule, after), (rule, after)
@@ -0,0 +1,58 @@
+"""Tests for the Task Butler due scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+import time
+
+import pytest
+
+from custom_components.task_butler.scheduler import DueScheduler
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+
+def _time_zone_away_from_system(hours: int) -> str:
+    """Return a time zone at least ``hours`` away from the system's offset."""
+    system_offset = time.localtime().tm_gmtoff / 3600
+    if hours > 0:
+        return "Pacific/Kiritimati" if system_offset < 14 - hours else "UTC"
+    return "Pacific/Honolulu" if system_offset > -10 - hours else "UTC"
+
+
+@pytest.mark.parametrize("hours", [4, -4])
+def test_fires_once_in_a_time_zone_other_than_the_system(
+    tmp_path: Path, hours: int
+) -> None:
+    """A deadline fires once and on time whatever the system time zone is."""
+    asyncio.run(_check_fires_once(tmp_path, _time_zone_away_from_system(hours)))
+
+
+async def _check_fires_once(config_dir: Path, time_zone: str) -> None:
+    """Schedule a deadline in Home Assistant's time zone and wait for it."""
+    hass = HomeAssistant(str(config_dir))
+    previous_time_zone = dt_util.DEFAULT_TIME_ZONE
+    dt_util.set_default_time_zone(dt_util.get_time_zone(time_zone))
+    try:
+        fired: list[list[str]] = []
+        scheduler = DueScheduler(hass, fired.append)
+        fire = scheduler._async_fire  # noqa: SLF001
+        fire_calls = 0
+
+        def count_fire(now: object) -> None:
+            nonlocal fire_calls
+            fire_calls += 1
+            fire(now)
+
+        scheduler._async_fire = count_fire  # noqa: SLF001
+        scheduler.async_schedule("task", dt_util.now() + timedelta(seconds=0.2))
+        await asyncio.sleep(1)
+
+        assert fired == [["task"]]
+        assert fire_calls == 1
+        assert len(scheduler) == 0
+    finally:
+        dt_util.set_default_time_zone(previous_time_zone)
+        await hass.async_stop(force=True)
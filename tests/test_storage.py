@@ -0,0 +1,124 @@
+"""Tests for the Task Butler task storage."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from custom_components.task_butler.const import SCHEDULE_FIXED_INTERVAL
+from custom_components.task_butler.models import Task
+from custom_components.task_butler.storage import (
+    RETRY_DELAY_MAX,
+    RETRY_DELAY_MIN,
+    JsonTaskStore,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+
+def test_failed_write_keeps_tasks_dirty(tmp_path: Path) -> None:
+    """Tasks stay dirty after a failed write and are written by the next flush."""
+    asyncio.run(_check_failed_write(tmp_path))
+
+
+async def _check_failed_write(config_dir: Path) -> None:
+    """Fail one write, then flush again."""
+    hass = HomeAssistant(str(config_dir))
+    try:
+        tasks = {"task": Task("task", "Task", SCHEDULE_FIXED_INTERVAL)}
+        storage = JsonTaskStore(hass, lambda: tasks, 60)
+        document_store = storage._store  # noqa: SLF001
+        save = document_store.async_save
+
+        async def fail_save(_data: dict[str, Any]) -> None:
+            msg = "disk full"
+            raise OSError(msg)
+
+        storage.async_schedule_save(["task"])
+        document_store.async_save = fail_save
+        await storage.async_flush()
+
+        assert storage.dirty
+        assert storage.pending_writes == 1
+        assert storage.save_latency.count == 0
+
+        document_store.async_save = save
+        await storage.async_flush()
+
+        assert not storage.dirty
+        assert storage.pending_writes == 0
+        assert await storage.async_load() == tasks
+    finally:
+        await hass.async_stop(force=True)
+
+
+def test_failed_writes_back_off(tmp_path: Path) -> None:
+    """Repeated write failures retry after a growing, capped delay."""
+    asyncio.run(_check_back_off(tmp_path))
+
+
+async def _check_back_off(config_dir: Path) -> None:
+    """Fail every write with no save delay configured."""
+    hass = HomeAssistant(str(config_dir))
+    try:
+        tasks = {"task": Task("task", "Task", SCHEDULE_FIXED_INTERVAL)}
+        storage = JsonTaskStore(hass, lambda: tasks, 0)
+        document_store = storage._store  # noqa: SLF001
+        save = document_store.async_save
+
+        async def fail_save(_data: dict[str, Any]) -> None:
+            msg = "disk full"
+            raise OSError(msg)
+
+        document_store.async_save = fail_save
+        storage.async_schedule_save(["task"])
+        delays = []
+        for _ in range(8):
+            await storage.async_flush()
+            delays.append(storage.retry_delay)
+
+        assert delays[0] == RETRY_DELAY_MIN
+        assert delays == sorted(delays)
+        assert delays[-1] == RETRY_DELAY_MAX
+
+        # New mutations do not cut the back-off short
+        storage.async_schedule_save(["task"])
+        assert storage.retry_delay == RETRY_DELAY_MAX
+
+        document_store.async_save = save
+        await storage.async_flush()
+
+        assert storage.failed_writes == 0
+        assert storage.retry_delay == 0
+        assert not storage.dirty
+    finally:
+        await hass.async_stop(force=True)
+
+
+def test_timestamps_round_trip_exactly(tmp_path: Path) -> None:
+    """Stored timestamps keep their fractional seconds."""
+    asyncio.run(_check_round_trip(tmp_path))
+
+
+async def _check_round_trip(config_dir: Path) -> None:
+    """Save a task completed at a fractional second and load it again."""
+    hass = HomeAssistant(str(config_dir))
+    try:
+        now = dt_util.now().replace(microsecond=123456)
+        tasks = {
+            "task": Task(
+                "task",
+                "Task",
+                SCHEDULE_FIXED_INTERVAL,
+                created_at=now,
+                last_completed=now,
+            )
+        }
+        storage = JsonTaskStore(hass, lambda: tasks, 60)
+        storage.async_schedule_save(["task"])
+        await storage.async_flush()
+
+        assert await storage.async_load() == tasks
+    finally:
+        await hass.async_stop(force=True)
@@ -0,0 +1,59 @@
+"""Tests for the Task Butler task import."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from custom_components.task_butler import IMPORT_TASK_SCHEMA
+from custom_components.task_butler.const import DOMAIN, FILE_FORMAT_CSV
+from custom_components.task_butler.coordinator import TaskButlerCoordinator
+from custom_components.task_butler.transfer import async_import_tasks
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+
+def test_import_rejects_unreadable_rows(tmp_path: Path) -> None:
+    """Rows that cannot be read or created are rejected one by one."""
+    asyncio.run(_check_unreadable_rows(tmp_path))
+
+
+async def _check_unreadable_rows(config_dir: Path) -> None:
+    """Import a CSV file mixing valid rows with broken ones."""
+    hass = HomeAssistant(str(config_dir))
+    try:
+        path = config_dir / "tasks.csv"
+        path.write_bytes(
+            b"name,schedule_mode,fixed_date\n"
+            b"first,fixed_interval,\n"
+            b"caf\xe9,fixed_interval,\n"
+            b"long," + b"x" * 200_000 + b",\n"
+            b"bad date,fixed_date,garbage\n"
+            b"last,fixed_interval,\n"
+        )
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Tasks",
+            data={},
+            source="user",
+            options={},
+            entry_id="entry",
+        )
+        coordinator = TaskButlerCoordinator(hass, entry)
+        await coordinator.async_refresh()
+
+        result = await async_import_tasks(
+            hass, coordinator, str(path), FILE_FORMAT_CSV, IMPORT_TASK_SCHEMA
+        )
+
+        assert result["imported"] == 2
+        assert [error["row"] for error in result["errors"]] == [2, 3, 4]
+        assert sorted(task.name for task in coordinator.tasks.values()) == [
+            "first",
+            "last",
+        ]
+        await coordinator.async_shutdown()
+    finally:
+        await hass.async_stop(force=True)